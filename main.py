@@ -13,7 +13,10 @@ import sys
 import json
 import time
 import os
-from typing import Any, Dict, TypeGuard
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeGuard
 from src.utils import load_dotenv, is_verbose, truncate_string
 load_dotenv()
 """Hardcoded local LLM stub switch (temporary debug aid).
@@ -38,6 +41,8 @@ if not os.getenv("ORBITSUITE_LLM_SERVER_URL"):
     print("[main] Connecting to local Nemo server at http://172.23.80.1:8080")
 
 from src.supervisor import Supervisor
+from src.artifact_writer import persist_mode
+from src.event_bus import EventBus
 
 
 # --- Helper Utilities (extracted from duplicated inline logic) ---
@@ -103,97 +108,54 @@ def _build_autobuild_info(secondary_result: Dict[str, Any], secondary_prompt: st
     }
 
 
-## _as_str_list helper removed (unused after refactor)
+_background: ThreadPoolExecutor | None = None
+_background_lock = threading.Lock()
 
 
-def interactive_mode() -> None:
-    """Run interactive REPL mode."""
-    supervisor = Supervisor()
-    help_text = (
-        "Available commands:\n"
-        "- help: Show this help message\n"
-        "- status: Show supervisor status\n"
-        "- agents: List available agents\n"
-        "- health: Run health check\n"
-        "- quit/exit/q: Exit the program\n\n"
-        "Or type any natural language request to process it through the agents.\n\n"
-        "Examples:\n"
-        "- Generate a Python function to calculate prime numbers\n"
-        "- Test this code for syntax errors\n"
-        "- Design a web API architecture\n"
-        "- Save this data to memory\n"
-    )
-    while True:
-        try:
-            user_input = input("\n> ").strip()
-            if user_input.lower() in {"quit", "exit", "q"}:
-                print("Goodbye!")
-                break
-            if user_input.lower() == "help":
-                print(help_text)
-                continue
-            if user_input.lower() == "status":
-                status = supervisor.get_status()
-                print(f"Status: {status['status']}")
-                print(f"Agents: {', '.join(status['agents'])}")
-                print(f"Tasks processed: {status['total_tasks_processed']}")
-                continue
-            if user_input.lower() == "agents":
-                agent_info = supervisor.get_agent_info()
-                for name, info in agent_info.items():
-                    print(f"  {name}: {info['version']}")
-                continue
-            if user_input.lower() == "health":
-                health = supervisor.health_check()
-                print(f"Overall status: {health['overall_status']}")
-                for agent, st in health['agent_checks'].items():
-                    print(f"  {agent}: {st['status']}")
-                continue
-            if user_input:
-                result = supervisor.process_request(user_input)
-                if result.get("success"):
-                    print(f"✅ Success (took {result['processing_time']:.2f}s)")
-                    inner_raw_obj = result.get("result")
-                    if isinstance(inner_raw_obj, dict):
-                        inner_raw = inner_raw_obj  # type: ignore[assignment]
-                        raw_code_obj = inner_raw.get("code")  # type: ignore[index]
-                        code_val = raw_code_obj if isinstance(raw_code_obj, str) else None
-                        if isinstance(code_val, str) and code_val:
-                            print("📝 Generated code:")
-                            snippet = code_val[:200] + "..." if len(code_val) > 200 else code_val
-                            print(snippet)
-                else:
-                    print(f"❌ Error: {result.get('error', 'Unknown error')}")
-        except KeyboardInterrupt:
-            print("\nGoodbye!")
-            break
-        except EOFError:
-            # Handle piped input gracefully
-            print("\nGoodbye!")
-            break
-        except Exception as e:  # pragma: no cover
-            print(f"Error: {e}")
+def _background_pool(workers: int | None = None) -> ThreadPoolExecutor:
+    """Shared executor for pipelines that run off the request thread.
 
+    Created once; api_mode sizes it to the admission limit before serving, and
+    every task it runs holds its own admission slot, so it never queues work
+    that a running task is waiting on.
+    """
+    global _background
+    with _background_lock:
+        if _background is None:
+            _background = ThreadPoolExecutor(max_workers=max(1, workers or 2), thread_name_prefix='orbit-background')
+        return _background
 
-def api_mode(port: int = 8000) -> None:
-    """Run a minimal API server with a simple text UI at /."""
-    print(f"OrbitSuite Core API server starting on port {port}")
-    print("Open http://localhost:%d in your browser for the simple UI" % port)
-    
-    supervisor = Supervisor()
-    
-    # Simple HTTP server implementation
-    from http.server import HTTPServer, BaseHTTPRequestHandler
 
-    CONTENT_TYPE_JSON = 'application/json'
+def _start_background(fn: Callable[..., Dict[str, Any]], *args: Any) -> "Future[Dict[str, Any]]":
+    """Run ``fn(*args)`` on the shared background executor and return its future."""
+    return _background_pool().submit(fn, *args)
 
-    class CoreHandler(BaseHTTPRequestHandler):
-        def do_GET(self):
-            if self.path in ('/', '/index.html'):
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/html; charset=utf-8')
-                self.end_headers()
-                html = f"""
+
+def _start_secondary(admission: Any, fn: Callable[..., Dict[str, Any]], *args: Any) -> "Future[Dict[str, Any]] | None":
+    """Start the autobuild pass concurrently when it can take its own pipeline slot.
+
+    Returns None when ``admission`` has no free slot; the caller then runs the
+    pass after the primary, inside the primary's slot, so ``max_pipelines``
+    bounds pipelines rather than requests.
+    """
+    if admission is None:
+        return _start_background(fn, *args)
+    if not admission.try_acquire():
+        return None
+
+    def _run() -> Dict[str, Any]:
+        start = time.time()
+        try:
+            return fn(*args)
+        finally:
+            admission.release(time.time() - start)
+
+    return _start_background(_run)
+
+
+def _render_ui_page(port: int) -> str:
+    """Simple web UI for api_mode; rendered once per server (served with an ETag)."""
+    return f"""
 <!doctype html>
 <html lang=\"en\">
 <head>
@@ -276,95 +238,416 @@ def api_mode(port: int = 8000) -> None:
     </body>
 </html>
 """
-                self.wfile.write(html.encode('utf-8'))
-            elif self.path == '/status':
-                self.send_response(200)
-                self.send_header('Content-Type', CONTENT_TYPE_JSON)
-                self.end_headers()
+
+
+def _run_with_autobuild(
+    supervisor: Supervisor,
+    request_text: str,
+    progress: Callable[[str, str], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    secondary_supervisor: Supervisor | None = None,
+    use_cache: bool = True,
+    persist: Any = None,
+    admission: Any = None,
+) -> Dict[str, Any]:
+    """Run the primary request and the executable-oriented secondary prompt.
+
+    Shared by the synchronous /process endpoint and queued jobs. The secondary
+    prompt depends only on the request text, so when ``secondary_supervisor`` is
+    given both pipelines run concurrently (separate supervisors keep their agent
+    state apart); otherwise they run one after the other. When the request already
+    asks for an executable the secondary would be identical, and the primary
+    result doubles as the autobuild result.
+
+    ``progress`` receives (stage, detail) pairs; ``should_cancel`` is polled
+    before the autobuild pass so a cancelled job skips (or discards) it.
+    ``use_cache=False`` makes both passes bypass the supervisor result cache.
+    ``persist`` is passed to the primary pass; when it is not ``all`` (artifacts
+    kept in memory) the autobuild pass, which exists to leave an executable on
+    disk, is skipped.
+
+    The caller holds one admission slot for the primary. With ``admission``
+    the secondary runs concurrently only if it can take a second slot, and
+    otherwise after the primary.
+    """
+    stages: list[dict[str, str]] = []
+
+    def _prog(stage: str, detail: str = "") -> None:
+        entry = {"stage": stage}
+        if detail:
+            entry["detail"] = detail[:160]
+        stages.append(entry)
+        if progress is not None:
+            progress(stage, detail)
+
+    def _cancelled() -> bool:
+        return should_cancel is not None and should_cancel()
+
+    if persist_mode(persist) != 'all':
+        result = supervisor.process_request(request_text, use_cache, persist)
+        _prog('primary_done', 'success' if result.get('success') else 'error')
+        _prog('secondary_skipped', f'persist={persist_mode(persist)}')
+        result['progress'] = stages
+        return result
+
+    secondary_prompt = _make_secondary_prompt(request_text)
+    if secondary_prompt == request_text:
+        result = supervisor.process_request(request_text, use_cache)
+        _prog('primary_done', 'success' if result.get('success') else 'error')
+        _prog('secondary_reused', 'request already targets an executable')
+        result.setdefault('autobuild', _build_autobuild_info(result, secondary_prompt))
+        result['progress'] = stages
+        return result
+
+    secondary_future: "Future[Dict[str, Any]] | None" = None
+    if secondary_supervisor is not None and not _cancelled():
+        secondary_future = _start_secondary(admission, secondary_supervisor.process_request, secondary_prompt, use_cache)
+        if secondary_future is not None:
+            _prog('secondary_start', secondary_prompt[:80])
+    result = supervisor.process_request(request_text, use_cache)
+    _prog('primary_done', 'success' if result.get('success') else 'error')
+    if _cancelled():
+        _prog('cancelled', 'autobuild skipped' if secondary_future is None else 'autobuild discarded')
+        result['progress'] = stages
+        return result
+    if secondary_future is None:
+        _prog('secondary_start', secondary_prompt[:80])
+        secondary_result = supervisor.process_request(secondary_prompt, use_cache)
+    else:
+        secondary_result = secondary_future.result()
+    _prog('secondary_done', 'success' if secondary_result.get('success') else 'error')
+    result.setdefault('autobuild', _build_autobuild_info(secondary_result, secondary_prompt))
+    result['progress'] = stages
+    return result
+
+
+def _stream_pipeline(
+    bus: EventBus,
+    topic: str,
+    supervisor: Supervisor,
+    secondary_supervisor: Supervisor,
+    request_text: str,
+    admission: Any = None,
+) -> Dict[str, Any]:
+    """Run the /process_stream pipelines, publishing progress, step and result events on ``topic``.
+
+    Publishing never blocks, so a slow or vanished client cannot stall the
+    pipeline: each SSE connection relays its own subscription. The final
+    ``result`` (or ``error``) is critical and always delivered; the topic is
+    closed when the run ends. As in ``_run_with_autobuild``, the secondary
+    pipeline runs concurrently only when ``admission`` has a slot for it.
+    """
+    step_events: list[dict[str, object]] = []
+    steps_lock = threading.Lock()
+
+    def _progress_for(phase: str) -> Callable[[dict[str, object]], None]:
+        def _progress(ev: dict[str, object]):
+            # Tagged with the pipeline it came from; a lagging subscriber keeps the latest state per step
+            evt = {
+                'phase': phase,
+                'event': ev.get('event'),
+                'step': ev.get('step'),
+                'action': ev.get('action'),
+                'status': ev.get('status')
+            }
+            with steps_lock:
+                step_events.append(evt)
+            bus.publish(topic, 'step', evt, key=(phase, evt['step']))
+        return _progress
+
+    final_payload: Dict[str, Any] = {}
+    try:
+        bus.publish(topic, 'progress', {'stage': 'primary_start'})
+        secondary_prompt = _make_secondary_prompt(request_text)
+        secondary_future: "Future[Dict[str, Any]] | None" = None
+        secondary_request = {'description': secondary_prompt, '_progress_cb': _progress_for('secondary')}
+        if secondary_prompt != request_text:
+            secondary_future = _start_secondary(admission, secondary_supervisor.process_request, secondary_request)
+            if secondary_future is not None:
+                bus.publish(topic, 'progress', {'stage': 'secondary_start', 'prompt': secondary_prompt[:80]})
+        # Inject callback by wrapping request into dict for orchestrator path
+        primary = supervisor.process_request({'description': request_text, '_progress_cb': _progress_for('primary')})
+        bus.publish(topic, 'progress', {'stage': 'primary_done', 'success': primary.get('success', False)})
+        if secondary_prompt == request_text:
+            # Request already asks for an executable: the primary run is the autobuild run
+            secondary = primary
+            bus.publish(topic, 'progress', {'stage': 'secondary_reused'})
+        elif secondary_future is None:
+            bus.publish(topic, 'progress', {'stage': 'secondary_start', 'prompt': secondary_prompt[:80]})
+            secondary = secondary_supervisor.process_request(secondary_request)
+        else:
+            secondary = secondary_future.result()
+        bus.publish(topic, 'progress', {'stage': 'secondary_done', 'success': secondary.get('success', False)})
+        with steps_lock:
+            steps = step_events[-200:]
+        final_payload = {
+            'primary': primary.get('success'),
+            'secondary': secondary.get('success'),
+            'autobuild': _build_autobuild_info(secondary, secondary_prompt),
+            'steps': steps,
+        }
+        bus.publish(topic, 'result', final_payload, critical=True)
+    except Exception as e:
+        bus.publish(topic, 'error', {'error': str(e)}, critical=True)
+    finally:
+        bus.close_topic(topic)
+    return final_payload
+
+
+## _as_str_list helper removed (unused after refactor)
+
+
+def interactive_mode() -> None:
+    """Run interactive REPL mode."""
+    supervisor = Supervisor()
+    help_text = (
+        "Available commands:\n"
+        "- help: Show this help message\n"
+        "- status: Show supervisor status\n"
+        "- agents: List available agents\n"
+        "- health: Run health check\n"
+        "- quit/exit/q: Exit the program\n\n"
+        "Or type any natural language request to process it through the agents.\n\n"
+        "Examples:\n"
+        "- Generate a Python function to calculate prime numbers\n"
+        "- Test this code for syntax errors\n"
+        "- Design a web API architecture\n"
+        "- Save this data to memory\n"
+    )
+    while True:
+        try:
+            user_input = input("\n> ").strip()
+            if user_input.lower() in {"quit", "exit", "q"}:
+                print("Goodbye!")
+                break
+            if user_input.lower() == "help":
+                print(help_text)
+                continue
+            if user_input.lower() == "status":
                 status = supervisor.get_status()
-                self.wfile.write(json.dumps(status, indent=2).encode())
-            elif self.path == '/health':
-                self.send_response(200)
-                self.send_header('Content-Type', CONTENT_TYPE_JSON)
-                self.end_headers()
+                print(f"Status: {status['status']}")
+                print(f"Agents: {', '.join(status['agents'])}")
+                print(f"Tasks processed: {status['total_tasks_processed']}")
+                continue
+            if user_input.lower() == "agents":
+                agent_info = supervisor.get_agent_info()
+                for name, info in agent_info.items():
+                    print(f"  {name}: {info['version']}")
+                continue
+            if user_input.lower() == "health":
                 health = supervisor.health_check()
-                self.wfile.write(json.dumps(health, indent=2).encode())
+                print(f"Overall status: {health['overall_status']}")
+                for agent, st in health['agent_checks'].items():
+                    print(f"  {agent}: {st['status']}")
+                continue
+            if user_input:
+                result = supervisor.process_request(user_input)
+                if result.get("success"):
+                    print(f"✅ Success (took {result['processing_time']:.2f}s)")
+                    inner_raw_obj = result.get("result")
+                    if isinstance(inner_raw_obj, dict):
+                        inner_raw = inner_raw_obj  # type: ignore[assignment]
+                        raw_code_obj = inner_raw.get("code")  # type: ignore[index]
+                        code_val = raw_code_obj if isinstance(raw_code_obj, str) else None
+                        if isinstance(code_val, str) and code_val:
+                            print("📝 Generated code:")
+                            snippet = code_val[:200] + "..." if len(code_val) > 200 else code_val
+                            print(snippet)
+                else:
+                    print(f"❌ Error: {result.get('error', 'Unknown error')}")
+        except KeyboardInterrupt:
+            print("\nGoodbye!")
+            break
+        except EOFError:
+            # Handle piped input gracefully
+            print("\nGoodbye!")
+            break
+        except Exception as e:  # pragma: no cover
+            print(f"Error: {e}")
+
+
+def api_mode(
+    port: int = 8000,
+    workers: int | None = None,
+    fast_workers: int = 2,
+    max_pipelines: int | None = None,
+    max_queue: int | None = None,
+) -> None:
+    """Run a minimal API server with a simple text UI at /.
+
+    Connections are served by a bounded worker pool; the UI page, /health and
+    /status run on a separate fast lane so long pipeline runs cannot starve them.
+    Pipeline requests pass admission control (``max_pipelines`` running,
+    ``max_queue`` waiting, 429 beyond that).
+    """
+    print(f"OrbitSuite Core API server starting on port {port}")
+    print("Open http://localhost:%d in your browser for the simple UI" % port)
+    
+    supervisor = Supervisor()
+    # Dedicated supervisor for the autobuild pass so it can run alongside the primary
+    secondary_supervisor = Supervisor()
+    
+    # Simple HTTP server implementation
+    from http.server import BaseHTTPRequestHandler
+    from src.server.http_pool import PooledHTTPServer
+    from src.job_manager import Job, JobManager, JobQueueFull, parse_job_events_path, parse_job_path
+    from src.event_bus import BUS
+    from src.admission import AdmissionController, AdmissionRejected
+    from src.server.http_metrics import MetricsHandlerMixin, metrics_payload
+    from src.server.http_utils import ResponseMixin, StaticPage, route_of
+    from src.server.http_keepalive import KeepAliveHandlerMixin
+    from src.batching import default_parallelism, validate_batch_items
+
+    jobs = JobManager()
+    admission = AdmissionController(max_active=max_pipelines, max_queue=max_queue)
+    _background_pool(admission.max_active)  # every background pipeline holds a slot
+    ui_page = StaticPage(_render_ui_page(port))
+
+    def _job_runner(request_text: str, use_cache: bool = True, persist: Any = None) -> Callable[[Job], Dict[str, Any]]:
+        def _run(job: Job) -> Dict[str, Any]:
+            # Jobs are already bounded by the job queue: wait for a slot instead of rejecting
+            with admission.slot(enforce_queue_limit=False):
+                job.check_cancelled()
+                return _run_with_autobuild(
+                    supervisor, request_text,
+                    progress=lambda stage, detail: job.report(stage, detail),
+                    should_cancel=lambda: job.cancel_requested,
+                    secondary_supervisor=secondary_supervisor,
+                    use_cache=use_cache,
+                    persist=persist,
+                    admission=admission,
+                )
+        return _run
+
+    def _busy(e: AdmissionRejected) -> tuple[Dict[str, Any], Dict[str, str]]:
+        return {'error': 'Server busy', 'detail': str(e), 'retry_after': e.retry_after}, {'Retry-After': str(e.retry_after)}
+
+    class CoreHandler(MetricsHandlerMixin, KeepAliveHandlerMixin, ResponseMixin, BaseHTTPRequestHandler):
+        metrics_server = 'api'
+        metrics_routes = frozenset({'/', '/index.html', '/status', '/health', '/metrics',
+                                    '/process', '/process_stream', '/process/batch', '/jobs'})
+
+        def do_DELETE(self):
+            job_id = parse_job_path(self.path)
+            if job_id is None:
+                return self._json(404, {'error': 'Not Found'})
+            job = jobs.cancel(job_id)
+            if job is None:
+                return self._json(404, {'error': 'Unknown job', 'job_id': job_id})
+            return self._json(200, job.to_dict(include_result=False))
+
+        def do_GET(self):
+            route = route_of(self.path)
+            if route == '/metrics':
+                content_type, body = metrics_payload(self.path)
+                return self._send_body(200, body, content_type)
+            events_id = parse_job_events_path(self.path)
+            if events_id is not None:
+                events = jobs.subscribe(events_id)
+                if events is None:
+                    return self._json(404, {'error': 'Unknown job', 'job_id': events_id})
+                return self.stream_sse(events)
+            job_id = parse_job_path(self.path)
+            if job_id is not None:
+                job = jobs.get(job_id)
+                if job is None:
+                    return self._json(404, {'error': 'Unknown job', 'job_id': job_id})
+                return self._json(200, job.to_dict())
+            if route in ('/', '/index.html'):
+                self.send_static(ui_page)
+            elif route == '/status':
+                status = supervisor.get_status()
+                status['jobs'] = jobs.stats()
+                status['admission'] = admission.stats()
+                self._json(200, status)
+            elif route == '/health':
+                self._json(200, supervisor.health_check())
             else:
-                self.send_response(404)
-                self.end_headers()
-                self.wfile.write(b'Not Found')
+                self._send_body(404, b'Not Found', 'text/plain')
         
         def do_POST(self):
+            route = route_of(self.path)
+            # Queued job endpoint: returns immediately, poll GET /jobs/{id}
+            if route == '/jobs':
+                content_length = int(self.headers.get('Content-Length', '0') or 0)
+                post_data = self.rfile.read(content_length) if content_length else b''
+                try:
+                    data = json.loads(post_data.decode() or '{}')
+                except ValueError:
+                    return self._json(400, {'error': 'Invalid JSON'})
+                request_text = data.get('request', '') if isinstance(data, dict) else ''
+                if not request_text:
+                    return self._json(400, {'error': 'Missing "request" field'})
+                try:
+                    job = jobs.submit(_job_runner(request_text, data.get('use_cache') is not False, data.get('persist')),
+                                      label=truncate_string(request_text, 80))
+                except JobQueueFull as e:
+                    return self._json(429, {'error': str(e)}, {'Retry-After': '5'})
+                return self._json(202, {'job_id': job.id, 'status': job.status, 'location': f'/jobs/{job.id}'},
+                                  {'Location': f'/jobs/{job.id}'})
+            # Batch endpoint: NDJSON line per item as it completes (index = position in the batch)
+            if route == '/process/batch':
+                content_length = int(self.headers.get('Content-Length', '0') or 0)
+                post_data = self.rfile.read(content_length) if content_length else b''
+                try:
+                    data = json.loads(post_data.decode() or '{}')
+                except ValueError:
+                    return self._json(400, {'error': 'Invalid JSON'})
+                options: Dict[str, Any] = data if isinstance(data, dict) else {}
+                items = data if isinstance(data, list) else options.get('items')
+                error = validate_batch_items(items)
+                if error:
+                    return self._json(400, {'error': error})
+                use_cache = options.get('use_cache') is not False
+                max_parallel = options.get('max_parallel')
+                try:
+                    # Admit the batch as a whole; its fan-out never queues more than was admitted
+                    parallel = admission.ensure_room(min(len(items), max_parallel if isinstance(max_parallel, int)
+                                                         and max_parallel > 0 else default_parallelism()))
+                except AdmissionRejected as e:
+                    return self._json(429, *_busy(e))
+
+                def _run_item(item: Any) -> Dict[str, Any]:
+                    # Items share the pipeline slots with every other request (no autobuild pass)
+                    with admission.slot(enforce_queue_limit=False):
+                        return supervisor.process_request(item, use_cache, options.get('persist'))
+
+                self.stream_ndjson(
+                    supervisor.process_batch(items, max_parallel=parallel, runner=_run_item),
+                    fields=options.get('fields'),
+                )
+                return
             # Streaming endpoint
-            if self.path == '/process_stream':
+            if route == '/process_stream':
                 try:
-                    content_length = int(self.headers['Content-Length'])
-                    post_data = self.rfile.read(content_length)
-                    data = json.loads(post_data.decode())
-                    request_text = data.get('request', '')
-                    if not request_text:
-                        self.send_response(400)
-                        self.send_header('Content-Type', 'text/plain')
-                        self.end_headers()
-                        self.wfile.write(b'Missing request')
-                        return
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/event-stream')
-                    self.send_header('Cache-Control', 'no-cache')
-                    self.end_headers()
-                    def sse(event: str, data_str: str):
-                        try:
-                            self.wfile.write(f"event: {event}\n".encode())
-                            self.wfile.write(f"data: {data_str}\n\n".encode())
-                            self.wfile.flush()
-                        except Exception:
-                            pass
-                    sse('progress', json.dumps({'stage':'primary_start'}))
-                    step_events: list[dict[str, object]] = []
-                    def _progress(ev: dict[str, object]):
-                        # Forward immediately as SSE
-                        evt = {
-                            'event': ev.get('event'),
-                            'step': ev.get('step'),
-                            'action': ev.get('action'),
-                            'status': ev.get('status')
-                        }
-                        step_events.append(evt)
-                        try:
-                            sse('step', json.dumps(evt))
-                        except Exception:
-                            pass
-                    # Inject callback by wrapping request into dict for orchestrator path
-                    primary = supervisor.process_request({'description': request_text, '_progress_cb': _progress})
-                    sse('progress', json.dumps({'stage':'primary_done','success':primary.get('success', False)}))
-                    secondary_prompt = _make_secondary_prompt(request_text)
-                    sse('progress', json.dumps({'stage':'secondary_start','prompt':secondary_prompt[:80]}))
-                    secondary = supervisor.process_request({'description': secondary_prompt, '_progress_cb': _progress})
-                    sse('progress', json.dumps({'stage':'secondary_done','success':secondary.get('success', False)}))
-                    sec_pipe: Dict[str, Any] = _extract_pipeline_artifacts(secondary)
-                    final_payload: Dict[str, Any] = {
-                        'primary': primary.get('success'),
-                        'secondary': secondary.get('success'),
-                        'autobuild': {
-                            'prompt_used': secondary_prompt,
-                            'executable': sec_pipe.get('executable_artifact'),
-                            'final_output': sec_pipe.get('final_output'),
-                            'task_slug': sec_pipe.get('task_slug'),
-                            'task_dir': sec_pipe.get('task_dir'),
-                            'build_log': sec_pipe.get('executable_build_log'),
-                            'build_note': sec_pipe.get('executable_note') or sec_pipe.get('executable_note_text'),
-                        },
-                        'steps': step_events[-200:]
-                    }
-                    sse('result', json.dumps(final_payload))
-                except Exception as e:
+                    content_length = int(self.headers.get('Content-Length', '0') or 0)
+                    post_data = self.rfile.read(content_length) if content_length else b''
+                    data = json.loads(post_data.decode() or '{}')
+                    request_text = data.get('request', '') if isinstance(data, dict) else ''
+                except ValueError:
+                    return self._json(400, {'error': 'Invalid JSON'})
+                if not request_text:
+                    return self._send_body(400, b'Missing request', 'text/plain')
+                try:
+                    admission.acquire()
+                except AdmissionRejected as e:
+                    return self._json(429, *_busy(e))
+                slot_start = time.time()
+                topic = f'stream:{uuid.uuid4().hex}'
+                events = BUS.subscribe(topic)
+
+                def _pipeline() -> Dict[str, Any]:
                     try:
-                        self.wfile.write(f"event: error\ndata: {json.dumps({'error':str(e)})}\n\n".encode())
-                    except Exception:
-                        pass
+                        return _stream_pipeline(BUS, topic, supervisor, secondary_supervisor, request_text, admission)
+                    finally:
+                        admission.release(time.time() - slot_start)
+
+                # The pipeline publishes from its own thread; only this handler waits on the client
+                _start_background(_pipeline)
+                self.stream_sse(events)
                 return
             # Standard /process endpoint
-            if self.path == '/process':
+            if route == '/process':
                 content_length = int(self.headers.get('Content-Length','0'))
                 post_data = self.rfile.read(content_length) if content_length else b''
                 try:
@@ -372,57 +655,40 @@ def api_mode(port: int = 8000) -> None:
                     data = json.loads(post_data.decode() or '{}')
                     request_text = data.get('request', '')
                     if not request_text:
-                        self.send_response(400)
-                        self.send_header('Content-Type', CONTENT_TYPE_JSON)
-                        self.end_headers()
-                        self.wfile.write(json.dumps({'error':'Missing "request" field'}).encode())
-                        return
+                        return self._json(400, {'error': 'Missing "request" field'})
                     if is_verbose():
                         print(f"[HTTP] /process request: {truncate_string(request_text,160)}")
-                    progress: list[dict[str, str]] = []
-                    def _prog(stage: str, detail: str = ""):
-                        entry = {"stage": stage}
-                        if detail:
-                            entry["detail"] = detail[:160]
-                        progress.append(entry)
-                    # Run primary request synchronously and record its status
-                    result = supervisor.process_request(request_text)
-                    _prog('primary_done', 'success' if result.get('success') else 'error')
-                    secondary_prompt = _make_secondary_prompt(request_text)
-                    _prog('secondary_start', secondary_prompt[:80])
-                    secondary_result = supervisor.process_request(secondary_prompt)
-                    _prog('secondary_done', 'success' if secondary_result.get('success') else 'error')
-                    sec_pipe: Dict[str, Any] = _extract_pipeline_artifacts(secondary_result)
-                    autobuild_info = _build_autobuild_info(secondary_result, secondary_prompt)
-                    result.setdefault('autobuild', autobuild_info)
-                    result['progress'] = progress
+                    # Run primary + secondary concurrently (use POST /jobs to avoid holding the connection)
+                    try:
+                        with admission.slot():
+                            result = _run_with_autobuild(supervisor, request_text, secondary_supervisor=secondary_supervisor,
+                                                         use_cache=data.get('use_cache') is not False,
+                                                         persist=data.get('persist'), admission=admission)
+                    except AdmissionRejected as e:
+                        return self._json(429, *_busy(e))
                     if is_verbose():
                         took = time.time() - start
                         print(f"[HTTP] /process response in {took:.2f}s success={result.get('success')}")
-                    self.send_response(200)
-                    self.send_header('Content-Type', CONTENT_TYPE_JSON)
-                    self.end_headers()
-                    self.wfile.write(json.dumps(result, indent=2, default=str).encode())
+                    self._json(200, result, fields=data.get('fields'))
                 except Exception as e:
-                    self.send_response(500)
-                    self.send_header('Content-Type', CONTENT_TYPE_JSON)
-                    self.end_headers()
-                    self.wfile.write(json.dumps({'error': str(e)}).encode())
+                    self._json(500, {'error': str(e)})
                 return
-            # Unknown path
-            self.send_response(404)
-            self.end_headers()
-            self.wfile.write(b'Not Found')
+            # Unknown path: the body was not read, so the connection cannot be reused
+            self.close_connection = True
+            self._send_body(404, b'Not Found', 'text/plain', {'Connection': 'close'})
     
-    server = HTTPServer(('127.0.0.1', port), CoreHandler)
-    print(f"Server running at http://localhost:{port}")
+    server = PooledHTTPServer(('127.0.0.1', port), CoreHandler, workers=workers, fast_workers=fast_workers)
+    print(f"Server running at http://localhost:{port} (workers={server.workers}, fast lane={server.fast_workers}, "
+          f"event streams={server.stream_workers})")
     print("Press Ctrl+C to stop")
     
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         print("\nShutting down server...")
-        server.shutdown()
+    finally:
+        server.server_close()
+        jobs.shutdown()
 
 
 ## _http_get removed (local server spawning removed in Core)
@@ -437,6 +703,9 @@ def main():
     i = 0
     autobuild = False
     autobuild_prompt: str | None = None
+    workers: int | None = None
+    fast_workers = 2
+    limits: Dict[str, int] = {}
     while i < len(args):
         a = args[i]
         if a in ("-v", "--verbose"):
@@ -446,6 +715,35 @@ def main():
         elif a.startswith("--autobuild-prompt="):
             autobuild = True
             autobuild_prompt = a.split("=",1)[1].strip() or None
+        elif a.startswith("--max-pipelines=") or a.startswith("--max-queue="):
+            flag, val = a.split("=", 1)
+            try:
+                limits["max_pipelines" if flag == "--max-pipelines" else "max_queue"] = max(0, int(val))
+            except ValueError:
+                print(f"[startup] Ignoring invalid {flag} value: {val}")
+        elif a.startswith("--workers=") or a.startswith("--fast-workers="):
+            flag, val = a.split("=", 1)
+            try:
+                if flag == "--workers":
+                    workers = max(1, int(val))
+                else:
+                    fast_workers = max(1, int(val))
+            except ValueError:
+                print(f"[startup] Ignoring invalid {flag} value: {val}")
+        elif a in ("--workers", "--fast-workers") and i + 1 < len(args):
+            try:
+                if a == "--workers":
+                    workers = max(1, int(args[i + 1]))
+                else:
+                    fast_workers = max(1, int(args[i + 1]))
+            except ValueError:
+                print(f"[startup] Ignoring invalid {a} value: {args[i + 1]}")
+            i += 1
+        elif a.startswith("--record-llm=") or a.startswith("--replay-llm="):
+            # LLM cassette (see src/llm_cassette.py): deterministic benchmark runs
+            flag, path = a.split("=", 1)
+            os.environ["ORBITSUITE_LLM_CASSETTE"] = path
+            os.environ["ORBITSUITE_LLM_CASSETTE_MODE"] = "record" if flag == "--record-llm" else "replay"
         elif a.startswith("--wait="):
             val = a.split("=", 1)[1]
             try:
@@ -491,16 +789,16 @@ def main():
         first = mode_args[0]
         if first in ("api", "ui"):
             port = int(mode_args[1]) if len(mode_args) > 1 else 8000
-            api_mode(port)
+            api_mode(port, workers=workers, fast_workers=fast_workers, **limits)
             return
         if first in ("serve", "start"):
             ui_port = int(mode_args[1]) if len(mode_args) > 1 else 8000
-            api_mode(ui_port)
+            api_mode(ui_port, workers=workers, fast_workers=fast_workers, **limits)
             return
     # No mode args: if frozen default to api (UI); else interactive
     if getattr(sys, 'frozen', False):
         ui_port = int(os.getenv('ORBITSUITE_UI_PORT', '8000'))
-        api_mode(ui_port)
+        api_mode(ui_port, workers=workers, fast_workers=fast_workers, **limits)
     else:
         interactive_mode()
 
@@ -0,0 +1,170 @@
+"""Admission control / backpressure for pipeline requests.
+
+Each HTTP request that runs the pipeline takes one slot. At most
+``max_active`` run at once; up to ``max_queue`` more wait for a slot; anything
+beyond that is rejected with ``AdmissionRejected`` carrying a Retry-After
+estimate derived from recent pipeline durations.
+
+Environment variables:
+  ORBITSUITE_MAX_PIPELINES  concurrent pipelines (default 2)
+  ORBITSUITE_MAX_QUEUE      requests allowed to wait for a slot (default 8)
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+try:
+    from .metrics import counter, gauge
+except ImportError:  # pragma: no cover - script execution
+    from metrics import counter, gauge  # type: ignore
+
+_DEFAULT_RETRY_AFTER = 5.0
+
+_ACTIVE = gauge("orbitsuite_admission_active", "Pipelines currently running")
+_QUEUED = gauge("orbitsuite_admission_queued", "Requests waiting for a pipeline slot")
+_REJECTED = counter("orbitsuite_admission_rejected_total", "Requests rejected by admission control")
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value >= 0 else default
+
+
+class AdmissionRejected(Exception):
+    """Raised when both the active slots and the wait queue are full."""
+
+    def __init__(self, retry_after: int, detail: str = "") -> None:
+        super().__init__(detail or f"server busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Counting gate with a bounded wait queue and live counters."""
+
+    def __init__(self, max_active: Optional[int] = None, max_queue: Optional[int] = None,
+                 history: int = 20) -> None:
+        self.max_active = max(1, max_active if max_active is not None else _env_int("ORBITSUITE_MAX_PIPELINES", 2))
+        self.max_queue = max(0, max_queue if max_queue is not None else _env_int("ORBITSUITE_MAX_QUEUE", 8))
+        self._cond = threading.Condition()
+        self._durations: Deque[float] = deque(maxlen=max(1, history))
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.completed = 0
+
+    # --- Estimates ---
+    def _avg_duration(self) -> float:
+        if not self._durations:
+            return _DEFAULT_RETRY_AFTER
+        return sum(self._durations) / len(self._durations)
+
+    def _estimate_locked(self) -> int:
+        rounds = (self.queued + 1) / self.max_active
+        return max(1, int(math.ceil(self._avg_duration() * rounds)))
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: queued work drained at max_active per round."""
+        with self._cond:
+            return self._estimate_locked()
+
+    # --- Slots ---
+    def acquire(self, enforce_queue_limit: bool = True, timeout: Optional[float] = None) -> None:
+        """Take a slot, waiting in the queue if needed.
+
+        ``enforce_queue_limit=False`` waits regardless of queue depth (used by callers
+        that are already bounded elsewhere, e.g. the job queue).
+        """
+        with self._cond:
+            if self.active >= self.max_active and enforce_queue_limit and self.queued >= self.max_queue:
+                self.rejected += 1
+                _REJECTED.inc()
+                raise AdmissionRejected(self._estimate_locked())
+            self.queued += 1
+            _QUEUED.inc()
+            try:
+                deadline = None if timeout is None else time.time() + timeout
+                while self.active >= self.max_active:
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        self.rejected += 1
+                        _REJECTED.inc()
+                        raise AdmissionRejected(self._estimate_locked(), "timed out waiting for a slot")
+                    self._cond.wait(remaining)
+            finally:
+                self.queued -= 1
+                _QUEUED.dec()
+            self.active += 1
+            self.admitted += 1
+            _ACTIVE.inc()
+
+    def try_acquire(self) -> bool:
+        """Take a free slot without waiting; never jumps ahead of queued requests."""
+        with self._cond:
+            if self.active >= self.max_active or self.queued:
+                return False
+            self.active += 1
+            self.admitted += 1
+            _ACTIVE.inc()
+            return True
+
+    def ensure_room(self, waiting: int = 1) -> int:
+        """Reject up front unless ``waiting`` more requests fit the free slots plus the queue.
+
+        ``waiting`` is first capped at ``max_active + max_queue`` (all an idle server
+        holds); the capped value is returned so a fan-out can be bounded by it.
+        """
+        with self._cond:
+            waiting = max(1, min(waiting, self.max_active + self.max_queue))
+            room = max(0, self.max_active - self.active) + max(0, self.max_queue - self.queued)
+            if waiting > room:
+                self.rejected += 1
+                _REJECTED.inc()
+                raise AdmissionRejected(self._estimate_locked())
+            return waiting
+
+    def release(self, duration: Optional[float] = None) -> None:
+        with self._cond:
+            if self.active:
+                self.active -= 1
+                _ACTIVE.dec()
+            self.completed += 1
+            if duration is not None:
+                self._durations.append(duration)
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self, enforce_queue_limit: bool = True, timeout: Optional[float] = None) -> Iterator[None]:
+        """``with controller.slot(): run_pipeline()`` - records the run duration."""
+        self.acquire(enforce_queue_limit=enforce_queue_limit, timeout=timeout)
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.release(time.time() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "max_active": self.max_active,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "queued": self.queued,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "avg_duration": round(self._avg_duration(), 3) if self._durations else None,
+            }
+
+
+__all__ = ["AdmissionController", "AdmissionRejected"]
@@ -0,0 +1,396 @@
+"""One writer for every agent artifact (stdlib only).
+
+Each write goes to a temporary file beside the target, which then replaces the
+target with ``os.replace``. Readers therefore see the old file or the new one,
+never a torn write. ``unique_path`` gives collision-free names
+(``test_<epoch>_<pid>-<n>.json``), so reports from runs that finish in the
+same second no longer overwrite each other.
+
+Modes (ORBITSUITE_ARTIFACT_MODE):
+  behind    (default) writes are queued to a background thread and overlap the
+            rest of the pipeline. A task waits for its own writes before it
+            returns, so its files exist once the response is built.
+  detached  queued as above, but tasks do not wait. Files land shortly after
+            the response, and at the latest at interpreter exit.
+  sync      every write happens inline.
+
+Content is encoded when the write is submitted, so later changes to the object
+do not leak into the file. ``read_text`` / ``exists`` also see queued content.
+Writes that something reads back from disk straight away, such as generated
+code handed to a build, pass ``sync=True``.
+
+Persistence (per request, ``persist`` / ORBITSUITE_PERSIST):
+  all    (default) artifacts go to disk as above.
+  none   writes made while a ``MemoryArtifacts`` store is active in the run
+         context (``use_context(artifact_store=...)``) go into that store
+         instead. No directories are created; the orchestrator returns the
+         files in the response under ``artifacts``.
+  final  like ``none``, then the whole store is saved as one bundle file
+         (``<task>/final/bundle.json``).
+
+Writes made while a ``WriteStats`` is active in the run context
+(``use_context(artifact_stats=...)``) are counted on it. The orchestrator
+reports the files, bytes and write latency of each task as ``artifact_io``.
+
+Environment variables:
+  ORBITSUITE_ARTIFACT_MODE   behind | detached | sync (default behind)
+  ORBITSUITE_ARTIFACT_FSYNC  none | file | full (default none). ``file`` fsyncs
+                             each file before the rename; ``full`` also fsyncs
+                             the directory, so the rename survives power loss.
+  ORBITSUITE_ARTIFACT_JSON   pretty | compact (default pretty: 2-space indent)
+  ORBITSUITE_ARTIFACT_QUEUE  queued writes before submitters block (default 256)
+  ORBITSUITE_PERSIST         default persistence when a request names none (all)
+"""
+from __future__ import annotations
+
+import atexit
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set, Tuple, Union
+
+try:
+    from .metrics import counter, histogram
+    from .run_context import current_context
+except ImportError:  # pragma: no cover - flat imports
+    from metrics import counter, histogram  # type: ignore
+    from run_context import current_context  # type: ignore
+
+PathLike = Union[str, Path]
+
+MODES = ("behind", "detached", "sync")
+FSYNC_POLICIES = ("none", "file", "full")
+PERSIST_MODES = ("all", "final", "none")
+
+WRITE_SECONDS = histogram("orbitsuite_artifact_write_seconds", "Artifact write latency (temp file + rename)",
+                          ["mode"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+WRITE_BYTES = counter("orbitsuite_artifact_bytes_total", "Artifact bytes written", ["mode"])
+
+_SEQ = itertools.count(1)
+_STOP = object()
+
+
+def _env_choice(name: str, choices: Tuple[str, ...], default: str) -> str:
+    value = os.getenv(name, "").strip().lower()
+    return value if value in choices else default
+
+
+def persist_mode(value: Any = None) -> str:
+    """Normalize a request's ``persist`` option: true/false or all/final/none (None = environment default)."""
+    if value is None:
+        return _env_choice("ORBITSUITE_PERSIST", PERSIST_MODES, "all")
+    if isinstance(value, bool):
+        return "all" if value else "none"
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes", "on"):
+        return "all"
+    if text in ("0", "false", "no", "off"):
+        return "none"
+    if text not in PERSIST_MODES:
+        raise ValueError(f"persist must be true, false or one of {PERSIST_MODES}, got {value!r}")
+    return text
+
+
+def in_memory() -> bool:
+    """True while the running task keeps its artifacts in a ``MemoryArtifacts`` store."""
+    return current_context().artifact_store is not None
+
+
+class MemoryArtifacts:
+    """In-memory artifact files of one task (path -> bytes)."""
+
+    def __init__(self) -> None:
+        self._files: Dict[str, bytes] = {}
+        self._dirs: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def put(self, path: str, data: bytes) -> None:
+        with self._lock:
+            self._files[path] = data
+
+    def get(self, path: str) -> Optional[bytes]:
+        with self._lock:
+            return self._files.get(path)
+
+    def reserve_dir(self, path: PathLike) -> Path:
+        """``path``, or ``path_2``, ``path_3``... if an earlier call already took it."""
+        base, candidate, n = str(path), str(path), 1
+        with self._lock:
+            while candidate in self._dirs:
+                n += 1
+                candidate = f"{base}_{n}"
+            self._dirs.add(candidate)
+        return Path(candidate)
+
+    def files(self, relative_to: Optional[PathLike] = None) -> Dict[str, str]:
+        """Files as text, keyed by path relative to ``relative_to`` where possible."""
+        root = str(Path(relative_to).absolute()) if relative_to is not None else None
+        with self._lock:
+            items = sorted(self._files.items())
+        out: Dict[str, str] = {}
+        for path, data in items:
+            key = os.path.relpath(path, root) if root and path.startswith(root + os.sep) else path
+            out[key.replace(os.sep, "/")] = data.decode("utf-8", "replace")
+        return out
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(len(d) for d in self._files.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+
+class WriteStats:
+    """Artifact writes of one task: files, bytes, errors and latency."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self.files = 0
+        self.bytes = 0
+        self.errors = 0
+        self.pending = 0
+        self.write_seconds = 0.0
+        self.max_write_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _submitted(self) -> None:
+        with self._cond:
+            self.pending += 1
+
+    def _finished(self, nbytes: int, seconds: float, ok: bool) -> None:
+        with self._cond:
+            self.pending -= 1
+            if ok:
+                self.files += 1
+                self.bytes += nbytes
+            else:
+                self.errors += 1
+            self.write_seconds += seconds
+            self.max_write_seconds = max(self.max_write_seconds, seconds)
+            if not self.pending:
+                self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every write counted here is on disk; False on timeout."""
+        started = time.perf_counter()
+        with self._cond:
+            done = self._cond.wait_for(lambda: not self.pending, timeout)
+            self.wait_seconds += time.perf_counter() - started
+        return done
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "files": self.files,
+                "bytes": self.bytes,
+                "errors": self.errors,
+                "pending": self.pending,
+                "write_ms": round(self.write_seconds * 1000, 3),
+                "max_write_ms": round(self.max_write_seconds * 1000, 3),
+                "wait_ms": round(self.wait_seconds * 1000, 3),
+            }
+
+
+class ArtifactWriter:
+    """Atomic artifact writes, optionally behind a background queue."""
+
+    def __init__(self, mode: Optional[str] = None, fsync: Optional[str] = None,
+                 compact: Optional[bool] = None, queue_size: Optional[int] = None) -> None:
+        self.mode = mode or _env_choice("ORBITSUITE_ARTIFACT_MODE", MODES, "behind")
+        self.fsync = fsync or _env_choice("ORBITSUITE_ARTIFACT_FSYNC", FSYNC_POLICIES, "none")
+        if self.mode not in MODES or self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"unknown artifact mode/fsync policy: {self.mode}/{self.fsync}")
+        self.compact = compact if compact is not None else \
+            _env_choice("ORBITSUITE_ARTIFACT_JSON", ("pretty", "compact"), "pretty") == "compact"
+        if queue_size is None:
+            try:
+                queue_size = int(os.getenv("ORBITSUITE_ARTIFACT_QUEUE", "256"))
+            except ValueError:
+                queue_size = 256
+        self.totals = WriteStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, queue_size))
+        self._pending: Dict[str, Tuple[int, bytes]] = {}  # path -> newest queued (seq, data)
+        self._lock = threading.Lock()
+        self._landed = threading.Condition(self._lock)  # notified as queued writes finish
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Encoding / naming ---
+    def dumps(self, obj: Any) -> str:
+        if self.compact:
+            return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+
+    @staticmethod
+    def unique_path(directory: PathLike, stem: str, suffix: str = ".json") -> Path:
+        """``directory/<stem>_<epoch>_<pid>-<n><suffix>``: unique across threads and processes."""
+        return Path(directory) / f"{stem}_{int(time.time())}_{os.getpid()}-{next(_SEQ)}{suffix}"
+
+    # --- Writes ---
+    def write_json(self, path: PathLike, obj: Any, sync: bool = False) -> str:
+        return self.write_text(path, self.dumps(obj), sync=sync)
+
+    def write_text(self, path: PathLike, text: str, sync: bool = False) -> str:
+        return self.write_bytes(path, text.encode("utf-8"), sync=sync)
+
+    def write_bytes(self, path: PathLike, data: bytes, sync: bool = False) -> str:
+        """Write ``data`` to ``path`` (queued unless ``sync`` or sync mode) and return the path."""
+        target = str(Path(path).absolute())
+        ctx = current_context()
+        stats = ctx.artifact_stats
+        for s in (self.totals, stats):
+            if s is not None:
+                s._submitted()
+        if ctx.artifact_store is not None:
+            started = time.perf_counter()
+            ctx.artifact_store.put(target, data)
+            for s in (self.totals, stats):
+                if s is not None:
+                    s._finished(len(data), time.perf_counter() - started, True)
+            return str(path)
+        if sync or self.mode == "sync":
+            self._write(target, data, stats, raise_errors=True)
+            return str(path)
+        seq = next(_SEQ)
+        with self._lock:
+            self._pending[target] = (seq, data)
+            self._ensure_thread()
+        self._queue.put((target, seq, data, stats))  # blocks while the queue is full (backpressure)
+        return str(path)
+
+    def _write(self, target: str, data: bytes, stats: Optional[WriteStats], raise_errors: bool = False) -> None:
+        started = time.perf_counter()
+        ok = False
+        try:
+            self._replace(target, data)
+            ok = True
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"[ArtifactWriter] write failed for {target}: {e}")
+        finally:
+            seconds = time.perf_counter() - started
+            WRITE_SECONDS.observe(seconds, mode=self.mode)
+            if ok:
+                WRITE_BYTES.inc(len(data), mode=self.mode)
+            for s in (self.totals, stats):
+                if s is not None:
+                    s._finished(len(data), seconds, ok)
+
+    def _replace(self, target: str, data: bytes) -> None:
+        directory = os.path.dirname(target)
+        os.makedirs(directory, exist_ok=True)
+        tmp = os.path.join(directory, f".{os.path.basename(target)}.{os.getpid()}-{next(_SEQ)}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+                if self.fsync != "none":
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp, target)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        if self.fsync == "full" and hasattr(os, "O_DIRECTORY"):
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+    # --- Background queue ---
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._drain, name="artifact-writer", daemon=True)
+            self._thread.start()
+
+    def _drain(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                target, seq, data, stats = job
+                self._write(target, data, stats)
+                with self._landed:
+                    if self._pending.get(target, (None,))[0] == seq:
+                        del self._pending[target]
+                        self._landed.notify_all()
+            finally:
+                self._queue.task_done()
+
+    # --- Reads that see queued content ---
+    def read_text(self, path: PathLike) -> str:
+        target = str(Path(path).absolute())
+        store = current_context().artifact_store
+        data = store.get(target) if store is not None else None
+        if data is None:
+            with self._lock:
+                queued = self._pending.get(target)
+            data = queued[1] if queued is not None else None
+        if data is not None:
+            return data.decode("utf-8")
+        return Path(path).read_text(encoding="utf-8")
+
+    def exists(self, path: PathLike) -> bool:
+        target = str(Path(path).absolute())
+        store = current_context().artifact_store
+        if store is not None and store.get(target) is not None:
+            return True
+        with self._lock:
+            if target in self._pending:
+                return True
+        return Path(path).is_file()
+
+    # --- Barriers ---
+    def settle(self, stats: WriteStats, timeout: Optional[float] = None) -> bool:
+        """End-of-task barrier: wait for ``stats``' writes unless running detached."""
+        return True if self.mode == "detached" else stats.wait(timeout)
+
+    def wait_for(self, paths: Iterable[PathLike], timeout: Optional[float] = None) -> bool:
+        """Wait until the queued writes to ``paths`` are on disk (not everyone's); False on timeout."""
+        targets = {str(Path(p).absolute()) for p in paths}
+        with self._landed:
+            return self._landed.wait_for(lambda: targets.isdisjoint(self._pending), timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for every queued write; False on timeout."""
+        return self.totals.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "fsync": self.fsync, "compact": self.compact,
+                "queued": self._queue.qsize(), **self.totals.as_dict()}
+
+    def close(self) -> None:
+        """Drain the queue and stop the background thread."""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+        self._thread = None
+
+
+_WRITER: Optional[ArtifactWriter] = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_writer() -> ArtifactWriter:
+    """The process-wide writer, configured from the environment on first use."""
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            _WRITER = ArtifactWriter()
+            atexit.register(_WRITER.close)
+        return _WRITER
+
+
+__all__ = ["ArtifactWriter", "FSYNC_POLICIES", "MODES", "MemoryArtifacts", "PERSIST_MODES", "WriteStats",
+           "get_writer", "in_memory", "persist_mode"]
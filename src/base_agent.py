@@ -4,24 +4,39 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 import abc
+import threading
 import time
 from typing import Any, Dict
 try:
     from .utils import is_verbose
+    from .metrics import AGENT_CALLS, AGENT_SECONDS
 except Exception:  # fallback for script execution
     from utils import is_verbose  # type: ignore
+    from metrics import AGENT_CALLS, AGENT_SECONDS  # type: ignore
 
 
 class BaseAgent(abc.ABC):
     """
     Minimal abstract agent class for OrbitSuite's core functionality.
     All agents inherit and implement their own run() method.
+
+    Agents are shared across concurrent requests: per-call state belongs in
+    ``src.run_context`` (or locals), and ``result`` is tracked per thread.
     """
     
     def __init__(self, name: str = "agent"):
         self.name = name
         self.context: Dict[str, Any] = {}
-        self.result: Any = None
+        self._local = threading.local()
+
+    @property
+    def result(self) -> Any:
+        """Last dispatch() result of the calling thread."""
+        return getattr(self._local, "result", None)
+
+    @result.setter
+    def result(self, value: Any) -> None:
+        self._local.result = value
 
     def dispatch(self, input_data: Any) -> Any:
         """
@@ -32,14 +47,23 @@ class BaseAgent(abc.ABC):
         if len(snippet) > 120:
             snippet = snippet[:117] + "..."
         print(f"[{self.name}] Processing: {snippet}")
-        self.result = self.run(input_data)
+        try:
+            result = self.run(input_data)
+        except Exception:
+            AGENT_SECONDS.observe(time.time() - start, agent=self.name)
+            AGENT_CALLS.inc(agent=self.name, outcome="error")
+            raise
+        self.result = result
         dur = time.time() - start
+        AGENT_SECONDS.observe(dur, agent=self.name)
+        failed = isinstance(result, dict) and result.get("success") is False  # type: ignore[union-attr]
+        AGENT_CALLS.inc(agent=self.name, outcome="failed" if failed else "ok")
         if is_verbose():
-            out_kind = type(self.result).__name__
+            out_kind = type(result).__name__
             print(f"[{self.name}] Completed in {dur:.2f}s (type={out_kind})")
         else:
             print(f"[{self.name}] Completed.")
-        return self.result
+        return result
 
     @abc.abstractmethod
     def run(self, input_data: Any) -> Any:
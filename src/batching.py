@@ -0,0 +1,98 @@
+"""Bounded-parallel batch execution behind ``Supervisor.process_batch`` (the /process/batch endpoints).
+
+``iter_completed`` runs one callable per item on a small thread pool and yields
+``(index, result)`` pairs in completion order, so callers can stream results as
+they finish while the index keeps the submission order recoverable. Each item
+runs in a copy of the caller's context (``run_context``), so request-scoped
+state such as progress callbacks follows it onto the pool. Stopping
+the iteration early (client gone, consumer ``break``) cancels items that have
+not started yet.
+
+Environment variables:
+  ORBITSUITE_BATCH_PARALLELISM  items run concurrently per batch (default 4)
+  ORBITSUITE_BATCH_MAX_ITEMS    largest batch the HTTP endpoints accept (default 100)
+"""
+from __future__ import annotations
+
+import contextvars
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else default
+
+
+def default_parallelism() -> int:
+    return _env_int("ORBITSUITE_BATCH_PARALLELISM", 4)
+
+
+def max_batch_items() -> int:
+    return _env_int("ORBITSUITE_BATCH_MAX_ITEMS", 100)
+
+
+def validate_batch_items(items: Any) -> Optional[str]:
+    """Return an error message unless ``items`` is a non-empty list of texts / task dicts."""
+    if not isinstance(items, list) or not items:
+        return "items must be a non-empty array"
+    if len(items) > max_batch_items():
+        return f"batch too large ({len(items)} items, max {max_batch_items()})"
+    for i, item in enumerate(items):
+        if isinstance(item, str) and item.strip():
+            continue
+        if isinstance(item, dict) and str(item.get("description", "")).strip():
+            continue
+        return f"item {i} must be a non-empty string or a task dict with a description"
+    return None
+
+
+def iter_completed(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    max_parallel: Optional[int] = None,
+    on_error: Optional[Callable[[T, BaseException], R]] = None,
+) -> Iterator[Tuple[int, R]]:
+    """Yield ``(index, fn(item))`` as items finish, at most ``max_parallel`` at a time.
+
+    Exceptions from ``fn`` are turned into results by ``on_error`` when given,
+    otherwise re-raised from the iterator.
+    """
+    if not items:
+        return
+    limit = max(1, min(max_parallel or default_parallelism(), len(items)))
+    pool = ThreadPoolExecutor(max_workers=limit, thread_name_prefix="orbit-batch")
+    pending: Dict["Future[R]", int] = {}
+    next_index = 0
+
+    def _submit(index: int) -> None:
+        pending[pool.submit(contextvars.copy_context().run, fn, items[index])] = index
+
+    try:
+        # Submit lazily: only ``limit`` items are queued, so an abandoned batch leaves nothing behind
+        while next_index < len(items) and len(pending) < limit:
+            _submit(next_index)
+            next_index += 1
+        while pending:
+            done: Set["Future[R]"] = wait(pending, return_when=FIRST_COMPLETED)[0]
+            for fut in done:
+                index = pending.pop(fut)
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    if on_error is None:
+                        raise
+                    result = on_error(items[index], e)
+                if next_index < len(items):
+                    _submit(next_index)
+                    next_index += 1
+                yield index, result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["default_parallelism", "iter_completed", "max_batch_items", "validate_batch_items"]
@@ -0,0 +1,229 @@
+"""Append-only checkpoint journal for resumable batch runs (stdlib only).
+
+A journal is a JSONL file with one small record per event:
+
+  {"op": "start", "id": "..."}                        item handed to a worker
+  {"op": "done",  "id": "...", "loc": "...", ...}     item finished; result stored at ``loc``
+  {"op": "fail",  "id": "...", "error": "..."}        item failed (retried on resume)
+  {"op": "mark",  ...}                                caller-defined progress marker
+
+Each record is flushed to the OS as it is written, so it survives a crash of
+the process. ``fsync`` is batched (every ``fsync_every`` records or
+``fsync_interval`` seconds, and on close), so a power loss can cost at most
+that window. A torn last line is ignored on replay.
+
+Opening with ``resume=True`` replays the previous journal. Finished items are
+then skipped by the caller, and items that were started but never finished
+(``in_flight``) are queued again. The journal is rewritten compactly at that
+point (one ``done`` record per finished item, one merged ``mark``). Without
+``resume`` the previous journal is discarded. ``discard()`` removes the journal
+and its stored results once a run completes.
+
+Environment variables:
+  ORBITSUITE_CHECKPOINT_FSYNC_EVERY     records between fsyncs (default 64)
+  ORBITSUITE_CHECKPOINT_FSYNC_INTERVAL  max seconds between fsyncs (default 1.0)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, "").strip())
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def item_id(index: int, item: Any) -> str:
+    """Stable id for the ``index``-th item of a batch: an edited item gets a new id."""
+    digest = hashlib.sha1(json.dumps(item, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+    return f"{index}:{digest}"
+
+
+class CheckpointJournal:
+    """Completed / in-flight bookkeeping for one batch run, persisted as an append-only journal."""
+
+    def __init__(self, path: str, resume: bool = False, fsync_every: Optional[int] = None,
+                 fsync_interval: Optional[float] = None) -> None:
+        self.path = os.path.abspath(path)
+        self.results_dir = self.path + ".d"
+        self.fsync_every = int(fsync_every or _env_number("ORBITSUITE_CHECKPOINT_FSYNC_EVERY", 64))
+        self.fsync_interval = fsync_interval or _env_number("ORBITSUITE_CHECKPOINT_FSYNC_INTERVAL", 1.0)
+        self._done: Dict[str, Dict[str, Any]] = {}
+        self._started: Dict[str, float] = {}
+        self._mark: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if resume:
+            self._replay()
+        else:
+            shutil.rmtree(self.results_dir, ignore_errors=True)
+        self.resumed_in_flight = self.in_flight()
+        self._compact()
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    # --- replay / compaction ---
+    def _replay(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn write from a crash
+            op, key = record.get("op"), record.get("id")
+            if op == "start":
+                self._started[key] = record.get("ts", 0.0)
+            elif op == "done":
+                self._done[key] = record
+                self._started.pop(key, None)
+            elif op == "fail":
+                self._done.pop(key, None)
+                self._started.pop(key, None)
+            elif op == "mark":
+                self._merge_mark(record)
+
+    def _merge_mark(self, record: Dict[str, Any]) -> None:
+        for k, v in record.items():
+            if k == "op":
+                continue
+            if isinstance(v, list) and isinstance(self._mark.get(k), list):
+                self._mark[k].extend(v)  # in place: rebuilding the list on every mark is quadratic
+            else:
+                self._mark[k] = list(v) if isinstance(v, list) else v
+
+    def _compact(self) -> None:
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for key, record in self._done.items():
+                f.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+            for key, ts in self._started.items():
+                f.write(json.dumps({"op": "start", "id": key, "ts": ts}, separators=(",", ":")) + "\n")
+            if self._mark:
+                f.write(json.dumps({"op": "mark", **self._mark}, separators=(",", ":"), default=str) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    # --- queries ---
+    def is_done(self, key: str) -> bool:
+        with self._lock:
+            return key in self._done
+
+    def record(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._done.get(key)
+
+    def done_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._done)
+
+    def in_flight(self) -> List[str]:
+        """Items started but not finished (by the previous run, when resuming)."""
+        with self._lock:
+            return [k for k in self._started if k not in self._done]
+
+    @property
+    def mark_state(self) -> Dict[str, Any]:
+        """All ``mark`` records merged (list values are concatenated, others overwritten)."""
+        with self._lock:
+            return {k: list(v) if isinstance(v, list) else v for k, v in self._mark.items()}
+
+    # --- writes ---
+    def _append(self, record: Dict[str, Any], sync: bool = False) -> None:
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            self._fh.write(line)
+            self._fh.flush()
+            self._unsynced += 1
+            if sync or self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+                os.fsync(self._fh.fileno())
+                self._unsynced = 0
+                self._last_sync = time.monotonic()
+
+    def start(self, key: str) -> None:
+        with self._lock:
+            self._started[key] = time.time()
+        self._append({"op": "start", "id": key, "ts": time.time()})
+
+    def complete(self, key: str, location: Optional[str] = None, **meta: Any) -> None:
+        record = {"op": "done", "id": key, "loc": location, "ts": time.time(), **meta}
+        with self._lock:
+            self._done[key] = record
+            self._started.pop(key, None)
+        self._append(record)
+
+    def fail(self, key: str, error: str = "") -> None:
+        with self._lock:
+            self._done.pop(key, None)
+            self._started.pop(key, None)
+        self._append({"op": "fail", "id": key, "error": error[:500], "ts": time.time()})
+
+    def mark(self, sync: bool = False, **meta: Any) -> None:
+        record = {"op": "mark", **meta}
+        with self._lock:
+            self._merge_mark(record)
+        self._append(record, sync=sync)
+
+    # --- stored results (for items whose result lives only in memory) ---
+    def save_result(self, key: str, result: Any) -> str:
+        """Write ``result`` next to the journal and mark ``key`` done with its location."""
+        os.makedirs(self.results_dir, exist_ok=True)
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16] + ".json"
+        location = os.path.join(self.results_dir, name)
+        tmp = location + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f, default=str)
+        os.replace(tmp, location)
+        self.complete(key, location)
+        return location
+
+    def load_result(self, key: str) -> Any:
+        record = self.record(key)
+        if record is None or not record.get("loc"):
+            return None
+        try:
+            with open(record["loc"], "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # --- lifecycle ---
+    def close(self) -> None:
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal and stored results (the run completed)."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        shutil.rmtree(self.results_dir, ignore_errors=True)
+
+    def __enter__(self) -> "CheckpointJournal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+__all__ = ["CheckpointJournal", "item_id"]
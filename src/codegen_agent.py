@@ -13,6 +13,7 @@ import hashlib, time
 from pathlib import Path
 from typing import Dict, Any, Optional, Protocol, runtime_checkable, cast
 
+from src.artifact_writer import get_writer, in_memory
 from src.base_agent import BaseAgent
 
 # Try OpenAI provider; keep silent fallback
@@ -291,14 +292,14 @@ class CodegenAgent(BaseAgent):
             base_dir = Path(output_dir)
         else:
             base_dir = Path.cwd() / "output" / "codegen"
-        base_dir.mkdir(parents=True, exist_ok=True)
+        if not in_memory():
+            base_dir.mkdir(parents=True, exist_ok=True)
         if target_rel:
             out_path = base_dir / target_rel
         else:
             out_path = base_dir / _derive_filename(task_id, prompt, language)
-        out_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            out_path.write_text(code, encoding="utf-8")
+            get_writer().write_text(out_path, code, sync=True)  # read back by tester / exe build right away
             return str(out_path), None
         except Exception as e:  # pragma: no cover
             return str(out_path), str(e)
\ No newline at end of file
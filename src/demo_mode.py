@@ -21,10 +21,11 @@ No environment variable can raise the cap beyond 2; attempts are ignored.
 """
 from __future__ import annotations
 
-import os, json, time, urllib.request, urllib.error
+import os, json, threading, time, urllib.request, urllib.error
 from typing import Dict, Any
 
 _call_count = 0  # process-local counter (lowercase: mutable)
+_count_lock = threading.Lock()  # concurrent HTTP threads must not exceed the cap
 _CAP = 2  # immutable cap
 
 
@@ -87,23 +88,25 @@ def process_demo_request(text: str) -> Dict[str, Any]:
     if not is_demo_active():
         return {"success": False, "error": "NOT_IN_DEMO"}
 
-    if _call_count >= _CAP:
-        return {
-            "success": False,
-            "error": "NEED_API_KEY",
-        "detail": "Demo limit reached (2/2). Please add your OPENAI_API_KEY.",
-        }
+    # Reserve the call slot before relaying so parallel requests cannot overshoot the cap
+    with _count_lock:
+        if _call_count >= _CAP:
+            return {
+                "success": False,
+                "error": "NEED_API_KEY",
+                "detail": "Demo limit reached (2/2). Please add your OPENAI_API_KEY.",
+            }
+        _call_count += 1
+        call_number = _call_count
 
-    call_number = _call_count + 1
     started = time.time()
     output = _relay_request(text)
-    _call_count += 1
 
     return {
         "success": True,
         "demo": True,
         "call_number": call_number,
-        "remaining": remaining_calls(),
+        "remaining": max(0, _CAP - call_number),
         "processing_time": time.time() - started,
         "output": output,
     }
@@ -1,14 +1,28 @@
 # agents/engineer_core.py
 # Clean, minimal EngineerCore implementation for fast artifacts
-
+#
+# Analyses and file plans are memoized per (description, project_type, spec,
+# version): a repeat request returns the earlier result and reuses its
+# artifacts (hard links, or copies across filesystems) instead of regenerating
+# them. Results carry ``cache`` = miss | hit | coalesced.
+#   ORBITSUITE_ENGINEER_CACHE_SIZE  memoized analyses / plans kept (default 64, 0 = off)
+#   ORBITSUITE_ENGINEER_CACHE_TTL   seconds an entry stays valid (default 0 = no expiry)
+
+import copy
+import hashlib
 import json
+import os
 import re
+import shutil
 from dataclasses import dataclass, asdict, is_dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, TypedDict, cast
+from typing import Any, Callable, Dict, List, TypedDict, cast
 
+from .artifact_writer import get_writer, in_memory
 from .base_agent import BaseAgent
+from .lru_cache import MISS, CoalescingCache
+from .run_context import current_context, use_context
 
 # Simple string constants
 NODEJS = "Node.js"
@@ -42,6 +56,20 @@ class FilePlanEntry(TypedDict, total=False):
     language: str
 
 
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, "").strip()))
+    except ValueError:
+        return default
+
+
+def _nl_mode() -> bool:
+    return str(os.getenv('ORBITSUITE_NL_MODE', '0')) in ('1', 'true', 'True')
+
+
+# Result fields holding artifact paths, rewritten when artifacts are linked into a new directory
+_ARTIFACT_FIELDS = ("artifact_dir", "plan_dir", "spec_path", "plan_path", "design_path", "plan_file")
+
 PLAN_JSON = "plan.json"
 SPEC_JSON = "spec.json"
 DESIGN_JSON = "design.json"
@@ -55,6 +83,11 @@ class EngineerCore(BaseAgent):
         self.description = "Open-source system architecture and design planning"
         self.version = "1.0.1"
         self.license_tier = "open_core"
+        # Memoized analyses / file plans; concurrent identical requests compute once
+        self._memo: CoalescingCache[Dict[str, Any]] = CoalescingCache(
+            max_size=int(_env_number("ORBITSUITE_ENGINEER_CACHE_SIZE", 64)),
+            ttl=_env_number("ORBITSUITE_ENGINEER_CACHE_TTL", 0.0),
+        )
         # When running frozen (PyInstaller), Path.cwd() points to the dist directory.
         # We want artifacts to land beside the executable in ./output rather than nested inside dist.
         if output_dir:
@@ -146,42 +179,110 @@ class EngineerCore(BaseAgent):
         if not isinstance(input_data, dict):  # type: ignore[truthy-bool]
             input_data = {"command": "analyze", "description": str(input_data)}  # type: ignore[assignment]
         
-        # Check for dynamic output directory override
-        original_engineering_root = self.engineering_root
+        # Per-call output directory override: carried in the run context (not on self)
+        # so concurrent requests sharing this agent keep their own task directories.
         output_dir = input_data.get("output_dir")
-        if output_dir:
-            self.engineering_root = Path(output_dir) / 'engineering'
-        
-        try:
-            command = input_data.get("command", "analyze")
-            if command == "analyze":
-                return self._analyze_system_core(input_data)
-            if command == "plan_files":
-                return self._plan_files_core(input_data)
-            if command == "requirements":
-                return self._analyze_requirements_core(input_data)
-            if command == "recommend_stack":
-                return self._recommend_core_technology_stack(input_data)
-            if command == "get_patterns":
-                return self._get_core_design_patterns(input_data)
-            if command == "plan_steps":
-                return self._generate_core_planning_steps(input_data)
-            if command == "status":
-                return self._get_core_status()
-            return {
-                "success": False,
-                "error": f"Unknown core engineering command: {command}",
-            }
-        finally:
-            # Always restore original engineering root
-            self.engineering_root = original_engineering_root
+        root = str(Path(output_dir) / 'engineering') if output_dir else None
+        with use_context(engineering_root=root):
+            return self._run_command(input_data)
+
+    def _run_command(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        command = input_data.get("command", "analyze")
+        if command == "analyze":
+            return self._analyze_system_core(input_data)
+        if command == "plan_files":
+            return self._plan_files_core(input_data)
+        if command == "requirements":
+            return self._analyze_requirements_core(input_data)
+        if command == "recommend_stack":
+            return self._recommend_core_technology_stack(input_data)
+        if command == "get_patterns":
+            return self._get_core_design_patterns(input_data)
+        if command == "plan_steps":
+            return self._generate_core_planning_steps(input_data)
+        if command == "status":
+            return self._get_core_status()
+        return {
+            "success": False,
+            "error": f"Unknown core engineering command: {command}",
+        }
+
+    # --- Memoization ---
+    def _memo_key(self, kind: str, parts: Dict[str, Any]) -> str:
+        blob = json.dumps({"kind": kind, "version": self.version, "nl_mode": _nl_mode(), **parts},
+                          sort_keys=True, default=str)
+        return f"{kind}:{hashlib.sha256(blob.encode('utf-8')).hexdigest()}"
+
+    def _memoized(self, kind: str, parts: Dict[str, Any], base_name: str,
+                  compute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run ``compute`` once per key; hits get the earlier result with its artifacts reused."""
+        key = self._memo_key(kind, parts)
+        shared, outcome = self._memo.get_or_compute(key, compute, cacheable=lambda r: bool(r.get("success")))
+        result = copy.deepcopy(shared)  # callers extend results (e.g. file_plan); keep the cached copy intact
+        if outcome != MISS and not self._reuse_artifacts(result, base_name):
+            self._memo.pop(key)  # artifacts deleted since: regenerate them
+            shared, outcome = self._memo.get_or_compute(key, compute, cacheable=lambda r: bool(r.get("success")))
+            result = copy.deepcopy(shared)
+        result["cache"] = outcome
+        return result
+
+    def _reuse_artifacts(self, result: Dict[str, Any], base_name: str) -> bool:
+        """Point ``result`` at artifacts usable from the current engineering root; False if they are gone."""
+        src_value = result.get("artifact_dir") or result.get("plan_dir")
+        if not src_value:
+            return True
+        src = Path(src_value)
+        files = [Path(f) for f in result.get("files_written", [])] or ([Path(result["plan_file"])]
+                                                                       if result.get("plan_file") else [])
+        writer = get_writer()
+        if not all(writer.exists(f) for f in files) or (not files and not src.is_dir()):
+            return False
+        memory = in_memory()
+        if not memory and src.parent.resolve() == self._engineering_root().resolve():
+            result["artifacts"] = "reused"
+            return True
+        dst = self._ensure_engineering_dir(base_name)
+        if memory:  # in-memory runs get their own copy in the response
+            for f in files:
+                writer.write_text(dst / f.name, writer.read_text(f))
+        else:
+            writer.wait_for(files)  # these artifacts must be on disk before they can be linked
+            for f in files:
+                target = dst / f.name
+                try:
+                    os.link(f, target)
+                except OSError:  # other filesystem / no hard links
+                    shutil.copy2(f, target)
+        old, new = str(src), str(dst)
+        for field in _ARTIFACT_FIELDS:
+            if isinstance(result.get(field), str):
+                result[field] = result[field].replace(old, new, 1)
+        if "files_written" in result:
+            result["files_written"] = [str(dst / Path(f).name) for f in result["files_written"]]
+        result["artifacts"] = "copied" if memory else "linked"
+        return True
 
     def _analyze_system_core(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Core system analysis, memoized on (description, project_type, spec, version)."""
+        raw_spec = input_data.get("spec", {})
+        project_type = input_data.get("project_type", "general")
+        description = input_data.get("description") or input_data.get("prompt") or input_data.get("goal") or ""
+        parts = {
+            "description": " ".join(str(description).split()),
+            "project_type": project_type,
+            "project_name": input_data.get("project_name"),
+            "spec": raw_spec if isinstance(raw_spec, dict) else {},
+        }
+        return self._memoized("analysis", parts, input_data.get("project_name") or project_type,
+                              lambda: self._compute_analysis(input_data))
+
+    def _compute_analysis(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Core system analysis with optional NL mode LLM augmentation."""
         raw_spec = input_data.get("spec", {})
-        spec: Dict[str, Any] = cast(Dict[str, Any], raw_spec) if isinstance(raw_spec, dict) else {}
+        # Copied: NL mode fills in the spec, which must not leak into the caller's dict or the memo key
+        spec: Dict[str, Any] = copy.deepcopy(cast(Dict[str, Any], raw_spec)) if isinstance(raw_spec, dict) else {}
         project_type = input_data.get("project_type", "general")
-        nl_mode = bool(str(__import__('os').getenv('ORBITSUITE_NL_MODE', '0')) in ('1','true','True'))
+        nl_mode = _nl_mode()
         # Optional: augment spec using LLM when enabled
         if nl_mode and not spec.get('requirements'):
             try:
@@ -475,11 +576,21 @@ class EngineerCore(BaseAgent):
         return components
 
     def _plan_files_core(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """File plan, memoized on the inputs that shape it (description, type, analysis keys)."""
+        analysis = input_data.get('analysis', {})
+        parts = {
+            "description": " ".join(str(input_data.get('description', '')).split()),
+            "project_type": input_data.get('project_type', 'general'),
+            "analysis_keys": list(analysis)[:6] if isinstance(analysis, dict) else [],
+        }
+        return self._memoized("file_plan", parts, 'plan', lambda: self._compute_file_plan(input_data))
+
+    def _compute_file_plan(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate a simple file plan (optionally via LLM) for downstream multi-file codegen."""
         description = input_data.get('description', '')
         analysis = input_data.get('analysis', {})
         project_type = input_data.get('project_type', 'general')
-        nl_mode = bool(str(__import__('os').getenv('ORBITSUITE_NL_MODE', '0')) in ('1','true','True'))
+        nl_mode = _nl_mode()
         base_plan: List[FilePlanEntry] = []
         # Heuristic baseline
         desc_l = description.lower()
@@ -542,10 +653,10 @@ class EngineerCore(BaseAgent):
         import json as _json
         plan_path = out_dir / 'file_plan.json'
         try:
-            plan_path.write_text(_json.dumps(base_plan, indent=2), encoding='utf-8')
+            get_writer().write_json(plan_path, base_plan)
         except Exception:
             pass
-        return {'success': True, 'plan': base_plan, 'plan_dir': str(out_dir)}
+        return {'success': True, 'plan': base_plan, 'plan_dir': str(out_dir), 'plan_file': str(plan_path)}
 
     def _analyze_requirements_core(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         requirements_text = input_data.get("requirements", "")
@@ -685,28 +796,43 @@ class EngineerCore(BaseAgent):
             "available_patterns": list(self.core_design_patterns.keys()),
             "supported_project_types": list(self.core_technology_stacks.keys()),
             "last_analysis": datetime.now(timezone.utc).isoformat(),
+            "analysis_cache": self._memo.stats(),
         }
 
+    def _engineering_root(self) -> Path:
+        override = current_context().engineering_root
+        return Path(override) if override else self.engineering_root
+
     def _ensure_engineering_dir(self, base_name: str) -> Path:
         slug = re.sub(r"[^a-z0-9]+", "-", (base_name or "core").lower()).strip("-") or "core"
         ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        out = self.engineering_root / f"{slug}_{ts}"
-        out.mkdir(parents=True, exist_ok=True)
-        return out
+        root = self._engineering_root()
+        store = current_context().artifact_store
+        if store is not None:  # in-memory run: a unique path, nothing on disk
+            return store.reserve_dir(root / f"{slug}_{ts}")
+        root.mkdir(parents=True, exist_ok=True)
+        # Concurrent analyses within the same second get distinct directories
+        out = root / f"{slug}_{ts}"
+        n = 1
+        while True:
+            try:
+                out.mkdir()
+                return out
+            except FileExistsError:
+                n += 1
+                out = root / f"{slug}_{ts}_{n}"
 
     def _write_artifacts(self, out_dir: Path, files: Dict[str, Any]) -> List[str]:
         written: List[str] = []
+        writer = get_writer()
         for name, content in files.items():
             p = out_dir / name
             try:
                 serializable = self._to_jsonable(content)
                 if isinstance(serializable, (dict, list)):
-                    p.write_text(
-                        json.dumps(serializable, indent=2, ensure_ascii=False),
-                        encoding="utf-8",
-                    )
+                    writer.write_json(p, serializable)
                 else:
-                    p.write_text(str(serializable), encoding="utf-8")
+                    writer.write_text(p, str(serializable))
                 written.append(str(p))
             except Exception as e:  # pragma: no cover - best effort
                 print(f"[EngineerCore] artifact write failed for {p}: {e}")
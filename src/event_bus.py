@@ -0,0 +1,234 @@
+"""Bounded in-memory publish/subscribe bus for progress events (stdlib only).
+
+Pipelines publish progress without ever blocking: ``publish`` only appends to
+per-subscriber bounded queues. Each subscriber (an SSE connection, a test, a
+job poller) drains its own queue at its own pace; when a queue is full the
+subscriber's policy decides what to give up:
+
+  drop_newest  discard the incoming event
+  drop_oldest  evict the oldest queued event
+  coalesce     replace a queued event with the same key (e.g. the same step),
+               else evict the oldest one
+
+Events published with ``critical=True`` (final results, errors, terminal job
+status) are never dropped; they evict a non-critical event instead. Every event
+carries a per-topic ``seq`` so consumers can tell when something was skipped.
+
+Topics keep a short history, replayed to late subscribers, and ``close_topic``
+marks the end of the stream. Closed topics' histories are retained (bounded)
+so a client that subscribes after a job finished still gets its events.
+
+Environment variables:
+  ORBITSUITE_EVENT_QUEUE    per-subscriber queue size (default 256)
+  ORBITSUITE_EVENT_HISTORY  events replayed to late subscribers (default 100)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional, Set
+
+try:
+    from .lru_cache import LRUCache
+    from .metrics import counter
+except ImportError:  # pragma: no cover - script execution
+    from lru_cache import LRUCache  # type: ignore
+    from metrics import counter  # type: ignore
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+COALESCE = "coalesce"
+POLICIES = (DROP_NEWEST, DROP_OLDEST, COALESCE)
+
+Event = Dict[str, Any]
+
+_PUBLISHED = counter("orbitsuite_event_bus_published_total", "Events published on the progress bus")
+_DROPPED = counter("orbitsuite_event_bus_dropped_total", "Events dropped or coalesced for slow subscribers", ["policy"])
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else default
+
+
+class Subscription:
+    """One consumer's bounded view of a topic."""
+
+    def __init__(self, bus: "EventBus", topic: str, maxsize: int, policy: str) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown policy {policy!r} (expected one of {POLICIES})")
+        self.bus = bus
+        self.topic = topic
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.dropped = 0
+        self._queue: Deque[Event] = deque()
+        self._cond = threading.Condition()
+        self._ended = False  # topic closed: drain what is queued, then stop
+        self._closed = False  # unsubscribed by the consumer
+
+    # --- producer side (called by the bus, never blocks) ---
+    def _evict_one(self, key: Optional[Hashable]) -> bool:
+        if self.policy == COALESCE and key is not None:
+            for i, queued in enumerate(self._queue):
+                if queued.get("key") == key and not queued.get("critical"):
+                    del self._queue[i]
+                    return True
+        for i, queued in enumerate(self._queue):
+            if not queued.get("critical"):
+                del self._queue[i]
+                return True
+        return False
+
+    def _offer(self, event: Event) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._queue) >= self.maxsize:
+                if self.policy == DROP_NEWEST and not event.get("critical"):
+                    self.dropped += 1
+                    _DROPPED.inc(policy=self.policy)
+                    return
+                if self._evict_one(event.get("key")):
+                    self.dropped += 1
+                    _DROPPED.inc(policy=self.policy)
+                # only critical events left: exceed the bound rather than lose one
+            self._queue.append(event)
+            self._cond.notify()
+
+    def _end(self) -> None:
+        with self._cond:
+            self._ended = True
+            self._cond.notify_all()
+
+    # --- consumer side ---
+    @property
+    def closed(self) -> bool:
+        """True once nothing more will arrive and the queue is drained."""
+        with self._cond:
+            return self._closed or (self._ended and not self._queue)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None on timeout / end of stream."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._queue:
+                if self._ended or self._closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._queue.popleft()
+
+    def events(self, idle_timeout: Optional[float] = None) -> Iterator[Optional[Event]]:
+        """Yield events until the topic ends; yields None after each idle period (heartbeats)."""
+        while not self.closed:
+            event = self.get(idle_timeout)
+            if event is not None or not self.closed:
+                yield event
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify_all()
+        self.bus._unsubscribe(self)
+
+
+class _Topic:
+    def __init__(self, history: int) -> None:
+        self.seq = 0
+        self.history: Deque[Event] = deque(maxlen=history)
+        self.subscribers: Set[Subscription] = set()
+
+
+class EventBus:
+    """Topic-based fan-out with bounded history and per-subscriber backpressure policies."""
+
+    def __init__(self, history: Optional[int] = None, queue_size: Optional[int] = None,
+                 retained_topics: int = 256) -> None:
+        self.history = history or _env_int("ORBITSUITE_EVENT_HISTORY", 100)
+        self.queue_size = queue_size or _env_int("ORBITSUITE_EVENT_QUEUE", 256)
+        self._topics: Dict[str, _Topic] = {}
+        self._ended: LRUCache[List[Event]] = LRUCache(max_size=retained_topics)
+        self._lock = threading.Lock()
+
+    def publish(self, topic: str, type: str, data: Any = None, critical: bool = False,
+                key: Optional[Hashable] = None) -> Event:
+        """Fan ``data`` out to the topic's subscribers without blocking; returns the event."""
+        with self._lock:
+            state = self._topics.get(topic)
+            if state is None:
+                state = self._topics[topic] = _Topic(self.history)
+            state.seq += 1
+            event: Event = {"type": type, "data": data, "seq": state.seq, "ts": time.time()}
+            if critical:
+                event["critical"] = True
+            if key is not None:
+                event["key"] = key
+            state.history.append(event)
+            subscribers = list(state.subscribers)
+        _PUBLISHED.inc()
+        for sub in subscribers:
+            sub._offer(event)
+        return event
+
+    def subscribe(self, topic: str, policy: str = COALESCE, maxsize: Optional[int] = None,
+                  replay: bool = True, create: bool = True) -> Optional[Subscription]:
+        """Attach a consumer; ``replay`` first delivers the topic's recent history.
+
+        With ``create=False`` an unknown topic (never published, or ended and no
+        longer retained) returns None instead of opening a new stream.
+        """
+        sub = Subscription(self, topic, maxsize or self.queue_size, policy)
+        with self._lock:
+            state = self._topics.get(topic)
+            if state is None:
+                ended = self._ended.get(topic)
+                if ended is not None:
+                    for event in ended if replay else []:
+                        sub._offer(event)
+                    sub._end()
+                    return sub
+                if not create:
+                    return None
+                state = self._topics[topic] = _Topic(self.history)
+            if replay:
+                for event in state.history:
+                    sub._offer(event)
+            state.subscribers.add(sub)
+        return sub
+
+    def close_topic(self, topic: str) -> None:
+        """End the stream: subscribers drain their queues and stop; history is retained."""
+        with self._lock:
+            state = self._topics.pop(topic, None)
+            if state is None:
+                return
+            self._ended.put(topic, list(state.history))
+            subscribers = list(state.subscribers)
+        for sub in subscribers:
+            sub._end()
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            state = self._topics.get(sub.topic)
+            if state is not None:
+                state.subscribers.discard(sub)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "open_topics": len(self._topics),
+                "subscribers": sum(len(t.subscribers) for t in self._topics.values()),
+                "retained_topics": len(self._ended),
+            }
+
+
+BUS = EventBus()
+
+
+__all__ = ["BUS", "COALESCE", "DROP_NEWEST", "DROP_OLDEST", "Event", "EventBus", "POLICIES", "Subscription"]
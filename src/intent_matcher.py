@@ -0,0 +1,173 @@
+"""Single-pass keyword and intent matching for TaskLinguistCore (stdlib only).
+
+``KeywordAutomaton`` is an Aho-Corasick automaton: one left-to-right walk over
+the text reports every occurrence of every keyword, overlapping ones included,
+in time linear in the text plus the number of hits.
+
+``IntentMatcher`` compiles the linguist's intent patterns onto such an
+automaton. A pattern is a sequence of literal alternatives joined by gaps::
+
+    r"(write|create).*?(code|function)"   ->  [["write", "create"], ["code", "function"]]
+    r".*(security|audit).*"               ->  [["security", "audit"]]
+
+Every pattern is evaluated against the recorded hits, with the same result as
+``re.search(pattern, text.lower())``. That is: the segments occur in order and
+do not overlap, and a gap (``.`` without DOTALL) does not cross a newline.
+Greedy earliest-end selection is exact here, and it stays linear where the
+regex engine backtracks quadratically on long single-line prompts (a leading
+``.*``). Patterns outside this shape fall back to a precompiled regex.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+Hit = Tuple[int, int, str]  # (start, end, keyword) in the lowercased text
+_Check = Callable[[str, List[Hit], List[int], Set[str]], bool]
+
+_GAP = re.compile(r"\.\*\??")
+_LITERAL = re.compile(r"[\w \-]+")
+_GROUP = re.compile(r"\(([\w \-|]+)\)")
+_NEWLINE = re.compile("\n")
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed keyword set."""
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._out: List[Tuple[str, ...]] = [()]
+        self._fail: List[int] = [0]
+        words = sorted({k for k in keywords if k})
+        for word in words:
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                    self._fail.append(0)
+                state = nxt
+            self._out[state] = (word,)
+        # Breadth-first: fail links point at the longest proper suffix that is also a prefix
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+        # Fold the fail links into a full transition table (a DFA): one dict lookup per character
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])] + [{} for _ in self._goto[1:]]
+        for state in queue:
+            self._delta[state] = {**self._delta[self._fail[state]], **self._goto[state]}
+        self.keywords: Tuple[str, ...] = tuple(words)
+
+    def iter_hits(self, text: str) -> List[Hit]:
+        """Every keyword occurrence as (start, end, keyword), ordered by end."""
+        delta, out = self._delta, self._out
+        hits: List[Hit] = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                end = i + 1
+                for word in out[state]:
+                    hits.append((end - len(word), end, word))
+        return hits
+
+    def find(self, text: str) -> Set[str]:
+        """The keywords that occur in ``text``."""
+        return {word for _, _, word in self.iter_hits(text)}
+
+
+def compile_pattern(pattern: str) -> Optional[List[Tuple[str, ...]]]:
+    """Split ``pattern`` into gap-separated literal alternatives, or None if it has another shape."""
+    segments: List[Tuple[str, ...]] = []
+    for part in _GAP.split(pattern):
+        if not part:
+            continue
+        group = _GROUP.fullmatch(part)
+        if group:
+            alternatives = tuple(group.group(1).split("|"))
+        elif _LITERAL.fullmatch(part):
+            alternatives = (part,)
+        else:
+            return None
+        if not all(alternatives):
+            return None
+        segments.append(alternatives)
+    return segments or None
+
+
+def _sequence_found(segments: List[Tuple[str, ...]], hits: List[Hit], newlines: List[int],
+                    found: Set[str]) -> bool:
+    """True if the segments occur in order, without overlap, within one line."""
+    if any(found.isdisjoint(alternatives) for alternatives in segments):
+        return False  # some segment never occurs at all
+    if len(segments) == 1:
+        return True
+    stage, after, line = 0, 0, -1
+    for start, end, word in hits:
+        hit_line = bisect_right(newlines, start)
+        if stage and hit_line != line:
+            stage = 0  # a gap cannot cross a newline: start over on this line
+        if word in segments[stage] and (stage == 0 or start >= after):
+            stage, after, line = stage + 1, end, hit_line
+            if stage == len(segments):
+                return True
+    return False
+
+
+@dataclass
+class Scan:
+    """Result of one pass over a text: matched patterns per intent and keywords seen."""
+
+    intents: Dict[str, int] = field(default_factory=dict)
+    keywords: Set[str] = field(default_factory=set)
+
+
+class IntentMatcher:
+    """Intent patterns and keyword lists compiled once onto a single automaton."""
+
+    def __init__(self, intent_patterns: Dict[str, List[str]], keywords: Iterable[str] = ()) -> None:
+        self._intents: List[Tuple[str, List[_Check]]] = []
+        words: Set[str] = set(keywords)
+        for intent, patterns in intent_patterns.items():
+            checks: List[_Check] = []
+            for pattern in patterns:
+                segments = compile_pattern(pattern)
+                if segments is None:
+                    compiled = re.compile(pattern)
+                    checks.append(lambda text, hits, newlines, found, rx=compiled: rx.search(text) is not None)
+                else:
+                    words.update(w for alternatives in segments for w in alternatives)
+                    checks.append(lambda text, hits, newlines, found, s=segments:
+                                  _sequence_found(s, hits, newlines, found))
+            self._intents.append((intent, checks))
+        self.automaton = KeywordAutomaton(words)
+
+    def scan(self, text: str) -> Scan:
+        """Count matching patterns per intent and collect keywords, in one pass over ``text.lower()``."""
+        lowered = text.lower()
+        hits = self.automaton.iter_hits(lowered)
+        newlines = [m.start() for m in _NEWLINE.finditer(lowered)] if "\n" in lowered else []
+        result = Scan(keywords={word for _, _, word in hits})
+        for intent, checks in self._intents:
+            score = sum(1 for check in checks if check(lowered, hits, newlines, result.keywords))
+            if score:
+                result.intents[intent] = score
+        return result
+
+    def keywords(self, text: str) -> Set[str]:
+        return self.automaton.find(text.lower())
+
+
+__all__ = ["IntentMatcher", "KeywordAutomaton", "Scan", "compile_pattern"]
@@ -0,0 +1,151 @@
+"""Persistent intent cache shared across processes and restarts (stdlib only).
+
+``IntentStore`` keeps analysed intents in a SQLite database in WAL mode, so
+any number of processes (io_runner workers, API servers, one-shot CLI runs)
+can read it concurrently while one writes. Rows are keyed by a BLAKE2b digest
+of the text and tagged with a ``version``. TaskLinguistCore passes
+CORE_VERSION plus a fingerprint of its patterns and keyword lists, so changing
+either invalidates older rows: they are never returned and are purged when a
+store opens with a new version.
+
+Each thread gets its own connection, and so does each process: a connection
+inherited through ``fork`` (e.g. by pool workers) is never reused. Writes are short transactions and wait
+up to ``timeout`` seconds for a concurrent writer.
+
+Environment variables:
+  ORBITSUITE_INTENT_STORE  path of the SQLite file (unset = no persistent cache)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS intents (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+"""
+
+
+def text_key(text: str) -> str:
+    """Stable key for ``text`` across processes (unlike the randomized built-in ``hash``)."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def default_store_path() -> Optional[str]:
+    return os.getenv("ORBITSUITE_INTENT_STORE", "").strip() or None
+
+
+class IntentStore:
+    """Versioned text-hash -> intent mapping in a shared SQLite (WAL) file."""
+
+    def __init__(self, path: str, version: str, timeout: float = 5.0) -> None:
+        self.path = os.path.abspath(path)
+        self.version = version
+        self.timeout = timeout
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != version:
+                conn.execute("DELETE FROM intents WHERE version != ?", (version,))
+                conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('version', ?)", (version,))
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid != os.getpid():
+            conn = None  # opened by the parent before a fork; SQLite connections must not cross it
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # a crash may lose the last writes, never corrupts
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _count(self, hits: int = 0, misses: int = 0, writes: int = 0) -> None:
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+            self.writes += writes
+
+    def get(self, text: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT intent FROM intents WHERE key = ? AND version = ?", (text_key(text), self.version)).fetchone()
+        self._count(hits=row is not None, misses=row is None)
+        return json.loads(row[0]) if row is not None else None
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored intents for whichever of ``texts`` are present."""
+        by_key = {text_key(t): t for t in texts}
+        found: Dict[str, Dict[str, Any]] = {}
+        keys = list(by_key)
+        conn = self._conn()
+        for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            chunk = keys[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for key, intent in conn.execute(
+                    f"SELECT key, intent FROM intents WHERE version = ? AND key IN ({marks})", (self.version, *chunk)):
+                found[by_key[key]] = json.loads(intent)
+        self._count(hits=len(found), misses=len(by_key) - len(found))
+        return found
+
+    def put(self, text: str, intent: Dict[str, Any]) -> None:
+        self.put_many([(text, intent)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        now = time.time()
+        rows: List[Tuple[str, str, str, float]] = [
+            (text_key(text), self.version, json.dumps(intent, separators=(",", ":"), default=str), now)
+            for text, intent in items
+        ]
+        if not rows:
+            return
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("INSERT OR REPLACE INTO intents (key, version, intent, stored_at) VALUES (?, ?, ?, ?)",
+                             rows)
+        self._count(writes=len(rows))
+
+    def clear(self) -> int:
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            return conn.execute("DELETE FROM intents").rowcount
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM intents WHERE version = ?", (self.version,)).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {"path": self.path, "version": self.version, "entries": len(self),
+                    "hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            conn.close()
+            self._local.conn = None
+
+
+__all__ = ["IntentStore", "default_store_path", "text_key"]
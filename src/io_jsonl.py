@@ -0,0 +1,202 @@
+"""Constant-memory JSONL streaming for io_runner (stdlib only).
+
+A ``*.jsonl`` input holds one task per line: a JSON string (plain prompt) or
+object (structured task). ``stream_jsonl`` reads it lazily and keeps at most
+``window`` lines in flight. Results are written to ``<name>.results.jsonl``
+(``.jsonl.gz`` with ``compress=True``) in completion order. The output is
+flushed as results arrive, so it can be tailed while the run is in progress.
+
+Each output line carries the 1-based ``line`` number of its input:
+
+  {"line": 7, "success": true, "elapsed": 0.41, "result": {...}}
+  {"line": 8, "success": false, "elapsed": 0.0, "error": "invalid JSON: ..."}
+
+Blank input lines are skipped without an output line. Gzip output is flushed
+at most every ``GZIP_FLUSH_SECONDS`` because each flush costs compression.
+
+With a ``checkpoint`` path, every flush is followed by a journal mark (see
+checkpoint.py) holding only the output's byte offset, so journaling stays
+cheap and memory flat however long the input is. ``resume=True`` cuts the
+output back to the last mark (gzip output is re-compressed up to that point,
+which is decodable because every flush is a sync flush), re-reads the ``line``
+numbers of what it kept and only runs the lines not yet written.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+import zlib
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import IO, Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+try:
+    from .checkpoint import CheckpointJournal
+except ImportError:  # pragma: no cover - script execution
+    from checkpoint import CheckpointJournal  # type: ignore
+
+RESULTS_SUFFIX = ".results.jsonl"
+GZIP_FLUSH_SECONDS = 0.5  # each gzip flush costs compression ratio; batch them
+
+LineRecord = Dict[str, Any]
+
+
+def results_path(out_dir: str, input_path: str, compress: bool = False) -> str:
+    name = os.path.basename(input_path)
+    if name.endswith(".jsonl"):
+        name = name[: -len(".jsonl")]
+    return os.path.join(out_dir, name + RESULTS_SUFFIX + (".gz" if compress else ""))
+
+
+def iter_lines(path: str) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, text) for non-blank lines without loading the file."""
+    with open(path, "r", encoding="utf-8") as f:
+        for number, text in enumerate(f, 1):
+            if text.strip():
+                yield number, text
+
+
+def process_line(sv: Any, number: int, text: str) -> LineRecord:
+    """Run one JSONL task through ``sv.process_request``; never raises."""
+    started = time.time()
+    record: LineRecord = {"line": number}
+    try:
+        try:
+            request = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"invalid JSON: {e}") from None
+        if isinstance(request, str):
+            request = request.strip()
+        if not request or not isinstance(request, (str, dict)):
+            raise ValueError("line must be a non-empty JSON string or object")
+        result = sv.process_request(request)
+        record.update(success=bool(result.get("success")), result=result)
+    except Exception as e:
+        record.update(success=False, error=str(e))
+    record["elapsed"] = round(time.time() - started, 3)
+    return record
+
+
+def _open_output(raw: IO[bytes], compress: bool) -> IO[bytes]:
+    if compress:
+        return gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=5)  # type: ignore[return-value]
+    return raw
+
+
+def _reopen_output(path: str, offset: int, compress: bool) -> IO[bytes]:
+    """Raw output handle positioned after the first ``offset`` bytes of a previous run."""
+    if not compress:
+        raw = open(path, "r+b")
+        raw.truncate(offset)
+        raw.seek(offset)
+        return raw
+    # A gzip stream cannot be appended to mid-member: decode the synced prefix into a new one
+    partial = path + ".partial"
+    os.replace(path, partial)
+    raw = open(path, "wb")
+    out = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=5)
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with open(partial, "rb") as src:
+        left = offset
+        while left > 0:
+            block = src.read(min(left, 1 << 16))
+            if not block:
+                break
+            left -= len(block)
+            while block:
+                out.write(decoder.decompress(block))
+                block = decoder.unused_data if decoder.eof else b""
+                if decoder.eof:  # a member written by an earlier resume: the next one follows
+                    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    out.close()  # finishes this member; the run appends a second one, which gzip readers concatenate
+    os.remove(partial)
+    raw.seek(0, os.SEEK_END)
+    return raw
+
+
+def _scan_output(path: str, compress: bool) -> Tuple[Set[int], int]:
+    """Line numbers already written to ``path`` and how many of them failed."""
+    done: Set[int] = set()
+    failed = 0
+    with (gzip.open(path, "rb") if compress else open(path, "rb")) as f:
+        for text in f:
+            try:
+                record = json.loads(text)
+            except ValueError:
+                continue
+            done.add(record["line"])
+            failed += not record.get("success")
+    return done, failed
+
+
+def stream_jsonl(
+    input_path: str,
+    output_path: str,
+    submit: Callable[[int, str], "Future[LineRecord]"],
+    window: int,
+    compress: bool = False,
+    checkpoint: Optional[str] = None,
+    resume: bool = False,
+) -> Dict[str, int]:
+    """Process every line of ``input_path`` via ``submit`` and stream results to ``output_path``.
+
+    At most ``window`` lines are in flight, so memory stays flat however long
+    the input is. Returns ``{"lines": n, "failed": m}`` (including lines kept
+    from a resumed run). The ``checkpoint`` journal is removed on success.
+    """
+    journal = CheckpointJournal(checkpoint, resume=resume) if checkpoint else None
+    state = journal.mark_state if journal is not None else {}
+    offset = int(state.get("offset", 0))
+    if offset and (not os.path.exists(output_path) or os.path.getsize(output_path) < offset):
+        offset = 0  # output lost or shorter than journaled: start over
+    raw = _reopen_output(output_path, offset, compress) if offset else open(output_path, "wb")
+    done_lines: Set[int] = set()
+    failed = 0
+    if offset:
+        raw.flush()
+        done_lines, failed = _scan_output(output_path, compress)
+    lines = len(done_lines)
+    pending: Set["Future[LineRecord]"] = set()
+    source = (item for item in iter_lines(input_path) if item[0] not in done_lines)
+    flushed = time.monotonic()
+    if journal is not None and offset:
+        journal.mark(sync=True, offset=raw.tell())  # re-compression moves the offset
+    unmarked = False
+    try:
+        with raw, _open_output(raw, compress) as out:
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max(1, window):
+                    try:
+                        number, text = next(source)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending.add(submit(number, text))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    record = fut.result()
+                    lines += 1
+                    failed += not record.get("success")
+                    unmarked = True
+                    out.write(json.dumps(record, separators=(",", ":"), default=str).encode() + b"\n")
+                if not compress or time.monotonic() - flushed >= GZIP_FLUSH_SECONDS:
+                    out.flush()
+                    flushed = time.monotonic()
+                    if journal is not None and unmarked:
+                        raw.flush()
+                        journal.mark(offset=raw.tell())
+                        unmarked = False
+    except BaseException:
+        if journal is not None:
+            journal.close()
+        raise
+    if journal is not None:
+        journal.discard()
+    return {"lines": lines, "failed": failed}
+
+
+__all__ = ["RESULTS_SUFFIX", "iter_lines", "process_line", "results_path", "stream_jsonl"]
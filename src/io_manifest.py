@@ -0,0 +1,135 @@
+"""Content-hash manifest for incremental io_runner runs (stdlib only).
+
+``io/output/manifest.json`` maps each input (``plain/a.txt``, ``json/b.json``)
+to the SHA-256 of its content, its size / mtime and the output it produced.
+An input is *current* when its entry says it succeeded (or was an empty prompt),
+the output file still exists and the content is unchanged. Size and mtime are
+checked first, so an untouched file costs one ``stat`` and a dict lookup. The
+file is only hashed when they differ, so a ``touch`` does not force a re-run.
+
+Failed inputs are never current; they are retried on the next run. The same
+goes for JSONL files with failed lines (status ``partial``). Entries
+whose input was deleted are pruned together with their outputs.
+
+Sharded runs (see io_shard) write one manifest per owner,
+``manifest.<owner>.json``. Every runner also reads the others' manifests
+(``peers``), so an input finished by any shard counts as current, but it only
+writes and prunes its own entries.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from glob import glob
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_CURRENT_STATES = ("result", "skipped")
+
+
+def manifest_name(owner: Optional[str] = None) -> str:
+    return f"manifest.{owner}.json" if owner else MANIFEST_NAME
+
+
+def manifest_paths(directory: str) -> List[str]:
+    """Every manifest in ``directory`` (the default one and per-owner ones)."""
+    return sorted(glob(os.path.join(directory, "manifest.json")) + glob(os.path.join(directory, "manifest.*.json")))
+
+
+def load_manifest_entries(path: str) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}  # missing or unreadable manifest: everything counts as new
+    if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+        return dict(data.get("files") or {})
+    return {}
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class IOManifest:
+    """Input fingerprints and their outputs, persisted as JSON next to the outputs."""
+
+    def __init__(self, path: str, peers: Iterable[str] = ()) -> None:
+        self.path = os.path.abspath(path)
+        self.base = os.path.dirname(self.path)
+        self.entries: Dict[str, Dict[str, Any]] = load_manifest_entries(self.path)
+        self.peer_entries: Dict[str, Dict[str, Any]] = {}  # read-only, newest entry per key
+        for peer in peers:
+            if os.path.abspath(peer) == self.path:
+                continue
+            for key, entry in load_manifest_entries(peer).items():
+                known = self.peer_entries.get(key)
+                if known is None or entry.get("processed_at", 0) > known.get("processed_at", 0):
+                    self.peer_entries[key] = entry
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        own, peer = self.entries.get(key), self.peer_entries.get(key)
+        if own is None or (peer is not None and peer.get("processed_at", 0) > own.get("processed_at", 0)):
+            return peer
+        return own
+
+    def _output_exists(self, entry: Dict[str, Any]) -> bool:
+        output = entry.get("output")
+        return output is None or os.path.exists(os.path.join(self.base, output))
+
+    def fingerprint(self, path: str) -> Dict[str, Any]:
+        st = os.stat(path)  # before hashing: a write during the run shows up as a newer mtime
+        return {"sha256": file_digest(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def check(self, key: str, path: str) -> Tuple[bool, Dict[str, Any]]:
+        """Return (current, fingerprint); hand the fingerprint to ``update`` once processed."""
+        entry = self._entry(key)
+        usable = entry is not None and entry.get("status") in _CURRENT_STATES and self._output_exists(entry)
+        if entry is not None and usable:
+            st = os.stat(path)
+            if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                return True, {k: entry.get(k) for k in ("sha256", "size", "mtime_ns")}
+        fp = self.fingerprint(path)
+        if entry is not None and usable and fp["sha256"] == entry.get("sha256"):
+            entry.update(size=fp["size"], mtime_ns=fp["mtime_ns"])  # touched, not changed
+            return True, fp
+        return False, fp
+
+    def update(self, key: str, fingerprint: Dict[str, Any], status: str, output: Optional[str]) -> None:
+        self.entries[key] = {
+            **fingerprint,
+            "status": status,
+            "output": os.path.relpath(output, self.base) if output else None,
+            "processed_at": time.time(),
+        }
+
+    def prune(self, present: Iterable[str]) -> List[str]:
+        """Drop entries (and their outputs) for inputs that no longer exist."""
+        keep = set(present)
+        removed: List[str] = []
+        for key in [k for k in self.entries if k not in keep]:
+            output = self.entries.pop(key).get("output")
+            if output:
+                try:
+                    os.remove(os.path.join(self.base, output))
+                except OSError:
+                    pass
+            removed.append(key)
+        return removed
+
+    def save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+__all__ = ["IOManifest", "MANIFEST_NAME", "file_digest", "load_manifest_entries", "manifest_name", "manifest_paths"]
@@ -3,25 +3,92 @@
 io_runner.py
 
 Processes input prompts from io/input/plain (*.txt) and io/input/json (*.json)
-and writes results to io/output/final as JSON files. Uses Supervisor to handle
-plain text and structured tasks.
+and writes results to io/output/final/<kind>/ as JSON files, mirroring the input
+folders so ``plain/a.txt`` and ``json/a.json`` never share an output. Uses
+Supervisor to handle plain text and structured tasks.
+
+Large prompt sets go in io/input/jsonl (*.jsonl, one task per line). They are
+streamed line by line to io/output/final/jsonl/<name>.results.jsonl (gzip with
+``--gzip``) at constant memory, with each line's input line number (see io_jsonl).
+
+With ``--workers N`` (or ORBITSUITE_IO_WORKERS) files are spread over N worker
+processes, each holding its own Supervisor so no pipeline state is shared.
+Plain, JSON and JSONL inputs are interleaved so no kind waits behind another;
+the lines of a JSONL file are spread over the workers too.
+The run returns per-file timings and an aggregate throughput summary.
+
+Runs are incremental: ``io/output/manifest.json`` (see io_manifest) records
+each input's content hash, so unchanged inputs are skipped, changed ones are
+re-run and outputs of deleted inputs are pruned. ``--force`` re-runs everything.
+
+``--watch`` keeps running instead: the Supervisor (or worker pool) stays warm
+and files are processed as they arrive (inotify where available, polling
+otherwise; see io_watch), one JSON line per processed file on stdout.
+
+Every run journals finished inputs to ``io/output/checkpoint.jsonl`` (see
+checkpoint) as it goes, and JSONL results journal their flushed lines. After a
+crash, ``--resume`` skips what the interrupted run finished, re-queues what it
+had in flight and continues half-done JSONL files where their output stops.
+
+Several nodes can drain one shared io/ directory (see io_shard): ``--shard i/N``
+partitions inputs by hash, ``--claim`` claims them one by one with expiring
+leases, and ``--status`` shows the combined progress of all nodes.
+
+Usage:
+  python -m src.io_runner [--root io] [--workers N] [--force] [--resume] [--gzip] [--watch [--poll]]
+                          [--shard i/N | --claim [--node NAME]] [--status]
 """
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import argparse
 import json
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from glob import glob
-from typing import Any, Dict
+from itertools import zip_longest
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # Ensure relative import works when executed as a module or script
 try:
     from .utils import load_dotenv
     load_dotenv()  # load ./src/.env if present
     from .supervisor import Supervisor
+    from .io_manifest import IOManifest, manifest_name, manifest_paths
+    from .io_shard import ClaimStore, ShardSpec, shard_status
+    from .io_watch import DirectoryWatcher
+    from .io_jsonl import process_line, results_path, stream_jsonl
+    from .checkpoint import CheckpointJournal
 except ImportError:  # pragma: no cover
     from utils import load_dotenv
     load_dotenv()
     from supervisor import Supervisor
+    from io_manifest import IOManifest, manifest_name, manifest_paths
+    from io_shard import ClaimStore, ShardSpec, shard_status  # type: ignore
+    from io_watch import DirectoryWatcher
+    from io_jsonl import process_line, results_path, stream_jsonl  # type: ignore
+    from checkpoint import CheckpointJournal  # type: ignore
+
+PLAIN = "plain"
+JSON = "json"
+JSONL = "jsonl"
+_EXTENSIONS = {PLAIN: ".txt", JSON: ".json", JSONL: ".jsonl"}
+
+InputFile = Tuple[str, str]  # (kind, path)
+
+# Statuses the next run retries: failed inputs and JSONL files with failed lines
+_RETRY_STATUSES = ("error", "partial")
+
+# Per-process Supervisor for pool workers (set by _init_worker)
+_worker_supervisor: Optional[Supervisor] = None
+
+
+def default_workers() -> int:
+    raw = os.getenv("ORBITSUITE_IO_WORKERS", "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else 1
 
 
 def ensure_dirs(root: str) -> Dict[str, str]:
@@ -29,65 +96,427 @@ def ensure_dirs(root: str) -> Dict[str, str]:
     dirs = {
         "plain": os.path.join(base, "input", "plain"),
         "json": os.path.join(base, "input", "json"),
+        "jsonl": os.path.join(base, "input", "jsonl"),
         "final": os.path.join(base, "output", "final"),
     }
     for d in dirs.values():
         os.makedirs(d, exist_ok=True)
+    dirs["input"] = os.path.join(base, "input")
+    dirs["output"] = os.path.join(base, "output")
     return dirs
 
 
-def process_plain_files(sv: Supervisor, in_dir: str, out_dir: str) -> int:
-    count = 0
-    for path in glob(os.path.join(in_dir, "*.txt")):
+def collect_inputs(dirs: Dict[str, str]) -> List[InputFile]:
+    """Inputs of each kind interleaved (txt, json, jsonl, txt, ...) in name order."""
+    per_kind = [[(kind, p) for p in sorted(glob(os.path.join(dirs[kind], "*" + ext)))]
+                for kind, ext in _EXTENSIONS.items()]
+    return [item for group in zip_longest(*per_kind) for item in group if item is not None]
+
+
+def _load_request(kind: str, path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        if kind == PLAIN:
+            return f.read().strip()
+        # Accept either a single task dict or {"request": "..."}
+        return json.load(f)
+
+
+def _kind_dir(out_dir: str, kind: str) -> str:
+    """Per-kind output folder under ``out_dir`` (created on first use)."""
+    target = os.path.join(out_dir, kind)
+    os.makedirs(target, exist_ok=True)
+    return target
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def process_file(sv: Supervisor, kind: str, path: str, out_dir: str) -> Dict[str, Any]:
+    """Run one input file and write ``<kind>/<name>.result.json`` or ``<kind>/<name>.error.json``.
+
+    Whichever of the two is not written is removed, so a fixed input does not
+    leave an old error file behind (and vice versa).
+
+    Returns a record with the file, its kind, ``status`` (result / error /
+    skipped for empty prompts) and the wall time spent on it.
+    """
+    started = time.time()
+    name = os.path.splitext(os.path.basename(path))[0]
+    out_dir = _kind_dir(out_dir, kind)
+    record: Dict[str, Any] = {"file": os.path.basename(path), "kind": kind, "pid": os.getpid()}
+    try:
+        request = _load_request(kind, path)
+        if not request:
+            record.update(status="skipped", elapsed=0.0)
+            return record
+        result = sv.process_request(request)
+        out_path = os.path.join(out_dir, f"{name}.result.json")
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, default=str)
+        _remove_quietly(os.path.join(out_dir, f"{name}.error.json"))
+        record["status"] = "result"
+    except Exception as e:
+        out_path = os.path.join(out_dir, f"{name}.error.json")
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump({"success": False, "error": str(e)}, f, indent=2)
+        _remove_quietly(os.path.join(out_dir, f"{name}.result.json"))
+        record.update(status="error", error=str(e))
+    record["output"] = out_path
+    record["elapsed"] = round(time.time() - started, 3)
+    return record
+
+
+def _init_worker(factory: Callable[[], Supervisor]) -> None:
+    global _worker_supervisor
+    _worker_supervisor = factory()
+
+
+def _process_in_worker(kind: str, path: str, out_dir: str) -> Dict[str, Any]:
+    assert _worker_supervisor is not None, "worker not initialised"
+    return process_file(_worker_supervisor, kind, path, out_dir)
+
+
+def _process_line_in_worker(number: int, text: str) -> Dict[str, Any]:
+    assert _worker_supervisor is not None, "worker not initialised"
+    return process_line(_worker_supervisor, number, text)
+
+
+def _summarize(records: List[Dict[str, Any]], workers: int, elapsed: float,
+               pruned: List[str]) -> Dict[str, Any]:
+    done = [r for r in records if r["status"] in ("result", "partial", "error")]  # not skipped / unchanged / ...
+    succeeded = {kind: sum(1 for r in records if r["status"] in ("result", "partial") and r["kind"] == kind)
+                 for kind in _EXTENSIONS}
+    busy = sum(r["elapsed"] for r in done)
+    return {
+        **succeeded,
+        "total": sum(succeeded.values()),
+        "lines": sum(r.get("lines", 0) for r in done),
+        "processed": len(done),
+        "failed": sum(1 for r in records if r["status"] == "error"),
+        "partial": sum(1 for r in records if r["status"] == "partial"),
+        "skipped": len(records) - len(done),
+        "unchanged": sum(1 for r in records if r["status"] == "unchanged"),
+        "resumed": sum(1 for r in records if r["status"] == "resumed"),
+        "pruned": pruned,
+        "workers": workers,
+        "elapsed": round(elapsed, 3),
+        "files_per_second": round(len(done) / elapsed, 3) if elapsed > 0 else 0.0,
+        "avg_file_seconds": round(busy / len(done), 3) if done else 0.0,
+        "files": records,
+    }
+
+
+class _FileProcessor:
+    """Warm Supervisor(s) behind ``submit(kind, path) -> Future[record]``.
+
+    One worker runs on a single thread with one Supervisor; more workers use a
+    process pool whose processes each build their own. JSONL files are driven
+    from a separate thread that feeds their lines to the same workers.
+    """
+
+    def __init__(self, out_dir: str, workers: int, supervisor_factory: Callable[[], Supervisor],
+                 compress: bool = False, resume: bool = False) -> None:
+        self.out_dir = out_dir
+        self.workers = workers
+        self.compress = compress
+        self.resume = resume
+        self._streams = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orbit-io-jsonl")
+        self._sv: Optional[Supervisor] = None
+        self._pool: Any
+        if workers == 1:
+            self._sv = supervisor_factory()
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orbit-io")
+        else:
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(supervisor_factory,))
+
+    def submit(self, kind: str, path: str) -> "Future[Dict[str, Any]]":
+        if kind == JSONL:
+            return self._streams.submit(self._process_jsonl, path)
+        if self._sv is not None:
+            return self._pool.submit(process_file, self._sv, kind, path, self.out_dir)
+        return self._pool.submit(_process_in_worker, kind, path, self.out_dir)
+
+    def _submit_line(self, number: int, text: str) -> "Future[Dict[str, Any]]":
+        if self._sv is not None:
+            return self._pool.submit(process_line, self._sv, number, text)
+        return self._pool.submit(_process_line_in_worker, number, text)
+
+    def _process_jsonl(self, path: str) -> Dict[str, Any]:
+        """Stream a JSONL file; a bad line only fails its own output line.
+
+        A file with failed lines gets status ``partial`` so the manifest does not
+        count it as done and the next run retries it.
+        """
+        started = time.time()
+        name = os.path.basename(path)[: -len(".jsonl")]
+        out_dir = _kind_dir(self.out_dir, JSONL)
+        out_path = results_path(out_dir, path, self.compress)
+        record: Dict[str, Any] = {"file": os.path.basename(path), "kind": JSONL, "pid": os.getpid()}
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                prompt = f.read().strip()
-            if not prompt:
-                continue
-            result = sv.process_request(prompt)
-            name = os.path.splitext(os.path.basename(path))[0]
-            out_path = os.path.join(out_dir, f"{name}.result.json")
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2, default=str)
-            count += 1
+            counts = stream_jsonl(path, out_path, self._submit_line, window=self.workers * 4,
+                                  compress=self.compress, checkpoint=out_path + ".ckpt", resume=self.resume)
+            _remove_quietly(results_path(out_dir, path, not self.compress))
+            _remove_quietly(os.path.join(out_dir, f"{name}.error.json"))
+            record.update(status="partial" if counts["failed"] else "result", lines=counts["lines"],
+                          failed_lines=counts["failed"])
+            if counts["failed"]:
+                record["error"] = f"{counts['failed']} of {counts['lines']} lines failed"
         except Exception as e:
-            name = os.path.splitext(os.path.basename(path))[0]
+            _remove_quietly(out_path)
+            _remove_quietly(out_path + ".ckpt")
             out_path = os.path.join(out_dir, f"{name}.error.json")
             with open(out_path, "w", encoding="utf-8") as f:
                 json.dump({"success": False, "error": str(e)}, f, indent=2)
-    return count
+            record.update(status="error", error=str(e))
+        record["output"] = out_path
+        record["elapsed"] = round(time.time() - started, 3)
+        return record
+
+    def close(self) -> None:
+        self._streams.shutdown(wait=True)
+        self._pool.shutdown(wait=True)
+
+
+def _input_key(dirs: Dict[str, str], path: str) -> str:
+    return os.path.relpath(path, dirs["input"]).replace(os.sep, "/")
+
+
+def _open_manifest(dirs: Dict[str, str], owner: Optional[str] = None) -> IOManifest:
+    """This runner's manifest, aware of what other owners (shards / nodes) finished."""
+    return IOManifest(os.path.join(dirs["output"], manifest_name(owner)), peers=manifest_paths(dirs["output"]))
+
+
+def _open_checkpoint(dirs: Dict[str, str], owner: Optional[str] = None, resume: bool = False) -> CheckpointJournal:
+    name = f"checkpoint.{owner}.jsonl" if owner else "checkpoint.jsonl"
+    return CheckpointJournal(os.path.join(dirs["output"], name), resume=resume)
+
+
+def _restore(journal: CheckpointJournal, manifest: IOManifest, key: str, fingerprint: Dict[str, Any]) -> bool:
+    """Carry an input an interrupted run finished into the manifest; False if it must run again."""
+    entry = journal.record(key)
+    if entry is None or entry.get("sha256") != fingerprint["sha256"]:
+        return False  # never finished, or edited since
+    if entry.get("loc") and not os.path.exists(entry["loc"]):
+        return False
+    manifest.update(key, fingerprint, entry["status"], entry.get("loc"))
+    return True
+
+
+def run_io(root: str, workers: Optional[int] = None,
+           supervisor_factory: Callable[[], Supervisor] = Supervisor,
+           force: bool = False, compress: bool = False,
+           shard: Optional[str] = None, claim: bool = False,
+           node: Optional[str] = None, lease: Optional[float] = None,
+           resume: bool = False) -> Dict[str, Any]:
+    """Process new or changed inputs under ``root``; ``workers > 1`` uses a process pool.
+
+    ``supervisor_factory`` must be picklable (a class or module-level function)
+    so each worker process can build its own Supervisor. ``force`` ignores the
+    manifest and re-runs every input; ``compress`` gzips JSONL results.
+    ``resume`` picks up the checkpoint of an interrupted run (see module docstring).
+
+    ``shard="i/N"`` only takes this node's hash partition; ``claim=True`` claims
+    inputs one at a time from a shared pool (``node`` / ``lease``, see io_shard).
+    """
+    dirs = ensure_dirs(root)
+    workers = max(1, workers or default_workers())
+    started = time.time()
+    spec = ShardSpec.parse(shard) if shard else None
+    claims = ClaimStore(os.path.join(dirs["output"], "claims"), node, lease) if claim else None
+    owner = spec.owner if spec else claims.node if claims else None
+    manifest = _open_manifest(dirs, owner)
+    journal = _open_checkpoint(dirs, owner, resume)
+    inputs = collect_inputs(dirs)
+    keys = {path: _input_key(dirs, path) for _, path in inputs}
+    if spec is not None:
+        inputs = [(kind, path) for kind, path in inputs if spec.owns(keys[path])]
+    order = {os.path.basename(path): i for i, (_, path) in enumerate(inputs)}
 
+    records: List[Dict[str, Any]] = []
+    pending: List[InputFile] = []
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    for kind, path in inputs:
+        current, fingerprints[path] = manifest.check(keys[path], path)
+        if current and not force:
+            records.append({"file": os.path.basename(path), "kind": kind, "status": "unchanged", "elapsed": 0.0})
+        elif resume and _restore(journal, manifest, keys[path], fingerprints[path]):
+            records.append({"file": os.path.basename(path), "kind": kind, "status": "resumed", "elapsed": 0.0})
+        else:
+            pending.append((kind, path))
+    pruned = manifest.prune(keys[path] for _, path in inputs)
 
-def process_json_files(sv: Supervisor, in_dir: str, out_dir: str) -> int:
-    count = 0
-    for path in glob(os.path.join(in_dir, "*.json")):
+    if not any(kind == JSONL for kind, _ in pending):
+        workers = min(workers, max(1, len(pending)))
+    if pending:
+        processor = _FileProcessor(dirs["final"], workers, supervisor_factory, compress, resume)
+        # Claiming nodes take a little work at a time so the others get their share
+        window = workers * 2 if claims is not None else len(pending)
+        queue = deque(pending)
+        running: Dict["Future[Dict[str, Any]]", str] = {}
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                payload: Any = json.load(f)
-            # Accept either a single task dict or {"request": "..."}
-            result = sv.process_request(payload)
-            name = os.path.splitext(os.path.basename(path))[0]
-            out_path = os.path.join(out_dir, f"{name}.result.json")
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2, default=str)
-            count += 1
-        except Exception as e:
-            name = os.path.splitext(os.path.basename(path))[0]
-            out_path = os.path.join(out_dir, f"{name}.error.json")
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump({"success": False, "error": str(e)}, f, indent=2)
-    return count
+            with claims if claims is not None else nullcontext():
+                while queue or running:
+                    while queue and len(running) < window:
+                        kind, path = queue.popleft()
+                        if claims is not None and not claims.try_claim(keys[path], fingerprints[path]["sha256"]):
+                            records.append({"file": os.path.basename(path), "kind": kind, "status": "claimed",
+                                            "elapsed": 0.0})
+                            continue
+                        journal.start(keys[path])
+                        running[processor.submit(kind, path)] = path
+                    if not running:
+                        break
+                    for fut in wait(running, return_when=FIRST_COMPLETED)[0]:
+                        path, record = running.pop(fut), fut.result()
+                        manifest.update(keys[path], fingerprints[path], record["status"], record.get("output"))
+                        if record["status"] in _RETRY_STATUSES:
+                            journal.fail(keys[path], record.get("error", ""))
+                        else:
+                            journal.complete(keys[path], record.get("output"), status=record["status"],
+                                             sha256=fingerprints[path]["sha256"])
+                        if claims is not None:
+                            digest = fingerprints[path]["sha256"]
+                            # failures stay claimable so another node (or the next run) retries them
+                            retry = record["status"] in _RETRY_STATUSES
+                            (claims.release if retry else claims.complete)(keys[path], digest)
+                            manifest.save()  # progress visible to the other nodes as it happens
+                        records.append(record)
+        finally:
+            processor.close()
+            journal.close()
+    if inputs or pruned:
+        manifest.save()
+    journal.discard()  # everything it recorded is in the manifest now
+    records.sort(key=lambda r: order[r["file"]])
+    summary = _summarize(records, workers, time.time() - started, pruned)
+    if resume:
+        summary["requeued"] = sorted(journal.resumed_in_flight)
+    if spec is not None or claims is not None:
+        summary["shard"] = spec.owner if spec else None
+        summary["node"] = claims.node if claims else None
+        summary["claimed_elsewhere"] = sum(1 for r in records if r["status"] == "claimed")
+    return summary
 
 
-def run_io(root: str) -> Dict[str, int]:
+def io_status(root: str, lease: Optional[float] = None) -> Dict[str, Any]:
+    """Combined progress of every shard / node working on ``root`` (see io_shard.shard_status)."""
     dirs = ensure_dirs(root)
-    sv = Supervisor()
-    processed_plain = process_plain_files(sv, dirs["plain"], dirs["final"])
-    processed_json = process_json_files(sv, dirs["json"], dirs["final"])
-    return {"plain": processed_plain, "json": processed_json, "total": processed_plain + processed_json}
+    keys = [_input_key(dirs, path) for _, path in collect_inputs(dirs)]
+    return shard_status(dirs["output"], keys, lease)
 
 
-if __name__ == "__main__":
-    base = os.path.join(os.path.dirname(os.path.dirname(__file__)), "io")
-    stats = run_io(base)
+def _print_record(record: Dict[str, Any]) -> None:
+    print(json.dumps(record, default=str), flush=True)
+
+
+def watch_io(root: str, workers: Optional[int] = None,
+             supervisor_factory: Callable[[], Supervisor] = Supervisor,
+             stop: Optional[threading.Event] = None,
+             on_record: Callable[[Dict[str, Any]], None] = _print_record,
+             use_inotify: Optional[bool] = None,
+             settle: Optional[float] = None,
+             compress: bool = False) -> Dict[str, Any]:
+    """Process inputs as they appear until ``stop`` is set (or Ctrl+C).
+
+    Pending inputs (per the manifest) are processed first. A file modified while
+    it is being processed is run again once that run finishes. Returns the
+    summary of everything processed while watching.
+    """
+    dirs = ensure_dirs(root)
+    workers = max(1, workers or default_workers())
+    stop = stop or threading.Event()
+    started = time.time()
+    manifest = _open_manifest(dirs)
+    kinds = {dirs[kind]: kind for kind in _EXTENSIONS}
+    watcher = DirectoryWatcher({dirs[kind]: ext for kind, ext in _EXTENSIONS.items()},
+                               settle=settle, use_inotify=use_inotify)
+    processor = _FileProcessor(dirs["final"], workers, supervisor_factory, compress)
+    running: Dict["Future[Dict[str, Any]]", Tuple[str, Dict[str, Any]]] = {}
+    rerun: List[str] = []
+    records: List[Dict[str, Any]] = []
+
+    def _finish(done: Any) -> None:
+        for fut in done:
+            path, fingerprint = running.pop(fut)
+            record = fut.result()
+            manifest.update(_input_key(dirs, path), fingerprint, record["status"], record.get("output"))
+            manifest.save()
+            records.append(record)
+            on_record(record)
+
+    try:
+        ready = [path for _, path in collect_inputs(dirs)]
+        while not stop.is_set():
+            busy = {path for path, _ in running.values()}
+            for path in ready:
+                if path in busy:
+                    rerun.append(path)  # changed mid-run: look again once the current run finishes
+                    continue
+                if not os.path.exists(path):
+                    continue
+                current, fingerprint = manifest.check(_input_key(dirs, path), path)
+                if not current:
+                    running[processor.submit(kinds[os.path.dirname(path)], path)] = (path, fingerprint)
+            _finish([fut for fut in running if fut.done()])
+            ready = watcher.poll(0.05 if running else 0.5)
+            if rerun and not {path for path, _ in running.values()}.intersection(rerun):
+                ready, rerun = ready + rerun, []
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        _finish(wait(list(running))[0])
+        processor.close()
+    summary = _summarize(records, workers, time.time() - started, [])
+    summary["backend"] = watcher.backend
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Process io/input prompts into io/output/final")
+    parser.add_argument("--root", default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "io"))
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes, each with its own Supervisor (default ORBITSUITE_IO_WORKERS or 1)")
+    parser.add_argument("--force", action="store_true", help="re-run inputs the manifest marks unchanged")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run from its checkpoint instead of starting over")
+    parser.add_argument("--gzip", action="store_true", help="write JSONL results as .results.jsonl.gz")
+    parser.add_argument("--watch", action="store_true", help="keep running and process files as they arrive")
+    parser.add_argument("--poll", action="store_true", help="with --watch: poll the folders instead of using inotify")
+    sharding = parser.add_mutually_exclusive_group()
+    sharding.add_argument("--shard", metavar="i/N", help="only process this node's hash partition (0-based i of N)")
+    sharding.add_argument("--claim", action="store_true", help="claim inputs from a shared pool with expiring leases")
+    parser.add_argument("--node", default=None, help="node name for --claim (default ORBITSUITE_IO_NODE or hostname)")
+    parser.add_argument("--status", action="store_true", help="print combined progress across shards / nodes and exit")
+    args = parser.parse_args(argv)
+    if args.shard:
+        try:
+            ShardSpec.parse(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.status:
+        print(json.dumps({"status": io_status(args.root)}, indent=2))
+        return 0
+    if args.watch and (args.shard or args.claim):
+        parser.error("--watch runs a single node; it cannot be combined with --shard or --claim")
+    if args.watch and args.resume:
+        parser.error("--watch saves its manifest after every file; --resume only applies to batch runs")
+    if args.watch:
+        stats = watch_io(args.root, workers=args.workers, use_inotify=False if args.poll else None,
+                         compress=args.gzip)
+        stats.pop("files")
+        print(json.dumps({"watched": stats}, indent=2))
+        return 0
+    stats = run_io(args.root, workers=args.workers, force=args.force, compress=args.gzip,
+                   shard=args.shard, claim=args.claim, node=args.node, resume=args.resume)
     print(json.dumps({"processed": stats}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+"""Sharing one io/ directory (e.g. on NFS) between several io_runner nodes (stdlib only).
+
+Two ways to split the work:
+
+* ``--shard i/N`` (``ShardSpec``): deterministic hash partitioning. Input keys
+  are hashed, and node ``i`` of ``N`` only takes keys with ``hash % N == i``.
+  No coordination is needed, but a dead shard's inputs wait until it is restarted.
+* ``--claim`` (``ClaimStore``): dynamic claiming. Before running an input, a
+  node atomically creates ``output/claims/<id>.claim`` by hard-linking a
+  private temp file, which is atomic on local filesystems and NFS. It then
+  renews the claim's mtime while it works. A claim not renewed for
+  ``lease`` seconds (a crashed node) may be broken and taken over by another
+  node. Finished claims become ``<id>.done``, so no other node repeats that
+  input. The claim id covers the input key *and* its content hash, so an
+  edited input is claimable again.
+
+Breaking an expired lease races with its owner coming back, so in rare cases
+an input runs twice. Outputs are written whole, so the last writer wins and
+nothing is corrupted.
+
+``shard_status`` combines the per-owner manifests and live claims into one
+progress view (``python -m src.io_runner --status``).
+
+Environment variables:
+  ORBITSUITE_IO_NODE   node name for claims and per-node manifests (default hostname)
+  ORBITSUITE_IO_LEASE  seconds before an unrenewed claim may be taken over (default 300)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from glob import glob
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    from .io_manifest import load_manifest_entries, manifest_paths
+except ImportError:  # pragma: no cover - script execution
+    from io_manifest import load_manifest_entries, manifest_paths  # type: ignore
+
+CLAIM_SUFFIX = ".claim"
+DONE_SUFFIX = ".done"
+
+
+def default_node() -> str:
+    return os.getenv("ORBITSUITE_IO_NODE", "").strip() or socket.gethostname()
+
+
+def default_lease() -> float:
+    try:
+        value = float(os.getenv("ORBITSUITE_IO_LEASE", "").strip())
+    except ValueError:
+        return 300.0
+    return value if value > 0 else 300.0
+
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "big")
+
+
+@dataclass(frozen=True)
+class ShardSpec:
+    """Node ``index`` of ``count`` in a hash-partitioned run."""
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, text: str) -> "ShardSpec":
+        """Parse ``"i/N"`` (0-based index), e.g. ``"0/3"``."""
+        try:
+            index, count = (int(part) for part in text.split("/", 1))
+        except ValueError:
+            raise ValueError(f"shard must look like i/N, got {text!r}") from None
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"shard index must be in [0, {count}), got {text!r}")
+        return cls(index, count)
+
+    @property
+    def owner(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+    def owns(self, key: str) -> bool:
+        return _stable_hash(key) % self.count == self.index
+
+
+class ClaimStore:
+    """Lease-based, lock-free work claims in a shared directory."""
+
+    def __init__(self, directory: str, node: Optional[str] = None, lease: Optional[float] = None) -> None:
+        self.directory = directory
+        self.node = node or default_node()
+        self.lease = lease or default_lease()
+        self._held: Set[str] = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str, digest: str, suffix: str) -> str:
+        name = hashlib.sha1(f"{key}\0{digest}".encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, name + suffix)
+
+    def _expired(self, path: str) -> bool:
+        try:
+            return time.time() - os.stat(path).st_mtime > self.lease
+        except OSError:
+            return False  # already gone: someone else released or broke it
+
+    def _link(self, tmp: str, path: str) -> bool:
+        try:
+            os.link(tmp, path)
+            return True
+        except FileExistsError:
+            return False
+        except OSError:  # filesystem without hard links: O_EXCL create is the fallback
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                return False
+            with open(tmp, "rb") as src, open(path, "wb") as dst:
+                dst.write(src.read())
+            return True
+
+    def _break(self, path: str) -> bool:
+        """Take an expired claim out of the way; only one contender's rename succeeds."""
+        moved = f"{path}.expired.{uuid.uuid4().hex[:8]}"
+        try:
+            os.rename(path, moved)
+        except OSError:
+            return False
+        if not self._expired(moved):
+            # The owner renewed (or someone re-claimed) between our check and the rename: put it back
+            try:
+                os.link(moved, path)
+            except OSError:
+                pass
+            os.remove(moved)
+            return False
+        os.remove(moved)
+        return True
+
+    def is_done(self, key: str, digest: str) -> bool:
+        return os.path.exists(self._path(key, digest, DONE_SUFFIX))
+
+    def try_claim(self, key: str, digest: str) -> bool:
+        """Claim ``key`` at content ``digest``; False if done or validly held elsewhere."""
+        if self.is_done(key, digest):
+            return False
+        path = self._path(key, digest, CLAIM_SUFFIX)
+        tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "node": self.node, "pid": os.getpid(), "claimed_at": time.time()}, f)
+        try:
+            claimed = self._link(tmp, path)
+            if not claimed and self._expired(path) and self._break(path):
+                claimed = self._link(tmp, path)
+        finally:
+            os.remove(tmp)
+        if claimed:
+            with self._lock:
+                self._held.add(path)
+        return claimed
+
+    def complete(self, key: str, digest: str) -> None:
+        """Mark a claimed input finished (atomic rename to ``.done``)."""
+        path = self._path(key, digest, CLAIM_SUFFIX)
+        with self._lock:
+            self._held.discard(path)
+        try:
+            os.replace(path, self._path(key, digest, DONE_SUFFIX))
+        except OSError:
+            pass
+
+    def release(self, key: str, digest: str) -> None:
+        """Give a claim back without marking it done (the input can be claimed again)."""
+        path = self._path(key, digest, CLAIM_SUFFIX)
+        with self._lock:
+            self._held.discard(path)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def renew(self) -> None:
+        """Refresh the lease of every claim this store holds."""
+        with self._lock:
+            held = list(self._held)
+        for path in held:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "ClaimStore":
+        def _beat() -> None:
+            while not self._stop.wait(self.lease / 3):
+                self.renew()
+        self._stop.clear()
+        self._heartbeat = threading.Thread(target=_beat, name="orbit-io-lease", daemon=True)
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+        with self._lock:
+            held = list(self._held)
+            self._held.clear()
+        for path in held:  # interrupted work goes straight back to the pool
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def shard_status(output_dir: str, input_keys: Iterable[str], lease: Optional[float] = None) -> Dict[str, Any]:
+    """Combined progress of every node writing to ``output_dir``."""
+    lease = lease or default_lease()
+    keys = set(input_keys)
+    newest: Dict[str, Dict[str, Any]] = {}
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for path in manifest_paths(output_dir):
+        name = os.path.basename(path)
+        owner = name[len("manifest."):-len(".json")] or "default"
+        entries = load_manifest_entries(path)
+        node = nodes.setdefault(owner, {"processed": 0, "failed": 0, "last_update": None})
+        for key, entry in entries.items():
+            if key not in keys:
+                continue
+            node["processed"] += 1
+            node["failed"] += entry.get("status") in ("error", "partial")
+            node["last_update"] = max(node["last_update"] or 0, entry.get("processed_at", 0))
+            known = newest.get(key)
+            if known is None or entry.get("processed_at", 0) > known.get("processed_at", 0):
+                newest[key] = entry
+    in_flight: List[Dict[str, Any]] = []
+    now = time.time()
+    for path in glob(os.path.join(output_dir, "claims", "*" + CLAIM_SUFFIX)):
+        try:
+            age = now - os.stat(path).st_mtime
+            with open(path, "r", encoding="utf-8") as f:
+                claim = json.load(f)
+        except (OSError, ValueError):
+            continue
+        in_flight.append({"key": claim.get("key"), "node": claim.get("node"),
+                          "expires_in": round(lease - age, 1), "expired": age > lease})
+    done = sum(1 for e in newest.values() if e.get("status") in ("result", "skipped"))
+    failed = sum(1 for e in newest.values() if e.get("status") in ("error", "partial"))
+    return {
+        "inputs": len(keys),
+        "done": done,
+        "failed": failed,
+        "remaining": len(keys) - done,
+        "in_flight": sorted(in_flight, key=lambda c: str(c["key"])),
+        "nodes": nodes,
+    }
+
+
+__all__ = ["ClaimStore", "ShardSpec", "default_lease", "default_node", "shard_status"]
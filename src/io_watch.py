@@ -0,0 +1,205 @@
+"""Directory watching for ``io_runner --watch`` (stdlib only).
+
+``DirectoryWatcher`` reports files that were created, modified or moved into a
+set of directories. On Linux it uses inotify (through ``ctypes``), so changes
+are seen as they happen. Elsewhere, or when inotify is unavailable, it falls
+back to scanning the directories every ``poll_interval`` seconds.
+
+Writers rarely produce a file in one go, so a changed file is only reported
+once it has been quiet for ``settle`` seconds and its size / mtime are stable.
+Files whose name starts with ``.`` (editor swap files, in-progress temp files)
+are ignored.
+
+Environment variables:
+  ORBITSUITE_IO_WATCH_SETTLE  quiet period before a changed file is reported (default 0.25s)
+  ORBITSUITE_IO_POLL_INTERVAL scan interval of the polling fallback (default 0.5s)
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+Fingerprint = Tuple[int, int]  # (size, mtime_ns)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, "").strip())
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _fingerprint(path: str) -> Optional[Fingerprint]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class _Inotify:
+    """Minimal inotify binding; raises OSError when the platform lacks it."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+
+    def add(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._dirs[wd] = directory
+
+    def read(self, timeout: float) -> Tuple[List[str], bool]:
+        """Paths touched within ``timeout`` seconds, and whether the kernel queue overflowed."""
+        if not select.select([self.fd], [], [], max(0.0, timeout))[0]:
+            return [], False
+        try:
+            buf = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return [], False
+        paths: List[str] = []
+        overflow = False
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(buf):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buf, offset)
+            offset += _EVENT_HEADER.size
+            name = buf[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                overflow = True
+            elif name and wd in self._dirs:
+                paths.append(os.path.join(self._dirs[wd], os.fsdecode(name)))
+        return paths, overflow
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """Report settled new / modified files under ``dirs`` (directory -> file extension)."""
+
+    def __init__(self, dirs: Dict[str, str], settle: Optional[float] = None,
+                 poll_interval: Optional[float] = None, use_inotify: Optional[bool] = None) -> None:
+        self.dirs = {os.path.abspath(d): ext for d, ext in dirs.items()}
+        self.settle = settle if settle is not None else _env_float("ORBITSUITE_IO_WATCH_SETTLE", 0.25)
+        self.poll_interval = poll_interval or _env_float("ORBITSUITE_IO_POLL_INTERVAL", 0.5)
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify is not False:
+            try:
+                self._inotify = _Inotify()
+                for d in self.dirs:
+                    self._inotify.add(d)
+            except (OSError, AttributeError):
+                if self._inotify is not None:
+                    self._inotify.close()
+                self._inotify = None
+                if use_inotify:
+                    raise
+        self._known: Dict[str, Fingerprint] = self._scan()  # polling baseline: existing files are not "new"
+        self._pending: Dict[str, Tuple[float, Optional[Fingerprint]]] = {}
+        self._next_scan = 0.0
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def _wanted(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        ext = self.dirs.get(directory)
+        return ext is not None and name.endswith(ext) and not name.startswith(".")
+
+    def _scan(self) -> Dict[str, Fingerprint]:
+        found: Dict[str, Fingerprint] = {}
+        for d in self.dirs:
+            try:
+                entries = list(os.scandir(d))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_file() and self._wanted(entry.path):
+                    st = entry.stat()
+                    found[entry.path] = (st.st_size, st.st_mtime_ns)
+        return found
+
+    def _touch(self, path: str, now: float) -> None:
+        if self._wanted(path):
+            self._pending[path] = (now, _fingerprint(path))
+
+    def _collect(self, timeout: float) -> None:
+        now = time.monotonic()
+        if self._inotify is not None:
+            paths, overflow = self._inotify.read(timeout)
+            now = time.monotonic()
+            for path in paths:
+                self._touch(path, now)
+            if not overflow:
+                return
+            self._next_scan = 0.0  # events were lost: rescan once
+        elif now < self._next_scan:
+            time.sleep(min(timeout, self._next_scan - now))
+            return
+        current = self._scan()
+        for path, fp in current.items():
+            if self._known.get(path) != fp:
+                self._touch(path, now)
+        self._known = current
+        self._next_scan = now + self.poll_interval
+
+    def poll(self, timeout: float = 0.5) -> List[str]:
+        """Wait up to ``timeout`` seconds and return files that have settled since the last call."""
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if self._pending:
+                wait = min(t for t, _ in self._pending.values()) + self.settle - now
+            else:
+                wait = deadline - now
+            self._collect(max(0.0, min(wait, deadline - now)))
+            ready = self._settled(time.monotonic())
+            if ready or time.monotonic() >= deadline:
+                return ready
+
+    def _settled(self, now: float) -> List[str]:
+        ready: List[str] = []
+        for path, (seen, fp) in list(self._pending.items()):
+            if now - seen < self.settle:
+                continue
+            current = _fingerprint(path)
+            if current is None:
+                del self._pending[path]  # deleted before it settled
+            elif current != fp:
+                self._pending[path] = (now, current)  # still being written
+            else:
+                del self._pending[path]
+                self._known[path] = current
+                ready.append(path)
+        return sorted(ready)
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+__all__ = ["DirectoryWatcher"]
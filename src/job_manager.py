@@ -0,0 +1,296 @@
+"""In-process asynchronous job queue for long pipeline runs.
+
+HTTP ``/process`` keeps the connection open for the whole pipeline (primary
+run, autobuild run, optional PyInstaller build). ``JobManager`` lets the
+servers accept the work, return a job id immediately and let clients poll:
+
+  POST   /jobs        -> 202 {job_id, status, location}
+  GET    /jobs/{id}   -> status / progress / result
+  GET    /jobs/{id}/events -> live progress (SSE) from the event bus
+  DELETE /jobs/{id}   -> cancel (queued jobs never start; running jobs are
+                         flagged and stop at the next checkpoint)
+
+Jobs run on a bounded worker pool. The number of queued (not yet running)
+jobs is capped; ``submit`` raises ``JobQueueFull`` beyond that. Finished
+jobs are kept for ``ttl`` seconds and purged lazily.
+
+Progress and status changes are also published on the event bus
+(``src.event_bus``, topic ``job:<id>``) so any number of clients can follow a
+job live without the runner ever waiting on them.
+
+Environment variables:
+  ORBITSUITE_JOB_WORKERS  worker threads (default 2)
+  ORBITSUITE_JOB_QUEUE    max queued jobs (default 32)
+  ORBITSUITE_JOB_TTL      seconds to keep finished jobs (default 3600)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from .event_bus import BUS, COALESCE, EventBus, Subscription
+except ImportError:  # pragma: no cover - script execution
+    from event_bus import BUS, COALESCE, EventBus, Subscription  # type: ignore
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+_MAX_PROGRESS = 200
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    try:
+        value = int(raw)
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity."""
+
+
+class JobCancelled(Exception):
+    """Raised by runners that observe a cancellation request."""
+
+
+class Job:
+    """Single unit of queued work plus its observable state."""
+
+    def __init__(self, job_id: str, label: str = "", bus: Optional[EventBus] = None) -> None:
+        self.id = job_id
+        self.label = label
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.progress: List[Dict[str, Any]] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.future: Optional[Future[Any]] = None
+        self.bus = bus
+        self._lock = threading.Lock()
+
+    @property
+    def topic(self) -> str:
+        """Event-bus topic carrying this job's progress."""
+        return f"job:{self.id}"
+
+    def _publish(self, type: str, data: Dict[str, Any], critical: bool = False) -> None:
+        if self.bus is not None:
+            self.bus.publish(self.topic, type, data, critical=critical,
+                             key=(type, data.get("stage")) if type == "progress" else None)
+
+    def _set_status(self, status: str) -> None:
+        """Publish a status transition (caller updates ``status`` under the lock)."""
+        finished = status in FINISHED_STATES
+        self._publish("status", {"job_id": self.id, "status": status}, critical=finished)
+        if finished and self.bus is not None:
+            self.bus.close_topic(self.topic)
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self) -> None:
+        """Checkpoint for runners: raise JobCancelled if a cancel was requested."""
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.id)
+
+    def report(self, stage: str, detail: str = "", **extra: Any) -> None:
+        """Append a progress record (bounded to the most recent entries)."""
+        entry: Dict[str, Any] = {"stage": stage, "ts": time.time()}
+        if detail:
+            entry["detail"] = detail[:160]
+        entry.update(extra)
+        with self._lock:
+            self.progress.append(entry)
+            if len(self.progress) > _MAX_PROGRESS:
+                del self.progress[: len(self.progress) - _MAX_PROGRESS]
+        self._publish("progress", entry)
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = {
+                "job_id": self.id,
+                "label": self.label,
+                "status": self.status,
+                "cancel_requested": self.cancel_event.is_set(),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "progress": list(self.progress),
+            }
+            if self.error:
+                data["error"] = self.error
+            if include_result and self.status in FINISHED_STATES:
+                data["result"] = self.result
+        return data
+
+
+class JobManager:
+    """Bounded worker pool with job bookkeeping, cancellation and retention."""
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 ttl: Optional[float] = None, bus: Optional[EventBus] = None) -> None:
+        self.workers = max(1, workers or _env_int("ORBITSUITE_JOB_WORKERS", 2))
+        self.max_queue = max(1, max_queue or _env_int("ORBITSUITE_JOB_QUEUE", 32))
+        self.ttl = float(ttl if ttl is not None else _env_int("ORBITSUITE_JOB_TTL", 3600))
+        self.bus = bus if bus is not None else BUS
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="orbit-job")
+
+    # --- Submission ---
+    def submit(self, runner: Callable[[Job], Dict[str, Any]], label: str = "") -> Job:
+        """Queue ``runner(job)``; raises JobQueueFull when the queue is at capacity."""
+        self.purge_expired()
+        job = Job(uuid.uuid4().hex[:16], label, bus=self.bus)
+        with self._lock:
+            queued = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+            if queued >= self.max_queue:
+                raise JobQueueFull(f"job queue full ({queued}/{self.max_queue})")
+            self._jobs[job.id] = job
+            job._set_status(QUEUED)  # before the worker can publish anything
+            job.future = self._pool.submit(self._execute, job, runner)
+        return job
+
+    def _execute(self, job: Job, runner: Callable[[Job], Dict[str, Any]]) -> None:
+        with job._lock:
+            cancelled = job.cancel_event.is_set()
+            job.status = CANCELLED if cancelled else RUNNING
+            if cancelled:
+                job.finished_at = time.time()
+            else:
+                job.started_at = time.time()
+        job._set_status(job.status)
+        if cancelled:
+            return
+        job.report("started")
+        status, result, error = SUCCEEDED, None, None
+        try:
+            result = runner(job)
+            if job.cancel_event.is_set():
+                status = CANCELLED
+        except JobCancelled:
+            status = CANCELLED
+        except Exception as e:
+            status, error = FAILED, str(e)
+        job.report(status)
+        with job._lock:
+            job.result = result
+            job.error = error
+            job.status = status
+            job.finished_at = time.time()
+        job._set_status(status)
+
+    # --- Queries ---
+    def get(self, job_id: str) -> Optional[Job]:
+        self.purge_expired()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a job. Returns None for unknown ids; finished jobs are left untouched."""
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with job._lock:
+            if job.status in FINISHED_STATES:
+                return job
+            job.cancel_event.set()
+            cancelled_now = job.status == QUEUED and job.future is not None and job.future.cancel()
+            if cancelled_now:
+                job.status = CANCELLED
+                job.finished_at = time.time()
+        if cancelled_now:
+            job._set_status(CANCELLED)
+        return job
+
+    def subscribe(self, job_id: str, policy: str = COALESCE) -> Optional[Subscription]:
+        """Follow a job's events (history replayed first). None for unknown ids.
+
+        A job that finished long enough ago for its stream to be evicted yields a
+        one-event stream carrying its final status.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with job._lock:
+            finished = job.status in FINISHED_STATES
+            status = job.status
+        sub = self.bus.subscribe(job.topic, policy=policy, create=not finished)
+        if sub is None:
+            self.bus.publish(job.topic, "status", {"job_id": job.id, "status": status}, critical=True)
+            self.bus.close_topic(job.topic)
+            sub = self.bus.subscribe(job.topic, policy=policy)
+        return sub
+
+    def purge_expired(self) -> int:
+        """Drop finished jobs older than the retention window."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            expired = [jid for jid, j in self._jobs.items()
+                       if j.status in FINISHED_STATES and (j.finished_at or 0) < cutoff]
+            for jid in expired:
+                del self._jobs[jid]
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts: Dict[str, int] = {}
+            for j in self._jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+        return {"workers": self.workers, "max_queue": self.max_queue, "ttl": self.ttl, "jobs": counts}
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status not in FINISHED_STATES:
+                    job.cancel_event.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def parse_job_events_path(path: str) -> Optional[str]:
+    """Return the job id for ``/jobs/<id>/events`` paths, else None."""
+    path = path.split("?", 1)[0].rstrip("/")
+    if not path.endswith("/events"):
+        return None
+    return parse_job_path(path[: -len("/events")])
+
+
+def parse_job_path(path: str) -> Optional[str]:
+    """Return the job id for ``/jobs/<id>`` paths (query string ignored), else None."""
+    path = path.split("?", 1)[0].rstrip("/")
+    prefix = "/jobs/"
+    if not path.startswith(prefix):
+        return None
+    job_id = path[len(prefix):]
+    return job_id if job_id and "/" not in job_id else None
+
+
+__all__ = [
+    "CANCELLED",
+    "FAILED",
+    "FINISHED_STATES",
+    "QUEUED",
+    "RUNNING",
+    "SUCCEEDED",
+    "Job",
+    "JobCancelled",
+    "JobManager",
+    "JobQueueFull",
+    "parse_job_events_path",
+    "parse_job_path",
+]
@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../s
 from typing import Any, Dict, Optional, List, Tuple, cast, Protocol
 
 import json
+import threading
 import urllib.request
 import urllib.error
 
@@ -19,6 +20,7 @@ class SupportsLlama(Protocol):
 
 
 from src.base_agent import BaseAgent
+from src.run_context import current_context
 
 
 class LLMAgent(BaseAgent):
@@ -33,11 +35,16 @@ class LLMAgent(BaseAgent):
     - ORBITSUITE_LLM_SERVER_URL: http://127.0.0.1:8080/v1 to use llama.cpp server instead of bindings
     - ORBITSUITE_LLM_SERVER_MODEL: model name to send to server (optional)
     - ORBITSUITE_LLM_SERVER_API_KEY: bearer token if the server enforces auth (optional)
+
+    Conversation history is kept per session: ``session_id`` in the input, else the
+    run context's session (``"default"`` outside a request), so concurrent callers
+    do not interleave turns. Local (bindings) inference is serialized; server calls
+    run in parallel.
     """
 
     # Class-level attribute annotations for better type checking
     _llm: Optional[SupportsLlama]
-    _messages: List[Dict[str, str]]
+    _sessions: Dict[str, List[Dict[str, str]]]
 
     def __init__(
         self,
@@ -69,7 +76,20 @@ class LLMAgent(BaseAgent):
 
         # Runtime state
         self._llm = None
-        self._messages: List[Dict[str, str]] = []
+        self._sessions = {}
+        self._sessions_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+
+    @property
+    def _messages(self) -> List[Dict[str, str]]:
+        """Conversation of the default session (kept for backward compatibility)."""
+        with self._sessions_lock:
+            return self._sessions.setdefault("default", [])
+
+    @_messages.setter
+    def _messages(self, value: List[Dict[str, str]]) -> None:
+        with self._sessions_lock:
+            self._sessions["default"] = value
 
     def _load_model(self) -> None:
         if self._llm is not None:
@@ -104,11 +124,13 @@ class LLMAgent(BaseAgent):
         messages: Optional[List[Dict[str, str]]] = None
         system: Optional[str] = None
         reset = False
+        session_id = current_context().session_id
 
         if isinstance(input_data, dict):
             data = cast(Dict[str, Any], input_data)
             system = str(data.get("system", ""))
             reset = bool(data.get("reset", False))
+            session_id = str(data.get("session_id") or session_id)
             msgs = data.get("messages")
             if isinstance(msgs, list):
                 # Explicitly type msgs as List[Dict[str, Any]] for type safety
@@ -127,36 +149,47 @@ class LLMAgent(BaseAgent):
                 return {"success": False, "error": "LLM prompt is empty"}
             messages = [{"role": "user", "content": input_str}]
 
-        if reset:
-            self._messages = []
+        # Work on a private copy of the session; it is stored back once the turn completes
+        with self._sessions_lock:
+            conversation = [] if reset else list(self._sessions.get(session_id, []))
 
-        if system and not self._messages:
-            self._messages.append({"role": "system", "content": system})
+        if system and not conversation:
+            conversation.append({"role": "system", "content": system})
 
         for m in messages or []:
-            self._messages.append({"role": m.get("role", "user"), "content": m.get("content", "")})
+            conversation.append({"role": m.get("role", "user"), "content": m.get("content", "")})
 
         if self.server_url:
             try:
-                text, usage = self._server_chat_completion(self._messages)
-                self._messages.append({"role": "assistant", "content": text})
+                text, usage = self._server_chat_completion(conversation)
+                conversation.append({"role": "assistant", "content": text})
+                self._store_session(session_id, conversation)
                 return {
                     "success": True,
                     "output": text,
                     "usage": usage,
-                    "messages": self._messages[-6:],
+                    "messages": conversation[-6:],
                 }
             except Exception as e:
                 return {"success": False, "error": str(e)}
 
-        self._load_model()
-        if not self._llm:
-            raise RuntimeError("Model failed to load")
+        with self._model_lock:
+            self._load_model()
+            if not self._llm:
+                raise RuntimeError("Model failed to load")
+            return self._local_completion(session_id, conversation)
+
+    def _store_session(self, session_id: str, conversation: List[Dict[str, str]]) -> None:
+        with self._sessions_lock:
+            self._sessions[session_id] = conversation
 
+    def _local_completion(self, session_id: str, conversation: List[Dict[str, str]]) -> Dict[str, Any]:
+        """Run one chat turn on the in-process model (caller holds ``_model_lock``)."""
+        assert self._llm is not None
         try:
             if hasattr(self._llm, "create_chat_completion"):
                 out = cast(Dict[str, Any], self._llm.create_chat_completion(
-                    messages=self._messages,
+                    messages=conversation,
                     temperature=self.temperature,
                     top_p=self.top_p,
                     max_tokens=self.max_tokens,
@@ -164,7 +197,7 @@ class LLMAgent(BaseAgent):
                 ))
                 text = str(out.get("choices", [{}])[0].get("message", {}).get("content", "")).strip()
             else:
-                full_prompt = "\n".join([f"[{m['role'].upper()}] {m['content']}" for m in self._messages])
+                full_prompt = "\n".join([f"[{m['role'].upper()}] {m['content']}" for m in conversation])
                 out = cast(Dict[str, Any], self._llm.create_completion(
                     prompt=full_prompt,
                     temperature=self.temperature,
@@ -174,11 +207,12 @@ class LLMAgent(BaseAgent):
                 ))
                 text = str(out.get("choices", [{}])[0].get("text", "")).strip()
 
-            self._messages.append({"role": "assistant", "content": text})
+            conversation.append({"role": "assistant", "content": text})
+            self._store_session(session_id, conversation)
             return {
                 "success": True,
                 "output": text,
-                "messages": self._messages[-6:],
+                "messages": conversation[-6:],
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -0,0 +1,214 @@
+"""Record / replay cassettes for LLM provider traffic.
+
+Benchmarks of the full Supervisor -> Orchestrator pipeline are only
+comparable when every run sees the same model output. A cassette captures
+each provider request/response pair as one JSON line; replay serves those
+recordings back instead of calling the network.
+
+Environment variables:
+  ORBITSUITE_LLM_CASSETTE          path to a cassette file or directory
+  ORBITSUITE_LLM_CASSETTE_MODE     record | replay (default: replay if the path exists)
+  ORBITSUITE_LLM_CASSETTE_LATENCY  replay latency scale: 0 = instant (default),
+                                   1 = recorded latency, 0.5 = half, ...
+
+When the path is a directory, record mode creates one
+``cassette_<timestamp>_<pid>.jsonl`` per run and replay mode picks the newest
+cassette in that directory.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from .llm_provider import LLMProvider, instrument_generate
+except ImportError:  # pragma: no cover - script execution
+    from llm_provider import LLMProvider, instrument_generate  # type: ignore
+
+CASSETTE_MISS_PREFIX = "[LLM cassette miss]"
+_MODES = ("record", "replay")
+
+
+def request_key(messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """Stable fingerprint of a provider call (messages + explicit params)."""
+    canonical = json.dumps({"messages": messages, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """Append-only JSONL recording with per-key FIFO replay."""
+
+    def __init__(self, path: Path, mode: str) -> None:
+        if mode not in _MODES:
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[str, Dict[str, Any]] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        if mode == "replay":
+            self._load()
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _load(self) -> None:
+        if not self.path.is_file():
+            return
+        with self.path.open("r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(entry, dict) and isinstance(entry.get("key"), str):
+                    self._entries.setdefault(entry["key"], deque()).append(entry)  # type: ignore[arg-type]
+
+    def record(self, key: str, messages: List[Dict[str, str]], params: Dict[str, Any],
+               response: str, latency: float, provider: str) -> None:
+        entry: Dict[str, Any] = {
+            "key": key,
+            "provider": provider,
+            "request": {"messages": messages, "params": params},
+            "response": response,
+            "latency": round(latency, 6),
+            "ts": time.time(),
+        }
+        line = json.dumps(entry, default=str, ensure_ascii=False)
+        with self._lock:
+            with self.path.open("a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+            self.recorded += 1
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the next recording for ``key``; repeat the last one once exhausted."""
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+                self.replayed += 1
+                return entry
+            if key in self._last:
+                self.replayed += 1
+                return self._last[key]
+            self.misses += 1
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "mode": self.mode,
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+
+
+class CassetteProvider(LLMProvider):
+    """Wraps a real provider (record) or stands in for one (replay)."""
+
+    def __init__(self, cassette: Cassette, inner: Optional[LLMProvider] = None, latency_scale: float = 0.0) -> None:
+        self.cassette = cassette
+        self.inner = inner
+        self.latency_scale = max(0.0, latency_scale)
+
+    @instrument_generate
+    def generate(self, messages: List[Dict[str, str]], **kw: Any) -> str:  # type: ignore[override]
+        params = {k: v for k, v in kw.items() if v is not None}
+        key = request_key(messages, params)
+        if self.cassette.mode == "replay":
+            entry = self.cassette.lookup(key)
+            if entry is None:
+                return f"{CASSETTE_MISS_PREFIX} no recording for request {key[:12]}"
+            if self.latency_scale:
+                time.sleep(float(entry.get("latency", 0.0)) * self.latency_scale)
+            return str(entry.get("response", ""))
+        if self.inner is None:
+            return f"{CASSETTE_MISS_PREFIX} record mode without an underlying provider"
+        start = time.time()
+        out = self.inner.generate(messages, **kw)
+        self.cassette.record(key, messages, params, out, time.time() - start, type(self.inner).__name__)
+        return out
+
+
+_cassettes: Dict[Tuple[str, str], Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def _resolve_path(raw: str, mode: str) -> Path:
+    p = Path(raw)
+    if p.is_dir() or raw.endswith(("/", os.sep)):
+        if mode == "record":
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            return p / f"cassette_{stamp}_{os.getpid()}.jsonl"
+        candidates = sorted(p.glob("cassette_*.jsonl"), key=lambda c: c.stat().st_mtime)
+        return candidates[-1] if candidates else p / "cassette.jsonl"
+    return p
+
+
+def cassette_mode_from_env() -> Optional[str]:
+    """Return 'record' / 'replay' when a cassette is configured, else None."""
+    raw = os.getenv("ORBITSUITE_LLM_CASSETTE", "").strip()
+    if not raw:
+        return None
+    mode = os.getenv("ORBITSUITE_LLM_CASSETTE_MODE", "").strip().lower()
+    if mode in _MODES:
+        return mode
+    return "replay" if Path(raw).exists() else "record"
+
+
+def get_cassette(raw_path: str, mode: str) -> Cassette:
+    """Process-wide cassette per (path, mode) so every provider call shares one file."""
+    with _cassettes_lock:
+        cassette = _cassettes.get((raw_path, mode))
+        if cassette is None:
+            cassette = Cassette(_resolve_path(raw_path, mode), mode)
+            _cassettes[(raw_path, mode)] = cassette
+        return cassette
+
+
+def wrap_provider_from_env(inner: Optional[LLMProvider]) -> Optional[LLMProvider]:
+    """Wrap ``inner`` with the configured cassette, or return it unchanged.
+
+    In replay mode ``inner`` may be None: no real provider is needed.
+    """
+    mode = cassette_mode_from_env()
+    if mode is None:
+        return inner
+    raw = os.getenv("ORBITSUITE_LLM_CASSETTE", "").strip()
+    try:
+        scale = float(os.getenv("ORBITSUITE_LLM_CASSETTE_LATENCY", "0") or 0)
+    except ValueError:
+        scale = 0.0
+    return CassetteProvider(get_cassette(raw, mode), inner, latency_scale=scale)
+
+
+def reset_cassettes() -> None:
+    """Forget cached cassettes (tests / switching cassettes inside one process)."""
+    with _cassettes_lock:
+        _cassettes.clear()
+
+
+__all__ = [
+    "CASSETTE_MISS_PREFIX",
+    "Cassette",
+    "CassetteProvider",
+    "cassette_mode_from_env",
+    "get_cassette",
+    "request_key",
+    "reset_cassettes",
+    "wrap_provider_from_env",
+]
@@ -6,10 +6,34 @@ from __future__ import annotations
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
-import json, time, urllib.request, urllib.error
-from typing import Dict, List, Any, cast, Optional
+import functools, json, time, urllib.request, urllib.error
+from typing import Callable, Dict, List, Any, TypeVar, cast, Optional
+try:
+    from .metrics import LLM_CALLS, LLM_SECONDS
+except ImportError:  # pragma: no cover - script execution
+    from metrics import LLM_CALLS, LLM_SECONDS  # type: ignore
 
 JSON = "application/json"
+_F = TypeVar("_F", bound=Callable[..., str])
+
+
+def instrument_generate(fn: _F) -> _F:
+    """Record latency and outcome (ok / errorish / exception) of ``generate`` per provider class."""
+    @functools.wraps(fn)
+    def wrapper(self: Any, messages: List[Dict[str, str]], *args: Any, **kw: Any) -> str:
+        provider = type(self).__name__
+        start = time.time()
+        try:
+            out = fn(self, messages, *args, **kw)
+        except Exception:
+            LLM_SECONDS.observe(time.time() - start, provider=provider)
+            LLM_CALLS.inc(provider=provider, outcome="exception")
+            raise
+        LLM_SECONDS.observe(time.time() - start, provider=provider)
+        errorish = isinstance(out, str) and ChainedProvider._is_errorish(out)
+        LLM_CALLS.inc(provider=provider, outcome="error" if errorish else "ok")
+        return out
+    return cast(_F, wrapper)
 
 # --- Lightweight .env loader -------------------------------------------------
 # We intentionally avoid adding python-dotenv dependency to keep Core minimal.
@@ -63,6 +87,7 @@ class LLMProvider:
         raise NotImplementedError
 
 class NoopProvider(LLMProvider):
+    @instrument_generate
     def generate(self, messages: List[Dict[str, str]], **kw: object) -> str:
         return ("[LLM disabled] Set ORBITSUITE_LLM_PROVIDER=openai and provide VS_CODE_OPENAI_KEY "
                 "to enable inference in OrbitSuite-Core. Local LLM is part of Pro/Enterprise.")
@@ -89,6 +114,7 @@ class LocalStubProvider(LLMProvider):
             return "python"
         return "python"
 
+    @instrument_generate
     def generate(self, messages: List[Dict[str, str]], **kw: object) -> str:
         user_content = ""
         for m in reversed(messages):
@@ -188,6 +214,7 @@ class OpenAIChatProvider(LLMProvider):
         # Last resort: dump JSON snippet
         return f"[LLM parse warning] Unexpected response shape: {json.dumps(list(obj.keys()))}"
 
+    @instrument_generate
     def generate(self, messages: List[Dict[str, str]], *, model: str | None = None, temperature: float | None = None, max_tokens: int | None = None, timeout: int | None = None) -> str:
         if not self.api_key:
             return "[LLM misconfigured] VS_CODE_OPENAI_KEY / OPENAI_API_KEY is not set."
@@ -245,6 +272,7 @@ class LocalHTTPProvider(LLMProvider):
         self.default_temperature = float(os.getenv("ORBITSUITE_TEMPERATURE", "0.7"))
         self.default_max_tokens = int(os.getenv("ORBITSUITE_MAX_TOKENS", "2048"))
 
+    @instrument_generate
     def generate(self, messages: List[Dict[str, str]], *, model: Optional[str] = None, temperature: Optional[float] = None, max_tokens: Optional[int] = None, timeout: Optional[int] = None) -> str:  # type: ignore[override]
         url = f"{self.base}{self.path}"
         model = model or self.model
@@ -301,6 +329,7 @@ class ChainedProvider(LLMProvider):
         "[LLM HTTP ",
         "[LLM error",
         "[LLM parse warning",
+        "[LLM cassette miss",
     )
 
     def __init__(self, *factories: "ProviderFactory") -> None:
@@ -317,6 +346,7 @@ class ChainedProvider(LLMProvider):
                 return True
         return False
 
+    @instrument_generate
     def generate(self, messages: List[Dict[str, str]], **kw: Any) -> str:  # type: ignore[override]
         last_output: str = ""
         for factory in self._factories:
@@ -340,6 +370,24 @@ ProviderFactory = _Callable[[], LLMProvider]
 
 
 def get_provider_from_env() -> LLMProvider:
+    """Return the env-selected provider, wrapped by an LLM cassette when configured.
+
+    ORBITSUITE_LLM_CASSETTE enables record/replay (see llm_cassette). Replay
+    never constructs or probes a real provider so runs stay offline and
+    deterministic.
+    """
+    try:
+        from .llm_cassette import cassette_mode_from_env, wrap_provider_from_env
+    except ImportError:  # pragma: no cover - script execution
+        from llm_cassette import cassette_mode_from_env, wrap_provider_from_env  # type: ignore
+    mode = cassette_mode_from_env()
+    if mode is None:
+        return _select_provider_from_env()
+    inner = None if mode == "replay" else _select_provider_from_env()
+    return cast(LLMProvider, wrap_provider_from_env(inner))
+
+
+def _select_provider_from_env() -> LLMProvider:
     """Return a provider honoring local-first preference with graceful fallback.
 
     Updated behavior:
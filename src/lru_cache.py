@@ -0,0 +1,165 @@
+"""Bounded, thread-safe LRU caches with optional TTL (stdlib only).
+
+``LRUCache`` evicts the least recently used entry once ``max_size`` is reached
+and treats entries older than ``ttl`` seconds as missing. ``CoalescingCache``
+adds in-flight de-duplication: concurrent ``get_or_compute`` calls for the same
+key run the computation once and share its value.
+
+``max_size=0`` disables storage (every lookup misses) while coalescing still
+applies to calls that overlap in time.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+# Outcomes reported by CoalescingCache.get_or_compute
+HIT = "hit"
+MISS = "miss"
+COALESCED = "coalesced"
+
+
+class LRUCache(Generic[V]):
+    """Least-recently-used mapping with a size bound and per-entry expiry."""
+
+    def __init__(self, max_size: int = 128, ttl: Optional[float] = None) -> None:
+        self.max_size = max(0, int(max_size))
+        self.ttl = ttl if ttl and ttl > 0 else None
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or self._expired(entry[0], now):
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: V) -> None:
+        if self.max_size == 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry[0], now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class _InFlight(Generic[V]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Optional[V] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class CoalescingCache(LRUCache[V]):
+    """LRU cache whose misses are computed once even when requested concurrently."""
+
+    def __init__(self, max_size: int = 128, ttl: Optional[float] = None) -> None:
+        super().__init__(max_size, ttl)
+        self._inflight: Dict[Hashable, _InFlight[V]] = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V],
+                       cacheable: Callable[[V], bool] = lambda _v: True) -> Tuple[V, str]:
+        """Return ``(value, outcome)`` where outcome is ``hit``, ``miss`` or ``coalesced``.
+
+        The caller that starts the computation (the leader) stores the value when
+        ``cacheable(value)`` is true; callers arriving while it runs wait for the
+        leader and receive the same value (or the same exception).
+        """
+        with self._inflight_lock:
+            cached = self.get(key)
+            if cached is not None:
+                return cached, HIT
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._inflight[key] = _InFlight()
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, COALESCED  # type: ignore[return-value]
+
+        try:
+            value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            flight.value = value
+            if cacheable(value):
+                self.put(key, value)
+            return value, MISS
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def in_flight(self) -> int:
+        with self._inflight_lock:
+            return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        out = super().stats()
+        with self._inflight_lock:
+            out["in_flight"] = len(self._inflight)
+            out["coalesced"] = self.coalesced
+        return out
+
+
+__all__ = ["COALESCED", "CoalescingCache", "HIT", "LRUCache", "MISS"]
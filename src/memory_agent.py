@@ -2,6 +2,7 @@
 # Minimal Memory Agent for basic memory operations
 import sys
 import os
+import threading
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 from typing import Dict, Any, List, cast
 from src.base_agent import BaseAgent
@@ -16,6 +17,8 @@ class MemoryAgent(BaseAgent):
         super().__init__(name="memory")
         self.version = "minimal-1.0"
         self._store: Dict[str, Any] = {}
+        # Shared by every request thread; operations are short so one reentrant lock suffices
+        self._lock = threading.RLock()
     
     def run(self, input_data: Any) -> Dict[str, Any]:
         """
@@ -28,13 +31,17 @@ class MemoryAgent(BaseAgent):
         action = str(input_data.get("action", "")).lower()
 
         if action == "save":
-            return self._save_memory(input_data)
+            with self._lock:
+                return self._save_memory(input_data)
         elif action == "recall":
-            return self._recall_memory(input_data)
+            with self._lock:
+                return self._recall_memory(input_data)
         elif action == "list":
-            return self._list_memories(input_data)
+            with self._lock:
+                return self._list_memories(input_data)
         elif action == "clear":
-            return self._clear_memory(input_data)
+            with self._lock:
+                return self._clear_memory(input_data)
         else:
             return {
                 "error": f"Unknown action: {action}. Use: save, recall, list, clear",
@@ -148,14 +155,17 @@ class MemoryAgent(BaseAgent):
     # Convenience methods for direct access
     def save(self, key: str, value: Any) -> bool:
         """Direct save method."""
-        result = self._save_memory({"key": key, "value": value})
+        with self._lock:
+            result = self._save_memory({"key": key, "value": value})
         return result["success"]
     
     def recall(self, key: str) -> Any:
         """Direct recall method."""
-        result = self._recall_memory({"key": key})
+        with self._lock:
+            result = self._recall_memory({"key": key})
         return result.get("value") if result["success"] else None
     
     def exists(self, key: str) -> bool:
         """Check if key exists in memory."""
-        return key in self._store
\ No newline at end of file
+        with self._lock:
+            return key in self._store
\ No newline at end of file
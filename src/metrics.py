@@ -0,0 +1,320 @@
+"""Minimal in-process metrics registry (stdlib only).
+
+Counters, gauges and fixed-bucket histograms with labels, rendered in the
+Prometheus text exposition format (``/metrics``) or as a JSON snapshot with
+p50/p95/p99 estimates (``/metrics?format=json``).
+
+Quantiles are interpolated from histogram buckets, so they are accurate to the
+bucket resolution -- enough to spot per-agent / per-stage regressions under
+load without keeping every sample.
+
+Usage::
+
+    from src.metrics import histogram, timed
+    STAGE = histogram("orbitsuite_pipeline_stage_seconds", "Stage latency", ["stage"])
+    with timed(STAGE, stage="tester"):
+        ...
+"""
+from __future__ import annotations
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Pipeline stages range from milliseconds (parsing) to minutes (LLM + PyInstaller)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+QUANTILES: Tuple[float, ...] = (0.5, 0.95, 0.99)
+
+LabelValues = Tuple[str, ...]
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _label_str(self, key: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = [f'{n}="{_escape(v)}"' for n, v in zip(self.labelnames, key)]
+        if extra is not None:
+            pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def snapshot(self) -> List[Dict[str, Any]]:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+    def reset(self) -> None:  # pragma: no cover - overridden
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{self._label_str(k)} {_fmt(v)}" for k, v in items]
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [{"labels": dict(zip(self.labelnames, k)), "value": v} for k, v in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets)) + (math.inf,)
+        # per label set: [bucket counts (non-cumulative)..., sum, count]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        idx = len(self.buckets) - 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _quantile(self, series: List[float], q: float) -> Optional[float]:
+        total = series[-1]
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0.0
+        lower = 0.0
+        for i, bound in enumerate(self.buckets):
+            count = series[i]
+            if cumulative + count >= rank and count:
+                if bound == math.inf:
+                    return lower  # beyond the last finite bucket: report its bound
+                return lower + (bound - lower) * ((rank - cumulative) / count)
+            cumulative += count
+            lower = bound if bound != math.inf else lower
+        return lower
+
+    def quantile(self, q: float, **labels: Any) -> Optional[float]:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return None if series is None else self._quantile(list(series), q)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            return 0 if series is None else int(series[-1])
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = self._header()
+        for key, series in items:
+            cumulative = 0.0
+            for i, bound in enumerate(self.buckets):
+                cumulative += series[i]
+                lines.append(f"{self.name}_bucket{self._label_str(key, ('le', _fmt(bound)))} {_fmt(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {_fmt(series[-2])}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {_fmt(series[-1])}")
+        return lines
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        out: List[Dict[str, Any]] = []
+        for key, series in items:
+            count = series[-1]
+            entry: Dict[str, Any] = {
+                "labels": dict(zip(self.labelnames, key)),
+                "count": int(count),
+                "sum": round(series[-2], 6),
+                "mean": round(series[-2] / count, 6) if count else None,
+            }
+            for q in QUANTILES:
+                val = self._quantile(series, q)
+                entry[f"p{int(q * 100)}"] = None if val is None else round(val, 6)
+            out.append(entry)
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """Named metric collection; ``counter``/``gauge``/``histogram`` are get-or-create."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls: Any, name: str, help_text: str, labelnames: Sequence[str], **kw: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kw)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} already registered with a different type/labels")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        return {m.name: {"type": m.kind, "help": m.help, "series": m.snapshot()} for m in metrics}
+
+    def reset(self) -> None:
+        """Zero every series (tests / benchmark runs); registrations are kept."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.counter(name, help_text, labelnames)
+
+
+def gauge(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.gauge(name, help_text, labelnames)
+
+
+def histogram(name: str, help_text: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.histogram(name, help_text, labelnames, buckets)
+
+
+@contextmanager
+def timed(metric: Histogram, **labels: Any) -> Iterator[None]:
+    """Observe the wall time of the ``with`` block (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metric.observe(time.perf_counter() - start, **labels)
+
+
+# --- Shared pipeline metrics (one definition, fed from several modules) ---
+AGENT_SECONDS = histogram("orbitsuite_agent_dispatch_seconds", "BaseAgent.dispatch latency", ["agent"])
+AGENT_CALLS = counter("orbitsuite_agent_dispatch_total", "BaseAgent.dispatch calls", ["agent", "outcome"])
+STAGE_SECONDS = histogram("orbitsuite_pipeline_stage_seconds", "Orchestrator pipeline stage latency", ["stage"])
+LLM_SECONDS = histogram("orbitsuite_llm_request_seconds", "LLM provider generate() latency", ["provider"])
+LLM_CALLS = counter("orbitsuite_llm_requests_total", "LLM provider generate() calls", ["provider", "outcome"])
+HTTP_SECONDS = histogram("orbitsuite_http_request_seconds", "HTTP request latency", ["server", "method", "path"])
+HTTP_REQUESTS = counter("orbitsuite_http_requests_total", "HTTP requests", ["server", "method", "path", "status"])
+
+
+def stage_timer(stage: str) -> ContextManager[None]:
+    """``with stage_timer("tester"):`` - observe one orchestrator stage."""
+    return timed(STAGE_SECONDS, stage=stage)
+
+
+__all__ = [
+    "AGENT_CALLS",
+    "AGENT_SECONDS",
+    "Counter",
+    "DEFAULT_BUCKETS",
+    "Gauge",
+    "HTTP_REQUESTS",
+    "HTTP_SECONDS",
+    "Histogram",
+    "LLM_CALLS",
+    "LLM_SECONDS",
+    "MetricsRegistry",
+    "PROMETHEUS_CONTENT_TYPE",
+    "REGISTRY",
+    "STAGE_SECONDS",
+    "counter",
+    "gauge",
+    "histogram",
+    "stage_timer",
+    "timed",
+]
@@ -16,6 +16,7 @@ class StepExecution(TypedDict, total=False):
     status: StepStatus
     output: str
     agent_result: Dict[str, Any]
+    cache: Dict[str, Any]
 
 class PipelineArtifacts(TypedDict, total=False):
     codegen_artifact: str
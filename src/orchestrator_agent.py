@@ -2,8 +2,10 @@
 # Enhanced Orchestrator Agent with real agent execution and engineer->codegen pre-step
 import sys
 import os
+import threading
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 from typing import (
+    Callable,
     Dict,
     Any,
     List,
@@ -22,8 +24,11 @@ except Exception:  # pragma: no cover
     StepStatus = type('StepStatus', (), {'COMPLETED': 'completed', 'FAILED': 'failed', 'SKIPPED': 'skipped'})  # type: ignore
     unwrap_legacy_agent_output = lambda x: x  # type: ignore
 
+from src.artifact_writer import MemoryArtifacts, WriteStats, get_writer, in_memory
 from src.base_agent import BaseAgent
 from src.utils import is_verbose  # lightweight verbosity helper
+from src.metrics import STAGE_SECONDS, stage_timer
+from src.run_context import current_context, use_context
 
 
 class Task(TypedDict, total=False):
@@ -43,6 +48,7 @@ class StepExecution(TypedDict, total=False):
     status: Literal["completed", "failed", "skipped"]
     output: str
     agent_result: Dict[str, Any]
+    cache: Dict[str, Any]
 
 
 class ExecutionPlan(TypedDict):
@@ -90,6 +96,7 @@ class SingleTaskExecutionResult(TypedDict, total=False):
     agent_used: str
     execution_plan: ExecutionPlan
     result: PlanExecutionResult
+    artifact_io: Dict[str, Any]  # files / bytes / latency of this task's artifact writes
 
 
 class BatchExecutionResult(TypedDict, total=False):
@@ -117,16 +124,26 @@ class OrchestratorAgent(BaseAgent):
         self.version = "enhanced-1.1"
         self.agents: Dict[str, BaseAgent] = {}
         self.task_queue: List[Dict[str, Any]] = []
+        self._queue_lock = threading.Lock()
 
     def run(self, input_data: Dict[str, Any]) -> OrchestratorReturn:  # public surface kept broad
         if not input_data:
             return {"success": False, "error": "Task input required"}
-        # Optional streaming callback: caller may pass a callable under '_progress_cb'
-        self._progress_cb = input_data.get('_progress_cb') if isinstance(input_data, dict) else None  # type: ignore[attr-defined]
+        # Optional streaming callback: caller may pass a callable under '_progress_cb'.
+        # It is request-scoped, so it travels in the run context rather than on self.
+        progress_cb = input_data.get('_progress_cb') if isinstance(input_data, dict) else None
+        if progress_cb is not None:
+            with use_context(progress_cb=progress_cb):
+                return self._run_input(input_data)
+        return self._run_input(input_data)
+
+    def _run_input(self, input_data: Dict[str, Any]) -> OrchestratorReturn:
         tasks_data = cast(List[Dict[str, Any]], input_data.get("tasks", []))
         if tasks_data:
             tasks = [self._convert_to_task(t) for t in tasks_data]
-            return cast(OrchestratorReturn, self._execute_task_batch(tasks))
+            # Checkpointed workflows pass results restored from a journal and a per-task completion hook
+            return cast(OrchestratorReturn, self._execute_task_batch(
+                tasks, completed=input_data.get("_completed"), on_result=input_data.get("_on_task_done")))
         task_data = cast(Dict[str, Any], input_data.get("task", {}))
         if task_data:
             return cast(OrchestratorReturn, self._execute_single_task(self._convert_to_task(task_data)))
@@ -134,25 +151,54 @@ class OrchestratorAgent(BaseAgent):
 
     # --- Core Execution Paths ---
     def _execute_single_task(self, task: Task) -> SingleTaskExecutionResult:
-        task_id = task.get("task_id", f"task_{len(self.task_queue)}")
-        description = task.get("description", "")
-        agent_target = task.get("agent_target", self._determine_agent_for_task(task))
-        
-        # Create task directory early so engineer agent can use it
+        # Artifact writes run behind the pipeline; the task settles its own before returning.
+        # With persist=none/final they go to an in-memory store returned in the result instead.
+        persist = current_context().persist
+        store = MemoryArtifacts() if persist != "all" else None
+        stats = WriteStats()
+        with use_context(artifact_stats=stats, artifact_store=store):
+            result = self._run_single_task(task)
+        writer = get_writer()
+        if store is not None:
+            from pathlib import Path as _P
+            files = store.files(relative_to=_P.cwd() / 'output')
+            result["persist"] = persist
+            result["artifacts"] = files
+            if persist == "final":
+                bundle = self._task_dir(task.get("description", "")) / 'final' / 'bundle.json'
+                with use_context(artifact_stats=stats):
+                    result["bundle_path"] = writer.write_json(bundle, {
+                        "task_id": result.get("task_id"),
+                        "description": task.get("description"),
+                        "files": files,
+                    })
+        writer.settle(stats)
+        result["artifact_io"] = stats.as_dict()
+        return result
+
+    @staticmethod
+    def _task_dir(description: str) -> Any:
         import hashlib
         from pathlib import Path as _P
         slug_words = [w for w in description.lower().replace(",", " ").replace(".", " ").split() if w.isalnum()][:8]
         slug_base = "-".join(slug_words) if slug_words else "general-task"
         h = hashlib.sha1(description.encode()).hexdigest()[:8]
-        task_slug = f"{slug_base}_{h}"[:56]
-        task_dir = _P.cwd() / 'output' / task_slug
-        task_dir.mkdir(parents=True, exist_ok=True)
-        (task_dir / 'engineering').mkdir(exist_ok=True)
-        (task_dir / 'codegen').mkdir(exist_ok=True)
-        (task_dir / 'final').mkdir(exist_ok=True)
-        (task_dir / 'tests').mkdir(exist_ok=True)
-        (task_dir / 'patches').mkdir(exist_ok=True)
-        (task_dir / 'tmpdist').mkdir(exist_ok=True)
+        return _P.cwd() / 'output' / f"{slug_base}_{h}"[:56]
+
+    def _run_single_task(self, task: Task) -> SingleTaskExecutionResult:
+        import time as _time
+        started = _time.perf_counter()
+        with self._queue_lock:
+            task_id = task.get("task_id", f"task_{len(self.task_queue)}")
+        description = task.get("description", "")
+        agent_target = task.get("agent_target", self._determine_agent_for_task(task))
+        
+        # Create task directory early so engineer agent can use it (not for in-memory runs)
+        task_dir = self._task_dir(description)
+        if not in_memory():
+            task_dir.mkdir(parents=True, exist_ok=True)
+            for sub in ('engineering', 'codegen', 'final', 'tests', 'patches', 'tmpdist'):
+                (task_dir / sub).mkdir(exist_ok=True)
         
         # Promote generic tasks to a full pipeline: engineer -> codegen -> tester -> patcher
         is_generic = agent_target == "unassigned" or task.get("type", "").lower() in ("general", "")
@@ -170,7 +216,8 @@ class OrchestratorAgent(BaseAgent):
                         "project_type": "web_application",
                         "output_dir": str(task_dir)
                     }
-                    engineer_result = engineer_agent.dispatch(eng_payload)  # type: ignore[arg-type]
+                    with stage_timer("engineer_analysis"):
+                        engineer_result = engineer_agent.dispatch(eng_payload)  # type: ignore[arg-type]
                     # If agent returned a coroutine (async run), resolve it
                     import asyncio
                     if hasattr(engineer_result, '__await__'):
@@ -178,13 +225,14 @@ class OrchestratorAgent(BaseAgent):
                     # Attempt file plan generation if analysis succeeded
                     if engineer_result is not None and isinstance(engineer_result, dict) and cast(Dict[str, Any], engineer_result).get("success"):
                         try:
-                            plan_res = engineer_agent.dispatch({
-                                "command": "plan_files",
-                                "description": description,
-                                "analysis": cast(Dict[str, Any], engineer_result).get("core_analysis", {}),
-                                "project_type": "web_application",
-                                "output_dir": str(task_dir)
-                            })
+                            with stage_timer("engineer_plan_files"):
+                                plan_res = engineer_agent.dispatch({
+                                    "command": "plan_files",
+                                    "description": description,
+                                    "analysis": cast(Dict[str, Any], engineer_result).get("core_analysis", {}),
+                                    "project_type": "web_application",
+                                    "output_dir": str(task_dir)
+                                })
                             if hasattr(plan_res, '__await__'):
                                 import asyncio as _a
                                 plan_res = _a.run(plan_res)  # type: ignore[assignment]
@@ -199,6 +247,13 @@ class OrchestratorAgent(BaseAgent):
                         "status": "completed" if engineer_result is not None and isinstance(engineer_result, dict) and cast(Dict[str, Any], engineer_result).get("success") else "failed",
                         "output": cast(Dict[str, Any], engineer_result).get("artifact_dir") if engineer_result is not None and isinstance(engineer_result, dict) else "analysis_skipped",
                     })
+                    if isinstance(engineer_result, dict) and "cache" in engineer_result:
+                        eng = cast(Dict[str, Any], engineer_result)
+                        pre_steps[-1]["cache"] = {
+                            "analysis": eng["cache"],
+                            "file_plan": cast(Dict[str, Any], eng.get("file_plan") or {}).get("cache"),
+                            "artifacts": eng.get("artifacts", "written"),
+                        }
                 except Exception as e:  # pragma: no cover
                     pre_steps.append({
                         "step": 0,
@@ -214,6 +269,7 @@ class OrchestratorAgent(BaseAgent):
         engineer_result = cast(Optional[Dict[str, Any]], engineer_result)
         # Execute full plan (engineer pre-step + main pipeline)
         exec_result = self._execute_plan(plan, task, engineer_result)
+        STAGE_SECONDS.observe(_time.perf_counter() - started, stage="pipeline_total")
         return cast(SingleTaskExecutionResult, {
             "success": True,
             "task_id": task_id,
@@ -222,13 +278,26 @@ class OrchestratorAgent(BaseAgent):
             "result": exec_result,
         })
 
-    def _execute_task_batch(self, tasks: List[Task]) -> BatchExecutionResult:
-        results: List[SingleTaskExecutionResult] = []
-        for i, t in enumerate(tasks):
-            r = self._execute_single_task(t)
+    def _execute_task_batch(
+        self,
+        tasks: List[Task],
+        completed: Optional[Dict[int, SingleTaskExecutionResult]] = None,
+        on_result: Optional[Callable[[int, SingleTaskExecutionResult], None]] = None,
+    ) -> BatchExecutionResult:
+        # Tasks run in order: later tasks may consume earlier outputs (see _analyze_dependencies)
+        # and tasks with the same description share a _task_dir.
+        # ``completed`` holds results of tasks finished by an earlier run; only the rest execute.
+        ordered: Dict[int, SingleTaskExecutionResult] = dict(completed or {})
+        for i, task in enumerate(tasks):
+            if i in ordered:
+                continue
+            r = self._execute_single_task(task)
             # augment with non-schema key for diagnostics (not part of TypedDict contract)
             cast(Dict[str, Any], r)["batch_index"] = i  # type: ignore[index]
-            results.append(r)
+            if on_result is not None:
+                on_result(i, r)
+            ordered[i] = r
+        results: List[SingleTaskExecutionResult] = [ordered[i] for i in range(len(tasks))]
         success_count = sum(1 for r in results if r.get("success"))
         return cast(BatchExecutionResult, {
             "success": success_count == len(results),
@@ -276,7 +345,8 @@ class OrchestratorAgent(BaseAgent):
         if final_output and ("code" in final_output or pipeline_artifacts.get('generated_files')):
             self._run_quality_and_patch_chain(task, executed, pipeline_artifacts, final_output)
         if pipeline_artifacts.get('generated_files'):
-            self._generate_traceability(task, pipeline_artifacts)
+            with stage_timer("traceability"):
+                self._generate_traceability(task, pipeline_artifacts)
         return cast(PlanExecutionResult, {
             "plan_executed": True,
             "steps_completed": len([x for x in executed if x.get("status") == "completed"]),
@@ -303,6 +373,8 @@ class OrchestratorAgent(BaseAgent):
                 "status": "completed",
                 "output": f"Step {step.get('step')} executed successfully",
             }
+            if "cache" in step:
+                record["cache"] = step["cache"]
             self._emit_progress('step_start', record)
             if record["action"] == "execute_agent":
                 agent_name = step.get("agent", "unassigned")
@@ -312,7 +384,8 @@ class OrchestratorAgent(BaseAgent):
                     record["output"] = "No agent assigned (Core has no fallback)"
                 else:
                     try:
-                        final_output = self._execute_primary_agent(agent_name, task, engineer_result, record, artifacts)
+                        with stage_timer("primary_agent"):
+                            final_output = self._execute_primary_agent(agent_name, task, engineer_result, record, artifacts)
                     except Exception as e:  # pragma: no cover
                         failures += 1
                         record["status"] = "failed"
@@ -370,7 +443,7 @@ class OrchestratorAgent(BaseAgent):
     def _execute_file_plan(self, agent_name: str, task: Task, file_plan: List[Dict[str, Any]], record: StepExecution, artifacts: PipelineArtifacts) -> Dict[str, Any]:
         from pathlib import Path as _P
         
-        # Use existing task directory structure (created in _execute_single_task)
+        # Use existing task directory structure (created in _run_single_task)
         desc = task.get('description', '') or 'task'
         words = [w for w in desc.lower().split() if w.isalnum()][:6]
         slug_base = '-'.join(words) if words else 'task'
@@ -378,7 +451,7 @@ class OrchestratorAgent(BaseAgent):
         h = hashlib.sha1(desc.encode()).hexdigest()[:8]
         task_slug = f"{slug_base}_{h}"[:56]
         
-        # Task directory should already exist from _execute_single_task
+        # Task directory should already exist from _run_single_task
         task_dir = _P.cwd() / 'output' / task_slug
         base_codegen_dir = task_dir / 'codegen'
         
@@ -403,9 +476,9 @@ class OrchestratorAgent(BaseAgent):
                 if isinstance(artifact_val, str):
                     src_file = _P(artifact_val)
                     target = base_codegen_dir / rel_path
-                    target.parent.mkdir(parents=True, exist_ok=True)
                     try:
-                        target.write_text(src_file.read_text(encoding='utf-8'), encoding='utf-8')
+                        if src_file.absolute() != target.absolute():
+                            get_writer().write_text(target, get_writer().read_text(src_file), sync=True)
                         generated_files.append(str(target))
                     except Exception:  # pragma: no cover
                         pass
@@ -444,8 +517,8 @@ class OrchestratorAgent(BaseAgent):
             import pathlib
             for fp in artifacts.get('generated_files', [])[:10]:
                 p = pathlib.Path(fp)
-                if p.exists() and p.suffix in ('.py', '.js', '.ts'):
-                    txt = p.read_text(encoding='utf-8')
+                if get_writer().exists(p) and p.suffix in ('.py', '.js', '.ts'):
+                    txt = get_writer().read_text(p)
                     aggregated_parts.append(f"# FILE: {p.name}\n" + txt[:4000])
             if aggregated_parts:
                 combined = "\n\n".join(aggregated_parts)
@@ -459,11 +532,12 @@ class OrchestratorAgent(BaseAgent):
         tester = self.agents.get("tester")
         if tester and code_text:
             try:
-                test_res = tester.dispatch({
-                    "type": "syntax_check", 
-                    "target": code_text,
-                    "output_dir": task_dir
-                })
+                with stage_timer("tester"):
+                    test_res = tester.dispatch({
+                        "type": "syntax_check", 
+                        "target": code_text,
+                        "output_dir": task_dir
+                    })
                 executed.append({
                     "step": next_idx,
                     "action": "tester_validation",
@@ -490,12 +564,13 @@ class OrchestratorAgent(BaseAgent):
         if not (patcher and code_text):
             return
         try:
-            patch_res = patcher.dispatch({
-                "type": "auto", 
-                "code": code_text, 
-                "issues": [],
-                "output_dir": task_dir
-            })
+            with stage_timer("patcher"):
+                patch_res = patcher.dispatch({
+                    "type": "auto", 
+                    "code": code_text, 
+                    "issues": [],
+                    "output_dir": task_dir
+                })
             executed.append({
                 "step": next_idx,
                 "action": "patcher_auto",
@@ -506,8 +581,9 @@ class OrchestratorAgent(BaseAgent):
             })
             if patch_res.get("artifact_path"):
                 artifacts.setdefault("patcher_artifact", str(patch_res["artifact_path"]))
-            self._persist_patched_code(code_text, patch_res, artifacts)
-            self._write_final_payload(task, artifacts)
+            with stage_timer("finalize"):
+                self._persist_patched_code(code_text, patch_res, artifacts)
+                self._write_final_payload(task, artifacts)
         except Exception as e:  # pragma: no cover
             executed.append({
                 "step": next_idx,
@@ -525,25 +601,19 @@ class OrchestratorAgent(BaseAgent):
             if not gen_path:
                 return
             gp = _P(gen_path)
-            if gp.exists():
-                original_text = None
+            original_text = None
+            if get_writer().exists(gp):
                 try:
-                    with gp.open('r', encoding='utf-8') as _rf:
-                        original_text = _rf.read()
+                    original_text = get_writer().read_text(gp)
                 except Exception:
                     pass
-                if original_text != patched_code:
-                    with gp.open('w', encoding='utf-8') as _wf:
-                        _wf.write(patched_code)
-            else:
-                with gp.open('w', encoding='utf-8') as _wf:
-                    _wf.write(patched_code)
+            if original_text != patched_code:
+                get_writer().write_text(gp, patched_code, sync=True)
         except Exception:  # pragma: no cover
             pass
 
     def _write_final_payload(self, task: Task, artifacts: PipelineArtifacts) -> Dict[str, Any]:
         from pathlib import Path as _P
-        import json as _json
         from datetime import datetime as _datetime
         
         # Use the task directory already created in _execute_file_plan
@@ -557,10 +627,8 @@ class OrchestratorAgent(BaseAgent):
             h = hashlib.sha1(desc.encode()).hexdigest()[:8]
             task_slug = f"{slug_base}_{h}"[:56]
             task_dir = _P.cwd() / 'output' / task_slug
-            task_dir.mkdir(parents=True, exist_ok=True)
         
-        final_dir = task_dir / 'final'
-        final_dir.mkdir(exist_ok=True)
+        final_dir = task_dir / 'final'  # created by the writer
         
         # Convert all paths to relative paths from the task directory
         relative_artifacts = {}
@@ -590,7 +658,7 @@ class OrchestratorAgent(BaseAgent):
         
         payload_file = final_dir / 'task_payload.json'
         try:
-            payload_file.write_text(_json.dumps(payload_data, indent=2), encoding='utf-8')
+            get_writer().write_json(payload_file, payload_data)
             return {'payload_file': str(payload_file), 'task_directory': str(task_dir)}
         except Exception:  # pragma: no cover
             return {'error': 'payload_write_failed'}
@@ -729,12 +797,11 @@ class OrchestratorAgent(BaseAgent):
                 task_dir = _P.cwd() / 'output' / task_slug
                 
             trace_dir = task_dir / 'final'
-            trace_dir.mkdir(parents=True, exist_ok=True)
             requirements: List[Dict[str, str]] = []
             spec_path = artifacts.get('spec_path')
-            if spec_path and _P(spec_path).exists():
+            if spec_path and get_writer().exists(spec_path):
                 try:
-                    spec_json_raw: Any = _json.loads(_P(spec_path).read_text(encoding='utf-8'))
+                    spec_json_raw: Any = _json.loads(get_writer().read_text(spec_path))
                     if isinstance(spec_json_raw, dict):
                         spec_json = cast(Dict[str, Any], spec_json_raw)
                         spec_section_val = spec_json.get('spec')
@@ -774,15 +841,16 @@ class OrchestratorAgent(BaseAgent):
                 'generated_files': artifacts.get('generated_files', []),
             }
             trace_path = trace_dir / 'traceability.json'
-            trace_path.write_text(_json.dumps(combined, indent=2), encoding='utf-8')
+            get_writer().write_json(trace_path, combined)
             artifacts.setdefault('traceability_path', str(trace_path))
         except Exception:  # pragma: no cover
             pass
 
     def _emit_progress(self, event: str, record: StepExecution) -> None:
         try:
-            if getattr(self, '_progress_cb', None):  # type: ignore[attr-defined]
-                getattr(self, '_progress_cb')({  # type: ignore[attr-defined]
+            progress_cb = current_context().progress_cb
+            if progress_cb is not None:
+                progress_cb({
                     'event': event,
                     'step': record.get('step'),
                     'action': record.get('action'),
@@ -818,14 +886,16 @@ class OrchestratorAgent(BaseAgent):
 
     # --- Workflows & Dependencies ---
     def create_workflow(self, tasks: List[Task]) -> Dict[str, Any]:
-        workflow: Dict[str, Any] = {
-            "workflow_id": f"workflow_{len(self.task_queue)}",
-            "tasks": tasks,
-            "total_tasks": len(tasks),
-            "status": "created",
-            "dependencies": self._analyze_dependencies(tasks),
-        }
-        self.task_queue.append(workflow)
+        dependencies = self._analyze_dependencies(tasks)
+        with self._queue_lock:
+            workflow: Dict[str, Any] = {
+                "workflow_id": f"workflow_{len(self.task_queue)}",
+                "tasks": tasks,
+                "total_tasks": len(tasks),
+                "status": "created",
+                "dependencies": dependencies,
+            }
+            self.task_queue.append(workflow)
         return workflow
 
     def _analyze_dependencies(self, tasks: List[Task]) -> List[Dependency]:
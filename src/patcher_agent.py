@@ -5,6 +5,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 import re
 from typing import Dict, Any, List, Union
+from src.artifact_writer import get_writer
 from src.base_agent import BaseAgent
 
 
@@ -47,18 +48,14 @@ class PatcherAgent(BaseAgent):
         # Write artifact summary (best-effort)
         try:
             from pathlib import Path
-            import json, time
             if output_dir:
                 # Use task-specific directory
                 out_dir = Path(output_dir) / "patches"
             else:
                 # Fall back to default behavior
                 out_dir = Path.cwd() / "output" / "patches"
-            out_dir.mkdir(parents=True, exist_ok=True)
-            stem = f"patch_{int(time.time())}"
-            with open(out_dir / f"{stem}.json", "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2)
-            result["artifact_path"] = str(out_dir / f"{stem}.json")
+            writer = get_writer()
+            result["artifact_path"] = writer.write_json(writer.unique_path(out_dir, "patch"), result)
         except Exception:
             pass
         return result
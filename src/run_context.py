@@ -0,0 +1,61 @@
+"""Per-request execution context for agents.
+
+Agents are shared between concurrent requests (one Supervisor serves every
+HTTP thread), so anything that belongs to a single request -- the streaming
+progress callback, the conversation session, an output-directory override --
+lives in a ``RunContext`` carried by a ``ContextVar`` instead of on ``self``.
+
+    with use_context(progress_cb=cb):
+        orchestrator.dispatch(task)        # _emit_progress reads current_context()
+
+ContextVars are per thread (and per asyncio task), so overlapping requests
+never see each other's state. Work handed to another thread must capture the
+context explicitly (``contextvars.copy_context().run``) if it needs it.
+"""
+from __future__ import annotations
+
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, Optional
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Immutable request-scoped state; derive variants with ``use_context(**overrides)``."""
+
+    request_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    progress_cb: Optional[ProgressCallback] = None
+    session_id: str = "default"
+    engineering_root: Optional[str] = None
+    artifact_stats: Optional[Any] = None  # artifact_writer.WriteStats counting this task's writes
+    artifact_store: Optional[Any] = None  # artifact_writer.MemoryArtifacts replacing disk (persist=none/final)
+    persist: str = "all"  # all | final | none, see artifact_writer
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+
+_DEFAULT = RunContext(request_id="default")
+_CURRENT: ContextVar[RunContext] = ContextVar("orbitsuite_run_context", default=_DEFAULT)
+
+
+def current_context() -> RunContext:
+    """Context of the running request (a shared empty default outside any request)."""
+    return _CURRENT.get()
+
+
+@contextmanager
+def use_context(ctx: Optional[RunContext] = None, **overrides: Any) -> Iterator[RunContext]:
+    """Activate ``ctx`` (or the current context with ``overrides`` applied) for the block."""
+    base = ctx if ctx is not None else _CURRENT.get()
+    active = replace(base, **overrides) if overrides else base
+    token = _CURRENT.set(active)
+    try:
+        yield active
+    finally:
+        _CURRENT.reset(token)
+
+
+__all__ = ["ProgressCallback", "RunContext", "current_context", "use_context"]
@@ -0,0 +1,262 @@
+"""HTTP/1.1 persistent connections for the Core HTTP servers (stdlib only).
+
+``KeepAliveHandlerMixin`` switches a handler to HTTP/1.1 so clients (the UI's
+job polling in particular) reuse one TCP connection for many requests,
+including pipelined ones, and adds chunked streaming helpers
+(``start_chunked`` / ``write_chunk`` / ``end_chunked``, ``stream_ndjson``,
+``stream_sse``).
+
+Idle connections must not pin worker threads, so keep-alive is bounded:
+
+* a connection idle for ``ORBITSUITE_HTTP_KEEPALIVE_TIMEOUT`` seconds is closed;
+* after ``ORBITSUITE_HTTP_KEEPALIVE_MAX`` requests the response says ``Connection: close``;
+* the server may refuse keep-alive under pressure (``keepalive_allowed``), e.g.
+  while other connections wait for a worker or no spare worker is left;
+* ``ConnectionLimitMixin`` caps open connections at
+  ``ORBITSUITE_HTTP_MAX_CONNECTIONS``; extra connections get an immediate 503.
+
+Servers that route requests to lanes (``PooledHTTPServer``) can expose
+``lane_for_request_line`` / ``current_lane``: before each follow-up request on a
+persistent connection the handler peeks at the request line and, when it
+belongs to another lane, hands the connection over instead of serving it on the
+wrong pool.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Mapping, Optional
+
+try:
+    from .http_utils import FieldSpec, encode_json, parse_fields, project
+except ImportError:  # pragma: no cover - script execution
+    from http_utils import FieldSpec, encode_json, parse_fields, project  # type: ignore
+
+if TYPE_CHECKING:
+    from http.server import BaseHTTPRequestHandler as _HandlerBase
+    from socketserver import TCPServer as _ServerBase
+else:
+    _HandlerBase = object
+    _ServerBase = object
+
+_PEEK_BYTES = 512
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, "").strip())
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def keepalive_timeout() -> float:
+    return _env_float("ORBITSUITE_HTTP_KEEPALIVE_TIMEOUT", 5.0)
+
+
+def keepalive_max_requests() -> int:
+    return int(_env_float("ORBITSUITE_HTTP_KEEPALIVE_MAX", 100))
+
+
+def default_max_connections() -> int:
+    return int(_env_float("ORBITSUITE_HTTP_MAX_CONNECTIONS", 256))
+
+
+class KeepAliveHandlerMixin(_HandlerBase):
+    """Mix in before ``BaseHTTPRequestHandler`` for bounded HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    timeout: Optional[float] = keepalive_timeout()  # socket timeout == idle limit between requests
+    max_keepalive_requests = keepalive_max_requests()
+
+    _requests_served = 0
+    _chunked = False
+    handoff_lane: Optional[str] = None
+
+    # --- connection lifecycle ---
+    def handle(self) -> None:
+        self.handoff_lane = None
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            if self._handoff_needed():
+                return
+            self.handle_one_request()
+
+    def resume(self) -> None:
+        """Continue a handed-over connection on the current worker thread."""
+        try:
+            self.handle()
+        finally:
+            self.finish()
+
+    def finish(self) -> None:
+        if self.handoff_lane is not None:
+            return  # connection continues on another lane; keep rfile/wfile open
+        super().finish()
+
+    def _handoff_needed(self) -> bool:
+        router = getattr(self.server, "lane_for_request_line", None)
+        if router is None:
+            return False
+        try:
+            head = self.rfile.peek(_PEEK_BYTES)  # type: ignore[attr-defined]
+        except (socket.timeout, OSError, ValueError):
+            self.close_connection = True
+            return True
+        if not head:
+            self.close_connection = True
+            return True
+        lane = router(head.split(b"\r\n", 1)[0])
+        if lane != self.server.current_lane():  # type: ignore[attr-defined]
+            self.handoff_lane = lane
+            return True
+        return False
+
+    # --- response headers ---
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        super().send_response(code, message)
+        self._requests_served += 1
+        if self.request_version != "HTTP/1.1" or self.close_connection:
+            return
+        allowed = getattr(self.server, "keepalive_allowed", None)
+        if self._requests_served >= self.max_keepalive_requests or (allowed is not None and not allowed()):
+            self.send_header("Connection", "close")  # also sets close_connection
+
+    # --- chunked streaming ---
+    def start_chunked(self, status: int, content_type: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Begin a streamed body: chunked for HTTP/1.1, close-delimited for HTTP/1.0."""
+        self._chunked = self.request_version == "HTTP/1.1"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if self._chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Connection", "close")
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+
+    def write_chunk(self, data: bytes) -> None:
+        if not data:
+            return  # an empty chunk would terminate the body
+        if self._chunked:
+            self.wfile.write(b"%X\r\n%s\r\n" % (len(data), data))
+        else:
+            self.wfile.write(data)
+        self.wfile.flush()
+
+    def end_chunked(self) -> None:
+        if self._chunked:
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            self._chunked = False
+
+    def stream_sse(self, subscription: Any, heartbeat: float = SSE_HEARTBEAT_SECONDS) -> None:
+        """Relay an event-bus subscription as Server-Sent Events until its topic ends.
+
+        Only this handler's thread waits on the client; publishers never do. A
+        comment line is sent after ``heartbeat`` idle seconds to keep proxies open.
+        """
+        self.start_chunked(200, "text/event-stream", {"Cache-Control": "no-cache"})
+        try:
+            for event in subscription.events(heartbeat):
+                if event is None:
+                    self.write_chunk(b": keep-alive\n\n")
+                    continue
+                payload = json.dumps(event.get("data"), default=str)
+                self.write_chunk(f"id: {event.get('seq')}\nevent: {event.get('type')}\ndata: {payload}\n\n".encode())
+            self.end_chunked()
+        except OSError:
+            self.close_connection = True
+        finally:
+            subscription.close()
+
+    def stream_ndjson(self, records: Iterator[Dict[str, Any]], fields: FieldSpec = None) -> None:
+        """Stream one JSON line per record, then a ``{"done": true, ...}`` summary line.
+
+        ``fields`` projects each record. If the client disconnects, ``records`` is
+        closed so a generator-backed batch stops scheduling new work.
+        """
+        wanted = parse_fields(fields)
+        started = time.time()
+        total = succeeded = 0
+        self.start_chunked(200, "application/x-ndjson", {"Cache-Control": "no-cache"})
+        try:
+            for record in records:
+                total += 1
+                succeeded += bool(record.get("success"))
+                self.write_chunk(encode_json(project(record, wanted)) + b"\n")
+            self.write_chunk(encode_json({
+                "done": True,
+                "total": total,
+                "succeeded": succeeded,
+                "failed": total - succeeded,
+                "elapsed": round(time.time() - started, 3),
+            }) + b"\n")
+            self.end_chunked()
+        except OSError:
+            self.close_connection = True
+        finally:
+            close = getattr(records, "close", None)
+            if close is not None:
+                close()
+
+
+class ConnectionLimitMixin(_ServerBase):
+    """Mix in before a socketserver class to cap concurrently open connections."""
+
+    def __init__(self, *args: Any, max_connections: Optional[int] = None, **kwargs: Any) -> None:
+        self.max_connections = max(1, max_connections or default_max_connections())
+        self.open_connections = 0
+        self._conn_lock = threading.Lock()
+        super().__init__(*args, **kwargs)
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        with self._conn_lock:
+            full = self.open_connections >= self.max_connections
+            self.open_connections += 1
+        if full:
+            self._reject_connection(request)
+            self.shutdown_request(request)
+            return
+        super().process_request(request, client_address)
+
+    def shutdown_request(self, request: Any) -> None:
+        with self._conn_lock:
+            self.open_connections = max(0, self.open_connections - 1)
+        super().shutdown_request(request)
+
+    def _reject_connection(self, request: Any) -> None:
+        body = b'{"error":"Too many connections"}'
+        try:
+            request.sendall(
+                b"HTTP/1.1 503 Service Unavailable\r\nContent-Type: application/json\r\n"
+                b"Retry-After: 1\r\nConnection: close\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            )
+        except OSError:
+            pass
+
+    def keepalive_allowed(self) -> bool:
+        """Stop holding idle connections once the budget is used up (new clients get 503)."""
+        with self._conn_lock:
+            return self.open_connections < self.max_connections
+
+
+class BoundedThreadingHTTPServer(ConnectionLimitMixin, ThreadingHTTPServer):
+    """``ThreadingHTTPServer`` with a cap on open (and therefore idle keep-alive) connections."""
+
+
+__all__ = [
+    "BoundedThreadingHTTPServer",
+    "ConnectionLimitMixin",
+    "KeepAliveHandlerMixin",
+    "default_max_connections",
+    "keepalive_max_requests",
+    "keepalive_timeout",
+]
@@ -0,0 +1,83 @@
+"""HTTP instrumentation shared by main.py api_mode and src/server/serve.py.
+
+``MetricsHandlerMixin`` records per-request latency (from the parsed request
+line, so keep-alive idle time is excluded) and status into the
+process-wide registry (``src.metrics``); ``metrics_payload`` renders the
+``/metrics`` endpoint body (Prometheus text, or JSON with ``?format=json``).
+"""
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, FrozenSet, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from src.metrics import HTTP_REQUESTS, HTTP_SECONDS, PROMETHEUS_CONTENT_TYPE, REGISTRY
+
+_JOB_SUBPATHS = frozenset({"/events"})
+_METHODS = frozenset({"GET", "HEAD", "POST", "DELETE", "OPTIONS"})
+
+
+def normalize_path(path: str, routes: FrozenSet[str]) -> str:
+    """Collapse paths into a bounded label set (ids templated, unknown paths -> 'other')."""
+    clean = urlsplit(path or "").path.rstrip("/") or "/"
+    if clean.startswith("/jobs/"):
+        rest = clean[len("/jobs/"):].split("/", 1)
+        if len(rest) == 1:
+            return "/jobs/{id}"
+        sub = "/" + rest[1]
+        return "/jobs/{id}" + (sub if sub in _JOB_SUBPATHS else "/other")
+    for prefix in ("/webhooks/", "/autosync/"):
+        if clean.startswith(prefix):
+            return prefix + "*"
+    return clean if clean in routes else "other"
+
+
+def normalize_method(method: str) -> str:
+    """Keep the method label bounded: unknown verbs -> 'other'."""
+    return method if method in _METHODS else "other"
+
+
+def metrics_payload(path: str) -> Tuple[str, bytes]:
+    """Return (content_type, body) for a ``/metrics`` request."""
+    query = parse_qs(urlsplit(path or "").query)
+    if (query.get("format") or [""])[0].lower() == "json":
+        return "application/json", json.dumps(REGISTRY.snapshot(), default=str).encode("utf-8")
+    return PROMETHEUS_CONTENT_TYPE, REGISTRY.render_prometheus().encode("utf-8")
+
+
+class MetricsHandlerMixin:
+    """Mix in before ``BaseHTTPRequestHandler`` to time every request."""
+
+    metrics_server = "api"
+    metrics_routes: FrozenSet[str] = frozenset({"/", "/metrics"})
+    _metrics_status: Optional[int] = None
+    _metrics_start: Optional[float] = None
+
+    def send_response(self, code: int, message: Optional[str] = None) -> None:
+        self._metrics_status = code
+        super().send_response(code, message)  # type: ignore[misc]
+
+    def parse_request(self) -> bool:
+        # The request line has been read: time from here, not from the (idle) wait for it
+        self._metrics_start = time.perf_counter()
+        return super().parse_request()  # type: ignore[misc]
+
+    def handle_one_request(self) -> None:
+        self._metrics_status = None
+        self._metrics_start = None
+        self.command = None  # type: ignore[assignment]  # reset between keep-alive requests
+        try:
+            super().handle_one_request()  # type: ignore[misc]
+        finally:
+            command: Any = getattr(self, "command", None)
+            if command and self._metrics_start is not None:
+                method = normalize_method(command)
+                label = normalize_path(getattr(self, "path", ""), self.metrics_routes)
+                HTTP_SECONDS.observe(time.perf_counter() - self._metrics_start,
+                                     server=self.metrics_server, method=method, path=label)
+                HTTP_REQUESTS.inc(server=self.metrics_server, method=method, path=label,
+                                  status=str(self._metrics_status or 0))
+
+
+__all__ = ["MetricsHandlerMixin", "metrics_payload", "normalize_method", "normalize_path"]
@@ -0,0 +1,255 @@
+"""Bounded worker-pool HTTP server (stdlib only).
+
+``ThreadingHTTPServer`` spawns one thread per connection with no upper bound,
+and plain ``HTTPServer`` serves one request at a time. ``PooledHTTPServer``
+hands accepted connections to a fixed-size thread pool instead, with a
+separate small "fast lane" pool for cheap endpoints (UI page, health, status,
+metrics, job polling) so they are never starved by long pipeline runs, and a
+bounded "stream" lane for long-lived event streams (``/jobs/{id}/events``) so
+watchers hold neither pipeline nor fast-lane workers.
+
+Lane selection peeks at the request line (``MSG_PEEK``) without consuming it,
+so handlers see the request untouched. The accept thread never waits on a
+client: new connections are parked in a selector and routed by a separate
+thread once their first bytes arrive, so silent clients (browser preconnects,
+idle or slowloris sockets) neither stall accepts nor hold a worker. A
+connection that sends nothing within the keep-alive timeout is closed. With HTTP/1.1 keep-alive
+(``KeepAliveHandlerMixin``) each follow-up request on a connection is routed
+again: a connection whose next request belongs to the other lane is handed over
+to that pool. An idle keep-alive connection holds its worker until the next
+request or the idle timeout, so keep-alive is refused while connections wait
+for a worker in the same lane or when the lane has no spare worker left; open
+connections are capped (``ConnectionLimitMixin``).
+"""
+from __future__ import annotations
+
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+try:
+    from .http_keepalive import ConnectionLimitMixin, keepalive_timeout
+except ImportError:  # pragma: no cover - script execution
+    from http_keepalive import ConnectionLimitMixin, keepalive_timeout  # type: ignore
+
+DEFAULT_FAST_PATHS: Tuple[str, ...] = ("/", "/index.html", "/health", "/status", "/metrics", "/favicon.ico")
+# Job submission / polling / cancellation only touch in-memory bookkeeping.
+DEFAULT_FAST_PREFIXES: Tuple[str, ...] = ("/jobs",)
+_PEEK_BYTES = 512
+FAST_LANE = "fast"
+MAIN_LANE = "main"
+STREAM_LANE = "stream"
+
+
+def default_workers() -> int:
+    """Pipeline worker count: ORBITSUITE_HTTP_WORKERS or a small CPU-based default."""
+    raw = os.getenv("ORBITSUITE_HTTP_WORKERS", "").strip()
+    if raw.isdigit() and int(raw) > 0:
+        return int(raw)
+    return min(8, (os.cpu_count() or 2) + 2)
+
+
+def default_stream_workers() -> int:
+    """Concurrent event streams: ORBITSUITE_HTTP_STREAM_WORKERS (default 8); more watchers wait."""
+    raw = os.getenv("ORBITSUITE_HTTP_STREAM_WORKERS", "").strip()
+    return int(raw) if raw.isdigit() and int(raw) > 0 else 8
+
+
+class PooledHTTPServer(ConnectionLimitMixin, HTTPServer):
+    """HTTPServer dispatching connections to bounded worker pools."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        handler_class: Any,
+        workers: Optional[int] = None,
+        fast_workers: int = 2,
+        stream_workers: Optional[int] = None,
+        fast_paths: Iterable[str] = DEFAULT_FAST_PATHS,
+        fast_prefixes: Iterable[str] = DEFAULT_FAST_PREFIXES,
+        peek_timeout: float = 0.25,
+        max_connections: Optional[int] = None,
+        first_byte_timeout: Optional[float] = None,
+    ) -> None:
+        super().__init__(server_address, handler_class, max_connections=max_connections)
+        self.workers = max(1, workers or default_workers())
+        self.fast_workers = max(1, fast_workers)
+        self.stream_workers = max(1, stream_workers or default_stream_workers())
+        self.fast_paths = frozenset(fast_paths)
+        self.fast_prefixes = tuple(p.rstrip("/") for p in fast_prefixes)
+        self.peek_timeout = peek_timeout
+        self._sizes: Dict[str, int] = {FAST_LANE: self.fast_workers, MAIN_LANE: self.workers,
+                                       STREAM_LANE: self.stream_workers}
+        self._pools: Dict[str, ThreadPoolExecutor] = {
+            MAIN_LANE: ThreadPoolExecutor(self.workers, thread_name_prefix="orbit-http"),
+            FAST_LANE: ThreadPoolExecutor(self.fast_workers, thread_name_prefix="orbit-http-fast"),
+            STREAM_LANE: ThreadPoolExecutor(self.stream_workers, thread_name_prefix="orbit-http-stream"),
+        }
+        self._pending: Dict[str, int] = dict.fromkeys(self._pools, 0)
+        self._busy: Dict[str, int] = dict.fromkeys(self._pools, 0)
+        self._lane_lock = threading.Lock()
+        self._local = threading.local()
+        # Connections waiting for their first bytes, watched by the router thread
+        self.first_byte_timeout = first_byte_timeout or keepalive_timeout()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._arrivals: Deque[Tuple[Any, Any]] = deque()
+        self._routing = True
+        self._router = threading.Thread(target=self._route_loop, name="orbit-http-router", daemon=True)
+        self._router.start()
+
+    # --- Lane selection ---
+    def _peek_line(self, request: socket.socket) -> bytes:
+        try:
+            request.settimeout(self.peek_timeout)
+            head = request.recv(_PEEK_BYTES, socket.MSG_PEEK)
+        except (OSError, ValueError):
+            return b""
+        finally:
+            try:
+                request.settimeout(None)
+            except OSError:
+                pass
+        return head.split(b"\r\n", 1)[0]
+
+    def lane_for_request_line(self, line: bytes) -> str:
+        parts = line.decode("latin-1", "replace").split()
+        if len(parts) < 2:
+            return MAIN_LANE
+        method, path = parts[0].upper(), parts[1].split("?", 1)[0]
+        if method in ("GET", "HEAD", "OPTIONS") and path in self.fast_paths:
+            return FAST_LANE
+        if path.endswith("/events"):
+            return STREAM_LANE  # long-lived event streams hold neither pipeline nor fast-lane workers
+        if any(path == p or path.startswith(p + "/") for p in self.fast_prefixes):
+            return FAST_LANE
+        return MAIN_LANE
+
+    def is_fast_request(self, request: socket.socket) -> bool:
+        return self.lane_for_request_line(self._peek_line(request)) == FAST_LANE
+
+    def current_lane(self) -> Optional[str]:
+        """Lane of the calling worker thread (None outside the pools)."""
+        return getattr(self._local, "lane", None)
+
+    def keepalive_allowed(self) -> bool:
+        """Keep a connection only while its lane has no waiters and another worker stays free."""
+        lane = self.current_lane()
+        if lane is None:
+            return super().keepalive_allowed()
+        with self._lane_lock:
+            spare = self._pending[lane] == 0 and self._busy[lane] < self._sizes[lane]
+        return spare and super().keepalive_allowed()
+
+    # --- socketserver hooks ---
+    def process_request(self, request: Any, client_address: Any) -> None:
+        """Hand the connection to the router thread; accepting never waits on the client."""
+        self._arrivals.append((request, client_address))
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:  # server closing
+            pass
+
+    # --- Routing (router thread only) ---
+    def _route_loop(self) -> None:
+        deadlines: Dict[Any, float] = {}
+        while self._routing:
+            now = time.monotonic()
+            timeout = max(0.0, min(deadlines.values()) - now) if deadlines else None
+            for key, _ in self._selector.select(timeout):
+                if key.fileobj is self._wake_r:
+                    try:
+                        self._wake_r.recv(4096)
+                    except OSError:
+                        pass
+                    while self._arrivals:
+                        request, client_address = self._arrivals.popleft()
+                        self._selector.register(request, selectors.EVENT_READ, client_address)
+                        deadlines[request] = time.monotonic() + self.first_byte_timeout
+                    continue
+                request = key.fileobj
+                self._selector.unregister(request)
+                del deadlines[request]
+                line = self._peek_line(request)  # readable: returns at once
+                if line:
+                    self._dispatch(self.lane_for_request_line(line), request, key.data, None)
+                else:
+                    self.shutdown_request(request)  # closed before sending a request line
+            now = time.monotonic()
+            for request in [r for r, deadline in deadlines.items() if deadline <= now]:
+                self._selector.unregister(request)
+                del deadlines[request]
+                self.shutdown_request(request)  # never sent anything
+        for key in list(self._selector.get_map().values()):
+            if key.fileobj is not self._wake_r:
+                self.shutdown_request(key.fileobj)
+
+    def _dispatch(self, lane: str, request: Any, client_address: Any, handler: Any) -> None:
+        pool = self._pools[lane]
+        with self._lane_lock:
+            self._pending[lane] += 1
+        try:
+            pool.submit(self._process_request_worker, lane, request, client_address, handler)
+        except RuntimeError:  # pool already shut down
+            with self._lane_lock:
+                self._pending[lane] -= 1
+            self.shutdown_request(request)
+
+    def _process_request_worker(self, lane: str, request: Any, client_address: Any, handler: Any = None) -> None:
+        with self._lane_lock:
+            self._pending[lane] -= 1
+            self._busy[lane] += 1
+        self._local.lane = lane
+        handoff: Optional[str] = None
+        try:
+            if handler is None:
+                handler = self.RequestHandlerClass(request, client_address, self)
+            else:
+                handler.resume()
+            handoff = getattr(handler, "handoff_lane", None)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self._local.lane = None
+            with self._lane_lock:
+                self._busy[lane] -= 1
+        if handoff is not None:
+            self._dispatch(handoff, request, client_address, handler)
+        else:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._routing = False
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+        self._router.join(5)
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "DEFAULT_FAST_PATHS",
+    "DEFAULT_FAST_PREFIXES",
+    "FAST_LANE",
+    "MAIN_LANE",
+    "PooledHTTPServer",
+    "STREAM_LANE",
+    "default_stream_workers",
+    "default_workers",
+]
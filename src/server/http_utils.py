@@ -0,0 +1,196 @@
+"""Response encoding shared by main.py api_mode and src/server/serve.py.
+
+``ResponseMixin`` gives handlers one way to send bodies:
+
+* JSON is compact by default; ``?pretty=1`` restores indentation.
+* ``?fields=success,result.pipeline_artifacts`` (or ``"fields"`` in a POST
+  body) projects a 2xx JSON response down to the listed dotted paths.
+* Bodies of at least ``GZIP_MIN_BYTES`` are gzip-compressed when the client's
+  ``Accept-Encoding`` allows it.
+* ``send_static`` serves pre-rendered pages with an ETag and answers
+  ``If-None-Match`` revalidation with 304.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+if TYPE_CHECKING:
+    from http.server import BaseHTTPRequestHandler as _HandlerBase
+else:
+    _HandlerBase = object
+
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5  # payloads are mostly generated code: level 5 gets most of the ratio at a fraction of 9's cost
+
+FieldSpec = Union[str, Sequence[str], None]
+
+
+def query_params(path: str) -> Dict[str, List[str]]:
+    return parse_qs(urlsplit(path or "").query, keep_blank_values=True)
+
+
+def route_of(path: str) -> str:
+    """Path without query string (``/process?fields=x`` -> ``/process``)."""
+    return urlsplit(path or "").path or "/"
+
+
+def parse_fields(spec: Any) -> List[str]:
+    """Normalize ``"a,b.c"`` / ``["a", "b.c"]`` into a list of dotted paths."""
+    if not spec:
+        return []
+    items: Iterable[Any] = spec.split(",") if isinstance(spec, str) else spec
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def _field_tree(fields: Sequence[str]) -> Dict[str, Any]:
+    tree: Dict[str, Any] = {}
+    for field in fields:
+        node = tree
+        parts = [p for p in field.split(".") if p]
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                node[part] = None  # leaf: keep the whole value
+            elif node.get(part, {}) is not None:
+                node = node.setdefault(part, {})
+            else:
+                break  # an ancestor is already kept whole
+    return tree
+
+
+def _apply(value: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [_apply(item, tree) for item in value]
+    if isinstance(value, dict):
+        return {k: _apply(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+def project(obj: Any, fields: Sequence[str]) -> Any:
+    """Keep only the dotted ``fields`` of ``obj`` (lists are projected element-wise)."""
+    if not fields or not isinstance(obj, dict):
+        return obj
+    return _apply(obj, _field_tree(fields))
+
+
+def encode_json(obj: Any, pretty: bool = False) -> bytes:
+    if pretty:
+        return json.dumps(obj, indent=2, default=str).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """True if ``gzip`` (or ``*``) is listed with a non-zero q-value."""
+    for token in (accept_encoding or "").split(","):
+        name, _, params = token.strip().partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, val = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(val)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            return True
+    return False
+
+
+def maybe_gzip(data: bytes, accept_encoding: Optional[str],
+               min_size: int = GZIP_MIN_BYTES) -> Tuple[bytes, Optional[str]]:
+    """Return ``(body, content_encoding)``; small bodies are sent as-is."""
+    if len(data) < min_size or not accepts_gzip(accept_encoding):
+        return data, None
+    return gzip.compress(data, compresslevel=GZIP_LEVEL), "gzip"
+
+
+def make_etag(data: bytes) -> str:
+    return '"' + hashlib.sha1(data).hexdigest()[:20] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or ("W/" + etag) in tags
+
+
+class StaticPage:
+    """Body rendered once at startup plus its validator and gzip variant."""
+
+    def __init__(self, body: Union[str, bytes], content_type: str = "text/html; charset=utf-8") -> None:
+        self.body = body.encode("utf-8") if isinstance(body, str) else body
+        self.content_type = content_type
+        self.etag = make_etag(self.body)
+        self.gzipped = gzip.compress(self.body, compresslevel=9)
+
+
+class ResponseMixin(_HandlerBase):
+    """Mix in before ``BaseHTTPRequestHandler`` for negotiated, projected responses."""
+
+    def _send_body(self, status: int, data: bytes, content_type: str,
+                   headers: Optional[Mapping[str, str]] = None) -> None:
+        data, encoding = maybe_gzip(data, self.headers.get("Accept-Encoding"))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, status: int, obj: Any, headers: Optional[Mapping[str, str]] = None,
+              fields: FieldSpec = None) -> None:
+        """Send ``obj`` as JSON honouring ``?pretty`` and ``fields`` (query or explicit)."""
+        query = query_params(self.path)
+        wanted = parse_fields(fields) or parse_fields((query.get("fields") or [""])[0])
+        if wanted and 200 <= status < 300:
+            obj = project(obj, wanted)
+        pretty = (query.get("pretty") or ["0"])[0].lower() in ("", "1", "true", "yes")
+        self._send_body(status, encode_json(obj, pretty=pretty), "application/json", headers)
+
+    def send_static(self, page: StaticPage) -> None:
+        """Serve a pre-rendered page; 304 when the client's copy is current."""
+        if etag_matches(self.headers.get("If-None-Match"), page.etag):
+            self.send_response(304)
+            self.send_header("ETag", page.etag)
+            self.end_headers()
+            return
+        use_gzip = accepts_gzip(self.headers.get("Accept-Encoding"))
+        data = page.gzipped if use_gzip else page.body
+        self.send_response(200)
+        self.send_header("Content-Type", page.content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", page.etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+__all__ = [
+    "GZIP_MIN_BYTES",
+    "ResponseMixin",
+    "StaticPage",
+    "accepts_gzip",
+    "encode_json",
+    "etag_matches",
+    "make_etag",
+    "maybe_gzip",
+    "parse_fields",
+    "project",
+    "query_params",
+    "route_of",
+]
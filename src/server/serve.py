@@ -1,10 +1,20 @@
 """Minimal stdlib HTTP server exposing only allowed Core endpoints.
 
 Endpoints:
-  POST /process        -> {text: str}
+  POST /process        -> {text: str, fields?: [...]}  (429 + Retry-After when saturated)
+  GET  /status         -> admission / job counters
+  GET  /metrics        -> Prometheus text (``?format=json`` for p50/p95/p99 snapshot)
+  POST /process/batch  -> {items: [text | task dict], max_parallel?, fields?}  (NDJSON stream; 429 when saturated)
+  POST /jobs           -> {text: str}  (202 + job id; runs on the job queue)
+  GET  /jobs/{id}      -> job status / progress / result
+  GET  /jobs/{id}/events -> Server-Sent Events: status / progress as they happen
+  DELETE /jobs/{id}    -> cancel job
   POST /config/openai  -> {key: sk-...}
 
 All /webhooks/* and /autosync/* paths return 403 (PRO_FEATURE).
+Connections are HTTP/1.1 keep-alive (bounded, see http_keepalive).
+JSON responses are compact (``?pretty=1`` to indent), gzip-compressed when the
+client accepts it, and projectable with ``?fields=a,b.c`` (see http_utils).
 
 Notes:
   • No external dependencies (FastAPI intentionally omitted to keep README claim).
@@ -13,9 +23,9 @@ Notes:
 """
 from __future__ import annotations
 
-import json, os, sys
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Dict, Any
+import json, os, sys, threading
+from http.server import BaseHTTPRequestHandler
+from typing import Callable, Dict, Any, Tuple
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
@@ -23,33 +33,110 @@ from src.supervisor import Supervisor
 from src.core_mode import core_banner, BANNER_PRINTED as _CORE_BANNER_FLAG  # constant style flag
 import src.core_mode as _core_mode_mod
 from src.demo_mode import process_demo_request, is_demo_active
+from src.job_manager import Job, JobManager, JobQueueFull, parse_job_events_path, parse_job_path
+from src.admission import AdmissionController, AdmissionRejected
+from src.server.http_metrics import MetricsHandlerMixin, metrics_payload
+from src.server.http_utils import ResponseMixin, route_of
+from src.server.http_keepalive import BoundedThreadingHTTPServer, KeepAliveHandlerMixin
+from src.batching import default_parallelism, validate_batch_items
 
 # Mutable runtime state (lowercase to satisfy linters)
 _supervisor_instance: Supervisor | None = None
+_job_manager: JobManager | None = None
+_admission: AdmissionController | None = None
+_state_lock = threading.Lock()
 
 
 def _get_supervisor() -> Supervisor:
     global _supervisor_instance
-    if _supervisor_instance is None:
-        _supervisor_instance = Supervisor(include_llm=False)  # Core: ignore local LLM env
-    return _supervisor_instance
+    with _state_lock:
+        if _supervisor_instance is None:
+            _supervisor_instance = Supervisor(include_llm=False)  # Core: ignore local LLM env
+        return _supervisor_instance
 
 
-class CoreHandler(BaseHTTPRequestHandler):
+def _get_jobs() -> JobManager:
+    global _job_manager
+    with _state_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
+
+
+def _get_admission() -> AdmissionController:
+    global _admission
+    with _state_lock:
+        if _admission is None:
+            _admission = AdmissionController()
+        return _admission
+
+
+def _process_text(text: str, use_cache: bool = True, persist: Any = None) -> Tuple[int, Dict[str, Any]]:
+    """Run one /process request; returns (http_status, payload)."""
+    # Demo mode first (only active if no OPENAI_API_KEY)
+    demo_resp = process_demo_request(text)
+    if demo_resp.get("success") or demo_resp.get("error") == "NEED_API_KEY":
+        return (200 if demo_resp.get("success") else 403), demo_resp
+    # Not in demo (OPENAI_API_KEY present) -> normal supervisor path
+    sup = _get_supervisor()
+    result = sup.process_request(text, use_cache, persist)
+    return 200, {"success": bool(result.get("success", False)), "result": result}
+
+
+def _job_runner(text: str, use_cache: bool = True, persist: Any = None) -> Callable[[Job], Dict[str, Any]]:
+    def _run(job: Job) -> Dict[str, Any]:
+        # Job queue already bounds the backlog: wait for a pipeline slot
+        with _get_admission().slot(enforce_queue_limit=False):
+            job.check_cancelled()
+            status, payload = _process_text(text, use_cache, persist)
+        job.report("processed", f"http_status={status}")
+        return payload
+    return _run
+
+
+class CoreHandler(MetricsHandlerMixin, KeepAliveHandlerMixin, ResponseMixin, BaseHTTPRequestHandler):
     server_version = "OrbitSuiteCore/0.1"
+    metrics_server = "serve"
+    metrics_routes = frozenset({"/status", "/metrics", "/process", "/process/batch", "/jobs", "/config/openai"})
 
     # Disable default logging to keep stdout quiet after banner
     def log_message(self, format: str, *args: Any) -> None:  # noqa: A003  # pragma: no cover
         # Override to silence default request logging (Core = stdout minimal)
         return
 
-    def _json(self, status: int, obj: Dict[str, Any]) -> None:
-        data = json.dumps(obj).encode("utf-8")
-        self.send_response(status)
-        self.send_header("Content-Type", "application/json")
-        self.send_header("Content-Length", str(len(data)))
-        self.end_headers()
-        self.wfile.write(data)
+    def do_GET(self):  # noqa: N802 - stdlib signature
+        route = route_of(self.path)
+        if route == "/metrics":
+            content_type, data = metrics_payload(self.path)
+            return self._send_body(200, data, content_type)
+        if route == "/status":
+            return self._json(200, {
+                "success": True,
+                "admission": _get_admission().stats(),
+                "jobs": _get_jobs().stats(),
+            })
+        events_id = parse_job_events_path(self.path or "")
+        if events_id is not None:
+            events = _get_jobs().subscribe(events_id)
+            if events is None:
+                return self._json(404, {"success": False, "error": "UNKNOWN_JOB"})
+            return self.stream_sse(events)
+        job_id = parse_job_path(self.path or "")
+        if job_id is None:
+            return self._json(404, {"success": False, "error": "NOT_FOUND"})
+        job = _get_jobs().get(job_id)
+        if job is None:
+            return self._json(404, {"success": False, "error": "UNKNOWN_JOB"})
+        return self._json(200, job.to_dict())
+
+    def do_DELETE(self):  # noqa: N802
+        job_id = parse_job_path(self.path or "")
+        if job_id is None:
+            return self._json(404, {"success": False, "error": "NOT_FOUND"})
+        job = _get_jobs().cancel(job_id)
+        if job is None:
+            return self._json(404, {"success": False, "error": "UNKNOWN_JOB"})
+        return self._json(200, job.to_dict(include_result=False))
 
     def do_POST(self):  # noqa: N802 - stdlib signature
         length = int(self.headers.get("Content-Length", "0") or 0)
@@ -58,7 +145,9 @@ class CoreHandler(BaseHTTPRequestHandler):
         if raw:
             try:
                 parsed = json.loads(raw.decode("utf-8"))
-                if isinstance(parsed, dict):
+                if isinstance(parsed, list):
+                    body = {"items": parsed}  # bare array: POST /process/batch shorthand
+                elif isinstance(parsed, dict):
                     # Safe cast for static type checkers (keys coerced to str)
                     body = {}
                     for _k, _v in parsed.items():  # type: ignore[assignment]
@@ -70,19 +159,56 @@ class CoreHandler(BaseHTTPRequestHandler):
         else:
             body = {}
 
-        path = self.path or ""
+        path = route_of(self.path)
         if path == "/process":
             text = str(body.get("text", "")).strip()
             if not text:
                 return self._json(400, {"success": False, "error": "EMPTY_TEXT"})
-            # Demo mode first (only active if no OPENAI_API_KEY)
-            demo_resp = process_demo_request(text)
-            if demo_resp.get("success") or demo_resp.get("error") == "NEED_API_KEY":
-                return self._json(200 if demo_resp.get("success") else 403, demo_resp)
-            # Not in demo (OPENAI_API_KEY present) -> normal supervisor path
-            sup = _get_supervisor()
-            result = sup.process_request(text)
-            return self._json(200, {"success": bool(result.get("success", False)), "result": result})
+            try:
+                with _get_admission().slot():
+                    status, payload = _process_text(text, body.get("use_cache") is not False, body.get("persist"))
+            except AdmissionRejected as e:
+                return self._json(429, {"success": False, "error": "BUSY", "retry_after": e.retry_after},
+                                  {"Retry-After": str(e.retry_after)})
+            return self._json(status, payload, fields=body.get("fields"))
+        if path == "/process/batch":
+            items = body.get("items")
+            error = validate_batch_items(items)
+            if error:
+                return self._json(400, {"success": False, "error": "INVALID_BATCH", "detail": error})
+            if is_demo_active():
+                return self._json(403, {"success": False, "error": "NEED_API_KEY",
+                                        "detail": "Batch processing requires OPENAI_API_KEY."})
+            use_cache = body.get("use_cache") is not False
+            max_parallel = body.get("max_parallel")
+            try:
+                # Admit the batch as a whole; its fan-out never queues more than was admitted
+                parallel = _get_admission().ensure_room(min(len(items), max_parallel if isinstance(max_parallel, int)
+                                                            and max_parallel > 0 else default_parallelism()))
+            except AdmissionRejected as e:
+                return self._json(429, {"success": False, "error": "BUSY", "retry_after": e.retry_after},
+                                  {"Retry-After": str(e.retry_after)})
+
+            def _run_item(item: Any) -> Dict[str, Any]:
+                with _get_admission().slot(enforce_queue_limit=False):
+                    return _get_supervisor().process_request(item, use_cache, body.get("persist"))
+
+            self.stream_ndjson(
+                _get_supervisor().process_batch(items, max_parallel=parallel, runner=_run_item),
+                fields=body.get("fields"),
+            )
+            return
+        if path == "/jobs":
+            text = str(body.get("text", "")).strip()
+            if not text:
+                return self._json(400, {"success": False, "error": "EMPTY_TEXT"})
+            try:
+                job = _get_jobs().submit(_job_runner(text, body.get("use_cache") is not False, body.get("persist")),
+                                         label=text[:80])
+            except JobQueueFull:
+                return self._json(429, {"success": False, "error": "QUEUE_FULL"}, {"Retry-After": "5"})
+            return self._json(202, {"success": True, "job_id": job.id, "status": job.status,
+                                    "location": f"/jobs/{job.id}"}, {"Location": f"/jobs/{job.id}"})
         if path == "/config/openai":
             key = str(body.get("key", "")).strip()
             if not key.startswith("sk-"):
@@ -117,8 +243,9 @@ class CoreHandler(BaseHTTPRequestHandler):
     # Basic CORS (optional minimal)
     def do_OPTIONS(self):  # noqa: N802
         self.send_response(204)
+        self.send_header("Content-Length", "0")
         self.send_header("Access-Control-Allow-Origin", "*")
-        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, DELETE, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
         self.end_headers()
 
@@ -131,13 +258,15 @@ def run(host: str = "0.0.0.0", port: int = 8000) -> None:
         # Warn if local LLM env vars present (ignored in Core)
         if any(os.getenv(k) for k in ("ORBITSUITE_LLM_MODEL_PATH", "ORBITSUITE_LLM_SERVER_URL", "ORBITSUITE_LLM_PROVIDER")):
             print("[Core Warning] Local LLM env detected but ignored (upgrade required).")
-    httpd = ThreadingHTTPServer((host, port), CoreHandler)
+    httpd = BoundedThreadingHTTPServer((host, port), CoreHandler)
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:  # pragma: no cover
         pass
     finally:
         httpd.server_close()
+        if _job_manager is not None:
+            _job_manager.shutdown()
 
 
 if __name__ == "__main__":
@@ -3,8 +3,12 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import copy
+import hashlib
+import json
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, Iterator, List, Optional, Sequence
 from src.task_linguist import TaskLinguistAgent
 from src.codegen_agent import CodegenAgent
 from src.engineer_agent import EngineerAgent
@@ -12,6 +16,14 @@ from src.memory_agent import MemoryAgent
 from src.tester_agent import TesterAgentClass
 from src.patcher_agent import PatcherAgent
 from src.orchestrator_agent import OrchestratorAgent
+from src.lru_cache import CoalescingCache
+from src.artifact_writer import persist_mode
+from src.run_context import use_context
+from src.checkpoint import CheckpointJournal, item_id
+from src.batching import iter_completed
+from src.metrics import counter
+
+_RESULT_CACHE = counter("orbitsuite_result_cache_total", "Supervisor result cache lookups", ["outcome"])
 
 
 def _is_verbose() -> bool:
@@ -43,10 +55,53 @@ def _vlog(msg: str) -> None:
         _append_log(msg)
 
 
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, "").strip()))
+    except ValueError:
+        return default
+
+
+def _request_cache_key(request: Any) -> Optional[str]:
+    """Stable key for identical requests (whitespace-normalized); None if uncacheable."""
+    if isinstance(request, str):
+        payload = " ".join(request.split())
+    elif isinstance(request, dict):
+        # Private keys (_progress_cb, ...) and the opt-out flag do not change the result
+        fields = {str(k): v for k, v in request.items() if not str(k).startswith("_") and k != "use_cache"}
+        try:
+            payload = json.dumps(fields, sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+    else:
+        return None
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _response_cacheable(response: Dict[str, Any]) -> bool:
+    result = response.get("result")
+    return bool(response.get("success")) and not (isinstance(result, dict) and result.get("success") is False)
+
+
 class Supervisor:
     """
     Minimal supervisor for coordinating OrbitSuite agents.
     Handles task routing, agent coordination, and basic workflow management.
+
+    Identical requests (same text after whitespace normalization) share work:
+    one arriving while a match is running waits for it, and a successful result
+    is replayed from a bounded TTL cache. Responses carry ``cache`` = ``miss`` |
+    ``hit`` | ``coalesced`` | ``bypass``. Opt out per call with
+    ``use_cache=False`` (or ``"use_cache": false`` in a dict request).
+
+    ``persist=False`` (or ``"persist": false`` / ``"final"`` in a dict request)
+    runs the pipeline without touching disk: artifacts come back in the task
+    result under ``artifacts``, and ``"final"`` additionally saves them as one
+    bundle file (see ``artifact_writer``).
+
+    Environment variables:
+      ORBITSUITE_RESULT_CACHE_SIZE  cached responses kept (default 64, 0 = no replay)
+      ORBITSUITE_RESULT_CACHE_TTL   seconds a cached response stays valid (default 600)
     """
     
     def __init__(self, include_llm: bool = True):
@@ -54,6 +109,11 @@ class Supervisor:
         self.agents: Dict[str, Any] = {}
         self.status = "initialized"
         self.task_history: List[Dict[str, Any]] = []
+        self._history_lock = threading.Lock()
+        self._result_cache: CoalescingCache[Dict[str, Any]] = CoalescingCache(
+            max_size=int(_env_number("ORBITSUITE_RESULT_CACHE_SIZE", 64)),
+            ttl=_env_number("ORBITSUITE_RESULT_CACHE_TTL", 600.0),
+        )
 
         # Initialize all agents
         self._initialize_agents(include_llm)
@@ -79,10 +139,67 @@ class Supervisor:
             if name != "orchestrator":
                 orchestrator.register_agent(name, agent)
     
-    def process_request(self, request: Any) -> Dict[str, Any]:
+    def process_request(self, request: Any, use_cache: bool = True, persist: Any = None) -> Dict[str, Any]:
         """
         Main entry point for processing requests.
         """
+        if isinstance(request, dict) and request.get("use_cache") is False:
+            use_cache = False
+        try:
+            mode = persist_mode(request.get("persist", persist) if isinstance(request, dict) else persist)
+        except ValueError as e:
+            return self._error_response(str(e))
+
+        def _run() -> Dict[str, Any]:
+            with use_context(persist=mode):
+                return self._process_uncached(request)
+
+        # Streaming callers need live step events, which a shared run cannot deliver
+        key = _request_cache_key(request) if use_cache else None
+        if key is None or (isinstance(request, dict) and request.get("_progress_cb") is not None):
+            _RESULT_CACHE.inc(outcome="bypass")
+            response = _run()
+            response["cache"] = "bypass"
+            return response
+        if mode != "all":
+            key = f"{key}:{mode}"  # in-memory responses carry the files; never share with on-disk runs
+
+        shared, outcome = self._result_cache.get_or_compute(key, _run, cacheable=_response_cacheable)
+        _RESULT_CACHE.inc(outcome=outcome)
+        if outcome != "miss":
+            _vlog(f"[Supervisor] Request served from cache ({outcome})")
+        try:
+            response = copy.deepcopy(shared)
+        except Exception:
+            response = dict(shared)
+        response["cache"] = outcome
+        return response
+
+    def process_batch(
+        self,
+        items: Sequence[Any],
+        max_parallel: Optional[int] = None,
+        use_cache: bool = True,
+        runner: Optional[Callable[[Any], Dict[str, Any]]] = None,
+        persist: Any = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Process many requests concurrently, yielding each response as it completes.
+
+        Items are texts or task dicts (as for ``process_request``); each yielded
+        response carries ``index`` (its position in ``items``). ``runner``
+        replaces the per-item call, e.g. to take an admission slot around it;
+        ``persist`` applies to every item, as for ``process_request``.
+        """
+        def _default(item: Any) -> Dict[str, Any]:
+            return self.process_request(item, use_cache, persist)
+
+        def _failed(item: Any, exc: BaseException) -> Dict[str, Any]:
+            return self._error_response(f"Processing error: {exc}")
+
+        for index, response in iter_completed(runner or _default, items, max_parallel, on_error=_failed):
+            yield {"index": index, **response}
+
+    def _process_uncached(self, request: Any) -> Dict[str, Any]:
         start_time = time.time()
         if _is_verbose():
             preview = _truncate(str(request), 160)
@@ -157,11 +274,12 @@ class Supervisor:
             "processing_time": processing_time,
         }
 
-        self.task_history.append(log_entry)
+        with self._history_lock:
+            self.task_history.append(log_entry)
 
-        # Keep only last 100 entries
-        if len(self.task_history) > 100:
-            self.task_history = self.task_history[-100:]
+            # Keep only last 100 entries
+            if len(self.task_history) > 100:
+                self.task_history = self.task_history[-100:]
     
     def _error_response(self, message: str, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Create standardized error response."""
@@ -176,12 +294,16 @@ class Supervisor:
     
     def get_status(self) -> Dict[str, Any]:
         """Get supervisor status and statistics."""
+        with self._history_lock:
+            total = len(self.task_history)
+            recent = self.task_history[-5:]
         return {
             "status": self.status,
             "version": self.version,
             "agents": list(self.agents.keys()),
-            "total_tasks_processed": len(self.task_history),
-            "recent_tasks": self.task_history[-5:] if self.task_history else [],
+            "total_tasks_processed": total,
+            "recent_tasks": recent,
+            "result_cache": self._result_cache.stats(),
             "uptime": "running"
         }
     
@@ -208,10 +330,45 @@ class Supervisor:
                 }
             return agent_info
     
-    def execute_workflow(self, tasks: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Execute a workflow of multiple tasks."""
+    def execute_workflow(self, tasks: List[Dict[str, Any]], checkpoint: Optional[str] = None,
+                         resume: bool = False) -> Dict[str, Any]:
+        """Execute a workflow of multiple tasks.
+
+        With ``checkpoint`` (a journal path, see src/checkpoint.py) every finished
+        task is journaled with its stored result; ``resume=True`` reuses the tasks an
+        interrupted run already finished and re-runs failed and in-flight ones. The
+        journal is removed once the whole workflow succeeds.
+        """
         orchestrator = self.agents["orchestrator"]
-        return orchestrator.dispatch({"tasks": tasks})
+        if checkpoint is None:
+            return orchestrator.dispatch({"tasks": tasks})
+        journal = CheckpointJournal(checkpoint, resume=resume)
+        ids = [item_id(i, task) for i, task in enumerate(tasks)]
+        completed: Dict[int, Any] = {}
+        for i, key in enumerate(ids):
+            restored = journal.load_result(key) if journal.is_done(key) else None
+            if restored is not None:
+                completed[i] = restored
+        _vlog(f"[Supervisor] Workflow checkpoint {checkpoint}: {len(completed)}/{len(tasks)} tasks restored")
+
+        def _on_task_done(index: int, result: Dict[str, Any]) -> None:
+            if result.get("success"):
+                journal.save_result(ids[index], result)
+            else:
+                journal.fail(ids[index], str(result.get("error", "")))
+
+        for key in ids:
+            if not journal.is_done(key):
+                journal.start(key)
+        try:
+            result = orchestrator.dispatch({"tasks": tasks, "_completed": completed, "_on_task_done": _on_task_done})
+        finally:
+            journal.close()
+        if isinstance(result, dict):
+            result["resumed_tasks"] = len(completed)
+            if result.get("success"):
+                journal.discard()
+        return result
     
     def health_check(self) -> Dict[str, Any]:
         """Perform a basic health check."""
@@ -240,7 +397,9 @@ class Supervisor:
     
     def reset(self):
         """Reset supervisor state."""
-        self.task_history = []
+        with self._history_lock:
+            self.task_history = []
+        self._result_cache.clear()
         self.status = "reset"
         print("[Supervisor] State reset completed")
     
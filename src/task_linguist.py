@@ -20,6 +20,8 @@ class TaskLinguistAgent(TaskLinguistCore):
         if isinstance(input_data, str):
             input_data = {"command": "parse", "text": input_data}
         else:
+            # Work on a copy: the caller's dict may be shared with other requests
+            input_data = dict(input_data)
             # ensure command defaults to parse so .get chain works
             input_data.setdefault("command", "parse")
             if "text" not in input_data and "prompt" in input_data:
@@ -5,13 +5,22 @@
 # © 2025 OrbitSuite, Inc. All rights reserved.
 # License: Open Core - Basic functionality available to all users
 
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import time
 import uuid
 import re
-import hashlib
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Set, Tuple
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime, timezone
 from .base_agent import BaseAgent  # local core base
+from .intent_matcher import IntentMatcher
+from .lru_cache import LRUCache
+from .intent_store import IntentStore, default_store_path
 try:
     from .utils import is_verbose as _core_is_verbose  # type: ignore
 except Exception:
@@ -27,6 +36,34 @@ def log_step(message: str) -> None:
 TEXT_INPUT_REQUIRED_ERROR = "Text input is required"
 CORE_VERSION = "1.0.0-core"
 
+_FILE_PATTERN = re.compile(r'\b\w+\.\w+\b')
+_NUMBER_PATTERN = re.compile(r'\b\d+\b')
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, "").strip()))
+    except ValueError:
+        return default
+
+
+# Per-process analyser for parse_batch pool workers (set by _init_pool_worker)
+_worker_linguist: Optional["TaskLinguistCore"] = None
+
+
+def _init_pool_worker(rules: Dict[str, Any]) -> None:
+    """parse_batch pool initializer: rebuild the calling instance's analyser from its rules."""
+    global _worker_linguist
+    _worker_linguist = TaskLinguistCore()
+    _worker_linguist._apply_rules(rules)
+    _worker_linguist.intent_store = None  # the parent already consulted (and will fill) the store
+
+
+def _analyze_texts_in_worker(texts: List[str]) -> List[Dict[str, Any]]:
+    """parse_batch pool worker: analyse a chunk with this process's analyser."""
+    assert _worker_linguist is not None, "worker not initialised"
+    return [_worker_linguist._analyze_intent_core({"text": text, "_store": False}) for text in texts]
+
 
 @dataclass
 class CoreTaskIntent:
@@ -59,6 +96,19 @@ class TaskLinguistCore(BaseAgent):
     for basic OrbitSuite task creation and agent coordination. Advanced features
     like AI-powered decomposition, complex analytics, and enterprise integrations
     are available in the full TaskLinguist agent.
+    
+    Analysed intents are kept in a bounded, thread-safe LRU cache whose hits,
+    misses and evictions are reported by the ``status`` command. With
+    ORBITSUITE_INTENT_STORE set, a persistent SQLite store (see intent_store)
+    sits behind it, shared by every process and invalidated whenever
+    CORE_VERSION or the patterns change.
+    
+    Environment variables:
+      ORBITSUITE_INTENT_CACHE_SIZE  cached intents kept (default 100, 0 = no caching)
+      ORBITSUITE_INTENT_CACHE_TTL   seconds a cached intent stays valid (default 0 = no expiry)
+      ORBITSUITE_INTENT_STORE       SQLite file for the persistent intent cache (default unset = off)
+      ORBITSUITE_LINGUIST_WORKERS   parse_batch worker processes (default 1 = in-process)
+      ORBITSUITE_LINGUIST_POOL_MIN  distinct texts before parse_batch uses the pool (default 2000)
     """
     
     def __init__(self):
@@ -125,12 +175,90 @@ class TaskLinguistCore(BaseAgent):
             "low": ["simple", "basic", "quick", "easy", "minimal", "small"]
         }
         
-        # Basic caching for performance - limited to core functionality
-        self.core_intent_cache: Dict[str, CoreTaskIntent] = {}
+        # Core entity keywords (substring matches on the lowercased text)
+        self.core_entity_keywords = {
+            "languages": ["python", "javascript", "java", "c++", "c#", "go", "rust", "typescript"],
+            "technologies": ["react", "vue", "angular", "django", "flask", "express", "spring", "docker"],
+            "actions": ["create", "build", "test", "deploy", "fix", "update", "delete", "analyze"]
+        }
+        
+        # Core priority indicators, checked from most to least urgent
+        self.core_priority_indicators = {
+            9: ["urgent", "critical", "emergency", "asap", "immediately", "now"],
+            7: ["important", "high", "priority", "soon", "quickly"],
+            3: ["later", "when possible", "low priority", "optional"]
+        }
+        
+        # Patterns and keywords compiled once: one linear pass per text (see intent_matcher)
+        self._matcher = self._build_matcher()
+        
+        # Optional persistent intent cache shared across processes and restarts
+        self.intent_store = self._open_intent_store()
+        
+        # Bounded LRU cache for performance (thread-safe, optional TTL), keyed by the text itself
+        self.core_intent_cache: LRUCache[CoreTaskIntent] = LRUCache(
+            max_size=int(_env_number("ORBITSUITE_INTENT_CACHE_SIZE", 100)),
+            ttl=_env_number("ORBITSUITE_INTENT_CACHE_TTL", 0.0),
+        )
         
         # Optional conductor registration for open core
         self._register_with_conductor_if_available()
     
+    def _build_matcher(self) -> IntentMatcher:
+        return IntentMatcher(self.core_intent_patterns, keywords=[
+            word.lower()
+            for groups in (self.core_complexity_indicators, self.core_entity_keywords, self.core_priority_indicators)
+            for words in groups.values()
+            for word in words
+        ])
+    
+    def _rules(self) -> Dict[str, Any]:
+        """Everything analysis depends on, picklable for parse_batch pool workers."""
+        return {name: getattr(self, name) for name in (
+            "core_intent_patterns", "core_agent_capabilities", "core_complexity_indicators",
+            "core_entity_keywords", "core_priority_indicators")}
+    
+    def _apply_rules(self, rules: Dict[str, Any]) -> None:
+        for name, value in rules.items():
+            setattr(self, name, value)
+        self._matcher = self._build_matcher()
+        self.core_intent_cache.clear()
+    
+    def _patterns_version(self) -> str:
+        """CORE_VERSION plus a fingerprint of everything that shapes an analysed intent."""
+        rules = [self.core_intent_patterns, self.core_complexity_indicators,
+                 self.core_entity_keywords, self.core_priority_indicators]
+        digest = hashlib.sha1(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+        return f"{CORE_VERSION}:{digest}"
+    
+    def _open_intent_store(self) -> Optional[IntentStore]:
+        path = default_store_path()
+        if not path:
+            return None
+        try:
+            return IntentStore(path, self._patterns_version())
+        except (OSError, sqlite3.Error) as e:
+            log_step(f"Persistent intent store unavailable ({path}): {e}")
+            return None
+    
+    def _store_get(self, text: str) -> Optional[CoreTaskIntent]:
+        if self.intent_store is None:
+            return None
+        try:
+            stored = self.intent_store.get(text)
+        except sqlite3.Error as e:  # the persistent cache never fails a parse
+            log_step(f"Intent store read failed: {e}")
+            return None
+        return CoreTaskIntent(**stored) if stored is not None else None
+    
+    def _store_put(self, items: List[Tuple[str, CoreTaskIntent]]) -> None:
+        if self.intent_store is None or not items:
+            return
+        try:
+            self.intent_store.put_many((text, asdict(intent)) for text, intent in items)
+        except sqlite3.Error as e:
+            log_step(f"Intent store write failed: {e}")
+    
     def _register_with_conductor_if_available(self) -> None:
         """No-op in core mode (conductor not bundled)."""
         return None
@@ -141,6 +269,7 @@ class TaskLinguistCore(BaseAgent):
         
         Supported commands:
         - parse: Basic natural language parsing
+        - parse_batch: Parse a list of texts in one call (tasks returned in order)
         - parse_prompt_to_task: Legacy compatibility
         - analyze_intent: Core intent analysis
         - suggest_agent: Basic agent suggestion
@@ -152,6 +281,9 @@ class TaskLinguistCore(BaseAgent):
         
         if command == "parse":
             return self._parse_natural_language_core(input_data)
+        elif command == "parse_batch":
+            return self.parse_batch(input_data.get("texts", []), input_data.get("target_agent"),
+                                    input_data.get("workers"))
         elif command == "parse_prompt_to_task":
             # Legacy compatibility for CLI/open core users
             prompt = input_data.get("prompt", "")
@@ -171,7 +303,7 @@ class TaskLinguistCore(BaseAgent):
             return {
                 "success": False, 
                 "error": f"Unknown core linguist command: {command}",
-                "available_commands": ["parse", "parse_prompt_to_task", "analyze_intent", "suggest_agent", "validate_task", "status", "clear_cache"]
+                "available_commands": ["parse", "parse_batch", "parse_prompt_to_task", "analyze_intent", "suggest_agent", "validate_task", "status", "clear_cache"]
             }
     
     def _parse_natural_language_core(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -193,13 +325,22 @@ class TaskLinguistCore(BaseAgent):
             if not intent_result["success"]:
                 return intent_result
             
-            intent = CoreTaskIntent(**intent_result["intent"])
+            response = self._build_parse_response(text, CoreTaskIntent(**intent_result["intent"]), target_agent)
+            log_step(f"TaskLinguistCore parsed: {text} -> {response['intent']['type']} "
+                     f"(confidence: {response['intent']['confidence']:.2f})")
             
-            # Create basic task structure
-            base_task = self._create_core_task(text, intent, target_agent)
-            
-            # Generate core response
-            response: Dict[str, Any] = {
+            return response
+        
+        except Exception as e:
+            return {"success": False, "error": f"Core natural language parsing failed: {e}"}
+    
+    def _build_parse_response(self, text: str, intent: CoreTaskIntent, target_agent: Optional[str]) -> Dict[str, Any]:
+        """Parse response (with a new task) for an analysed intent."""
+        # Create basic task structure
+        base_task = self._create_core_task(text, intent, target_agent)
+        
+        # Generate core response
+        return {
                 "success": True,
                 "core_mode": True,
                 "version": self.version,
@@ -215,13 +356,85 @@ class TaskLinguistCore(BaseAgent):
                 "task": base_task,
                 "note": "Core functionality - upgrade to TaskLinguist Pro for advanced features"
             }
-            
-            log_step(f"TaskLinguistCore parsed: {text} -> {intent.intent_type} (confidence: {intent.confidence:.2f})")
-            
-            return response
+    
+    def parse_batch(self, texts: Sequence[str], target_agent: Optional[str] = None,
+                    workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Parse many texts in one call; ``results[i]`` is the parse response for ``texts[i]``.
         
-        except Exception as e:
-            return {"success": False, "error": f"Core natural language parsing failed: {e}"}
+        Identical texts are analysed once (each still gets its own task). With
+        ``workers > 1`` and at least ORBITSUITE_LINGUIST_POOL_MIN distinct texts
+        still uncached, analysis is spread over a process pool.
+        """
+        if not isinstance(texts, (list, tuple)) or not texts:
+            return {"success": False, "error": "texts must be a non-empty list"}
+        started = time.perf_counter()
+        workers = int(workers or _env_number("ORBITSUITE_LINGUIST_WORKERS", 1) or 1)
+        unique = list(dict.fromkeys(t for t in texts if isinstance(t, str) and t))
+        analysed: Dict[str, Dict[str, Any]] = {}
+        uncached = [t for t in unique if t not in self.core_intent_cache]
+        if self.intent_store is not None and uncached:
+            try:
+                stored = self.intent_store.get_many(uncached)
+            except sqlite3.Error as e:
+                log_step(f"Intent store read failed: {e}")
+                stored = {}
+            for text, intent in stored.items():
+                self.core_intent_cache.put(text, CoreTaskIntent(**intent))
+            uncached = [t for t in uncached if t not in stored]
+        computed: List[Tuple[str, CoreTaskIntent]] = []
+        pending = set(uncached)
+        pooled = workers > 1 and len(uncached) >= int(_env_number("ORBITSUITE_LINGUIST_POOL_MIN", 2000))
+        if pooled:
+            size = max(1, -(-len(uncached) // (workers * 4)))
+            chunks = [uncached[i:i + size] for i in range(0, len(uncached), size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                                     initargs=(self._rules(),)) as pool:
+                for chunk, results in zip(chunks, pool.map(_analyze_texts_in_worker, chunks)):
+                    for text, result in zip(chunk, results):
+                        analysed[text] = result
+                        if result.get("success"):
+                            intent = result["intent"]
+                            computed.append((text, CoreTaskIntent(**intent)))
+                            self.core_intent_cache.put(text, replace(
+                                computed[-1][1], entities=copy.deepcopy(intent["entities"])))
+        for text in unique:
+            if text not in analysed:
+                analysed[text] = self._analyze_intent_core({"text": text, "_store": False})
+                if text in pending and analysed[text].get("success"):
+                    computed.append((text, CoreTaskIntent(**analysed[text]["intent"])))
+        self._store_put(computed)  # one transaction for the whole batch
+        
+        results: List[Dict[str, Any]] = []
+        for text in texts:
+            intent_result = analysed.get(text) if isinstance(text, str) and text else None
+            if intent_result is None:
+                results.append({"success": False, "error": TEXT_INPUT_REQUIRED_ERROR})
+            elif not intent_result.get("success"):
+                results.append(intent_result)
+            else:
+                intent = dict(intent_result["intent"], entities=copy.deepcopy(intent_result["intent"]["entities"]))
+                results.append(self._build_parse_response(text, CoreTaskIntent(**intent), target_agent))
+        
+        elapsed = time.perf_counter() - started
+        failed = sum(1 for r in results if not r.get("success"))
+        log_step(f"TaskLinguistCore parsed batch of {len(texts)} ({len(unique)} distinct) in {elapsed:.3f}s")
+        return {
+            "success": failed == 0,
+            "core_mode": True,
+            "version": self.version,
+            "results": results,
+            "tasks": [r.get("task") for r in results],
+            "statistics": {
+                "texts": len(texts),
+                "distinct": len(unique),
+                "cached": len(unique) - len(uncached),
+                "failed": failed,
+                "workers": workers if pooled else 1,
+                "elapsed": round(elapsed, 4),
+                "texts_per_second": round(len(texts) / elapsed, 1) if elapsed > 0 else 0.0
+            }
+        }
     
     def _analyze_intent_core(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -234,15 +447,19 @@ class TaskLinguistCore(BaseAgent):
                 return {"success": False, "error": TEXT_INPUT_REQUIRED_ERROR}
             
             # Check basic cache first
-            cache_key = hashlib.md5(text.encode()).hexdigest()
-            if cache_key in self.core_intent_cache:
-                cached_intent = self.core_intent_cache[cache_key]
+            cached_intent = self.core_intent_cache.get(text)
+            if cached_intent is None:
+                cached_intent = self._store_get(text)
+                if cached_intent is not None:
+                    self.core_intent_cache.put(text, replace(cached_intent))
+            if cached_intent is not None:
                 return {
                     "success": True,
                     "intent": {
                         "intent_type": cached_intent.intent_type,
                         "confidence": cached_intent.confidence,
-                        "entities": cached_intent.entities,
+                        # Copy so callers never mutate the shared cached entry
+                        "entities": copy.deepcopy(cached_intent.entities),
                         "agent_target": cached_intent.agent_target,
                         "priority": cached_intent.priority,
                         "complexity": cached_intent.complexity,
@@ -252,15 +469,12 @@ class TaskLinguistCore(BaseAgent):
                     "core_mode": True
                 }
             
-            # Core pattern-based intent recognition
-            intent_scores: Dict[str, float] = {}
-            for intent_type, patterns in self.core_intent_patterns.items():
-                score = 0
-                for pattern in patterns:
-                    if re.search(pattern, text.lower()):
-                        score += 1
-                if score > 0:
-                    intent_scores[intent_type] = score / len(patterns)
+            # Core pattern-based intent recognition (all patterns and keywords in one pass)
+            scan = self._matcher.scan(text)
+            intent_scores: Dict[str, float] = {
+                intent_type: score / len(self.core_intent_patterns[intent_type])
+                for intent_type, score in scan.intents.items()
+            }
             
             # Determine primary intent
             if intent_scores:
@@ -271,16 +485,16 @@ class TaskLinguistCore(BaseAgent):
                 confidence = 0.5
             
             # Extract basic entities
-            entities = self._extract_core_entities(text)
+            entities = self._extract_core_entities(text, scan.keywords)
             
             # Assess complexity using core indicators
-            complexity = self._assess_core_complexity(text)
+            complexity = self._assess_core_complexity(text, scan.keywords)
             
             # Suggest target agent using core capabilities
             agent_target = self._suggest_core_agent_for_intent(primary_intent, entities)
             
             # Estimate priority using core logic
-            priority = self._estimate_core_priority(text, primary_intent)
+            priority = self._estimate_core_priority(text, primary_intent, scan.keywords)
             
             # Estimate execution time using core calculations
             estimated_time = self._estimate_core_execution_time(complexity, primary_intent)
@@ -296,8 +510,10 @@ class TaskLinguistCore(BaseAgent):
                 estimated_time=estimated_time
             )
             
-            # Cache the result for performance
-            self.core_intent_cache[cache_key] = intent
+            # Cache the result for performance (entities copied: the response dict is handed out)
+            self.core_intent_cache.put(text, replace(intent, entities=copy.deepcopy(entities)))
+            if input_data.get("_store", True):
+                self._store_put([(text, intent)])
             
             return {
                 "success": True,
@@ -317,54 +533,54 @@ class TaskLinguistCore(BaseAgent):
         except Exception as e:
             return {"success": False, "error": f"Core intent analysis failed: {e}"}
     
-    def _extract_core_entities(self, text: str) -> Dict[str, Any]:
+    def _extract_core_entities(self, text: str, keywords: Optional[Set[str]] = None) -> Dict[str, Any]:
         """
         Extract entities from text using basic pattern matching.
         Core functionality for open source users.
+        ``keywords`` are the indicator keywords found in the text, if already scanned.
         """
+        if keywords is None:
+            keywords = self._matcher.keywords(text)
         entities: Dict[str, Any] = {}
         
         # File patterns - basic detection
-        file_patterns = r'\b\w+\.\w+\b'
-        files = re.findall(file_patterns, text)
+        files = _FILE_PATTERN.findall(text)
         if files:
             entities["files"] = files
         
         # Programming languages - core set
-        core_languages = ["python", "javascript", "java", "c++", "c#", "go", "rust", "typescript"]
-        found_languages = [lang for lang in core_languages if lang.lower() in text.lower()]
+        found_languages = [lang for lang in self.core_entity_keywords["languages"] if lang.lower() in keywords]
         if found_languages:
             entities["languages"] = found_languages
         
         # Technologies/frameworks - basic set
-        core_technologies = ["react", "vue", "angular", "django", "flask", "express", "spring", "docker"]
-        found_tech = [tech for tech in core_technologies if tech.lower() in text.lower()]
+        found_tech = [tech for tech in self.core_entity_keywords["technologies"] if tech.lower() in keywords]
         if found_tech:
             entities["technologies"] = found_tech
         
         # Numbers (for priorities, quantities, etc.)
-        numbers = re.findall(r'\b\d+\b', text)
+        numbers = _NUMBER_PATTERN.findall(text)
         if numbers:
             entities["numbers"] = [int(n) for n in numbers]
         
         # Action verbs - core set
-        core_action_verbs = ["create", "build", "test", "deploy", "fix", "update", "delete", "analyze"]
-        found_actions = [verb for verb in core_action_verbs if verb.lower() in text.lower()]
+        found_actions = [verb for verb in self.core_entity_keywords["actions"] if verb.lower() in keywords]
         if found_actions:
             entities["actions"] = found_actions
         
         return entities
     
-    def _assess_core_complexity(self, text: str) -> str:
+    def _assess_core_complexity(self, text: str, keywords: Optional[Set[str]] = None) -> str:
         """
         Assess task complexity using core indicators.
         Basic complexity assessment for open source users.
         """
-        text_lower = text.lower()
+        if keywords is None:
+            keywords = self._matcher.keywords(text)
         
         # Check for core complexity indicators
         for complexity, indicators in self.core_complexity_indicators.items():
-            if any(indicator in text_lower for indicator in indicators):
+            if any(indicator in keywords for indicator in indicators):
                 return complexity
         
         # Length-based assessment fallback
@@ -405,27 +621,18 @@ class TaskLinguistCore(BaseAgent):
         # Default to engineer for general tasks
         return "engineer"
     
-    def _estimate_core_priority(self, text: str, intent_type: str) -> int:
+    def _estimate_core_priority(self, text: str, intent_type: str, keywords: Optional[Set[str]] = None) -> int:
         """
         Estimate task priority using core logic.
         Basic priority estimation for open source users.
         """
-        text_lower = text.lower()
-        
-        # High priority indicators
-        urgent_words = ["urgent", "critical", "emergency", "asap", "immediately", "now"]
-        if any(word in text_lower for word in urgent_words):
-            return 9
-        
-        # Medium-high priority
-        important_words = ["important", "high", "priority", "soon", "quickly"]
-        if any(word in text_lower for word in important_words):
-            return 7
+        if keywords is None:
+            keywords = self._matcher.keywords(text)
         
-        # Low priority indicators
-        low_words = ["later", "when possible", "low priority", "optional"]
-        if any(word in text_lower for word in low_words):
-            return 3
+        # Urgent (9), important (7), then low (3) indicators
+        for priority, words in self.core_priority_indicators.items():
+            if any(word in keywords for word in words):
+                return priority
         
         # Intent-based priority for core intents
         high_priority_intents = ["security", "testing"]
@@ -667,21 +874,18 @@ class TaskLinguistCore(BaseAgent):
         providing core functionality for open source users.
         """
         try:
-            # Quick core analysis for legacy mode
-            intent_type = "general"
-            for pattern_type, patterns in self.core_intent_patterns.items():
-                if any(re.search(pattern, prompt.lower()) for pattern in patterns):
-                    intent_type = pattern_type
-                    break
+            # Quick core analysis for legacy mode: first intent with any matching pattern
+            scan = self._matcher.scan(prompt)
+            intent_type = next(iter(scan.intents), "general")
             
             # Basic entity extraction
-            entities = self._extract_core_entities(prompt)
+            entities = self._extract_core_entities(prompt, scan.keywords)
             
             # Generate core task
             from typing import Dict, Any
             task: Dict[str, Any] = {
                 "id": f"core_legacy_{uuid.uuid4().hex[:8]}",
-                "priority": self._estimate_core_priority(prompt, intent_type),
+                "priority": self._estimate_core_priority(prompt, intent_type, scan.keywords),
                 "depends_on": [],
                 "agent_id": self._suggest_core_agent_for_intent(intent_type, entities) or "engineer",
                 "function": self._generate_core_function_name(intent_type, entities),
@@ -719,6 +923,17 @@ class TaskLinguistCore(BaseAgent):
                 "metadata": {"core_edition": True}
             }
     
+    def _cache_statistics(self) -> Dict[str, Any]:
+        stats = self.core_intent_cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "cache_size": stats["size"],
+            "cache_hits": stats["hits"],
+            "cache_misses": stats["misses"],
+            "cache_evictions": stats["evictions"],
+            "cache_hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0
+        }
+
     def _clear_core_cache(self) -> Dict[str, Any]:
         """Clear the core intent recognition cache."""
         cache_size = len(self.core_intent_cache)
@@ -743,7 +958,8 @@ class TaskLinguistCore(BaseAgent):
             "edition": "Open Core",
             "description": self.description,
             "statistics": {
-                "cache_size": len(self.core_intent_cache)
+                **self._cache_statistics(),
+                "intent_store": self.intent_store.stats() if self.intent_store is not None else None
             },
             "capabilities": {
                 "supported_intents": list(self.core_intent_patterns.keys()),
@@ -767,8 +983,10 @@ class TaskLinguistCore(BaseAgent):
                 "Professional support"
             ],
             "configuration": {
-                "max_cache_size": 100,  # Limited for core
-                "cache_enabled": True,
+                "max_cache_size": self.core_intent_cache.max_size,
+                "cache_ttl": self.core_intent_cache.ttl,
+                "cache_enabled": self.core_intent_cache.max_size > 0,
+                "persistent_cache": self.intent_store is not None,
                 "ai_decomposition": False,
                 "enterprise_features": False
             },
@@ -5,6 +5,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 import subprocess
 from typing import Dict, Any, List, Union
+from src.artifact_writer import get_writer
 from src.base_agent import BaseAgent
 
 
@@ -45,18 +46,14 @@ class TesterAgentClass(BaseAgent):
         # Write artifact summary (best-effort)
         try:
             from pathlib import Path
-            import json, time
             if output_dir:
                 # Use task-specific directory
                 out_dir = Path(output_dir) / "tests"
             else:
                 # Fall back to default behavior
                 out_dir = Path.cwd() / "output" / "tests"
-            out_dir.mkdir(parents=True, exist_ok=True)
-            stem = f"test_{int(time.time())}"
-            with open(out_dir / f"{stem}.json", "w", encoding="utf-8") as f:
-                json.dump(result, f, indent=2)
-            result["artifact_path"] = str(out_dir / f"{stem}.json")
+            writer = get_writer()
+            result["artifact_path"] = writer.write_json(writer.unique_path(out_dir, "test"), result)
         except Exception:
             pass
         return result
@@ -0,0 +1,11 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """Pipelines write under ``./output``: run every test from its own temp dir, not the repo root."""
+    monkeypatch.chdir(tmp_path)
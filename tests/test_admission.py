@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import threading
+import time
+
+import pytest
+
+from src.admission import AdmissionController, AdmissionRejected
+
+
+def test_queue_then_reject_with_retry_after() -> None:
+    gate = AdmissionController(max_active=1, max_queue=1)
+    gate.acquire()
+    gate.release(duration=4.0)  # seeds the duration history
+    gate.acquire()
+    waiter_done = threading.Event()
+
+    def waiter() -> None:
+        with gate.slot():
+            waiter_done.set()
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    deadline = time.time() + 2
+    while gate.stats()["queued"] != 1 and time.time() < deadline:
+        time.sleep(0.01)
+    with pytest.raises(AdmissionRejected) as info:
+        gate.acquire()
+    # one queued request ahead, one slot, ~4s per pipeline -> 8s
+    assert info.value.retry_after == 8
+    stats = gate.stats()
+    assert (stats["active"], stats["queued"], stats["rejected"]) == (1, 1, 1)
+
+    gate.release()
+    t.join(2)
+    assert waiter_done.is_set()
+    stats = gate.stats()
+    assert (stats["active"], stats["queued"], stats["admitted"], stats["completed"]) == (0, 0, 3, 3)
+
+
+def test_unbounded_wait_and_timeout() -> None:
+    gate = AdmissionController(max_active=1, max_queue=0)
+    gate.acquire()
+    with pytest.raises(AdmissionRejected):
+        gate.acquire()
+    with pytest.raises(AdmissionRejected):
+        gate.acquire(enforce_queue_limit=False, timeout=0.05)
+    gate.release()
+    gate.acquire(enforce_queue_limit=False, timeout=0.05)
+    gate.release()
+
+
+def test_try_acquire_takes_only_a_free_slot() -> None:
+    gate = AdmissionController(max_active=1, max_queue=1)
+    assert gate.try_acquire() and not gate.try_acquire()
+    gate.release()
+    assert gate.try_acquire()
+    assert gate.stats()["admitted"] == 2
+
+
+def test_ensure_room_caps_fan_out_and_rejects_when_full() -> None:
+    gate = AdmissionController(max_active=2, max_queue=3)
+    assert gate.ensure_room(50) == 5  # capped at what an idle server holds
+    gate.acquire()
+    gate.acquire()
+    assert gate.ensure_room(3) == 3
+    with pytest.raises(AdmissionRejected):
+        gate.ensure_room(4)
+    assert gate.stats()["rejected"] == 1
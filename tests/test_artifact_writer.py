@@ -0,0 +1,107 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from src.artifact_writer import ArtifactWriter, WriteStats, get_writer
+from src.run_context import use_context
+from src.supervisor import Supervisor
+from src.tester_agent import TesterAgentClass
+
+
+def test_sync_writes_are_atomic_compact_and_uniquely_named(tmp_path):
+    writer = ArtifactWriter(mode="sync", fsync="full", compact=True)
+    names = {writer.unique_path(tmp_path, "test").name for _ in range(100)}
+    assert len(names) == 100
+
+    target = tmp_path / "nested" / "report.json"
+    writer.write_json(target, {"b": [1, 2], "a": "é"})
+    assert target.read_text(encoding="utf-8") == '{"b":[1,2],"a":"é"}'
+    assert os.listdir(target.parent) == ["report.json"]  # no temp files left behind
+
+    (tmp_path / "blocked").write_text("a file, not a directory")
+    with pytest.raises(OSError):
+        writer.write_text(tmp_path / "blocked" / "x.json", "{}")
+    assert writer.stats()["errors"] == 1
+
+
+def test_write_behind_is_visible_before_it_lands_and_counted_per_task(tmp_path):
+    writer = ArtifactWriter(mode="behind")
+    gate = threading.Event()
+    replace = writer._replace
+    writer._replace = lambda target, data: gate.wait(5) and replace(target, data)  # type: ignore[method-assign]
+
+    stats = WriteStats()
+    report: Dict[str, Any] = {"status": "ok"}
+    with use_context(artifact_stats=stats):
+        path = writer.write_json(tmp_path / "report.json", report)
+        writer.write_text(tmp_path / "notes.md", "# notes")
+    report["status"] = "changed later"  # encoded at submission
+
+    assert not Path(path).exists() and writer.exists(path)
+    assert json.loads(writer.read_text(path)) == {"status": "ok"}
+    assert stats.as_dict()["pending"] == 2 and not stats.wait(timeout=0.05)
+
+    gate.set()
+    assert writer.settle(stats, timeout=5)
+    assert json.loads(Path(path).read_text(encoding="utf-8")) == {"status": "ok"}
+    summary = stats.as_dict()
+    assert (summary["files"], summary["pending"], summary["errors"]) == (2, 0, 0)
+    assert summary["bytes"] == Path(path).stat().st_size + len("# notes") and summary["write_ms"] > 0
+    writer.close()
+
+
+def test_wait_for_waits_only_on_the_given_paths(tmp_path):
+    writer = ArtifactWriter(mode="behind")
+    gate = threading.Event()
+    replace = writer._replace
+
+    def gated(target: str, data: bytes) -> None:
+        if target.endswith("slow.json"):
+            gate.wait(5)
+        replace(target, data)
+
+    writer._replace = gated  # type: ignore[method-assign]
+
+    fast = writer.write_text(tmp_path / "fast.json", "{}")
+    writer.write_text(tmp_path / "slow.json", "{}")
+    assert writer.wait_for([fast], timeout=5) and Path(fast).is_file()
+    assert not writer.flush(timeout=0.05)  # the unrelated write is still queued
+    assert not writer.wait_for([tmp_path / "slow.json"], timeout=0.05)
+    gate.set()
+    assert writer.wait_for([tmp_path / "slow.json"], timeout=5) and (tmp_path / "slow.json").is_file()
+    writer.close()
+
+
+def test_pipeline_reports_artifact_io_and_keeps_every_report(tmp_path):
+    resp = Supervisor().process_request("Generate a simple Python function that returns 42")
+    io = resp["result"]["artifact_io"]
+    assert io["files"] > 0 and io["bytes"] > 0 and io["pending"] == 0
+
+    tester = TesterAgentClass()
+    paths = {tester.run({"type": "syntax_check", "target": "x = 1", "output_dir": str(tmp_path)})["artifact_path"]
+             for _ in range(3)}  # same second, same directory
+    get_writer().flush()
+    assert len(paths) == 3 and all(Path(p).is_file() for p in paths)
+
+
+def test_persist_false_keeps_every_artifact_in_the_response(tmp_path):
+    sup = Supervisor()
+    resp = sup.process_request("Generate a python function that returns 42", persist=False)
+    result = resp["result"]
+    assert result["persist"] == "none" and not (tmp_path / "output").exists()
+    files = result["artifacts"]
+    assert any(name.endswith("codegen/main.py") for name in files)
+    assert any("/tests/test_" in name for name in files) and any(name.endswith("/spec.json") for name in files)
+    assert result["artifact_io"]["files"] >= len(files) and result["artifact_io"]["bytes"] > 0  # overwrites count
+
+    final = sup.process_request({"description": "Generate a python function that returns 7", "persist": "final"})
+    bundle = json.loads(Path(final["result"]["bundle_path"]).read_text(encoding="utf-8"))
+    assert bundle["files"] == final["result"]["artifacts"]
+    assert [p.name for p in (tmp_path / "output").rglob("*") if p.is_file()] == ["bundle.json"]
+    assert sup.process_request("x", persist="sometimes")["success"] is False
@@ -0,0 +1,74 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import importlib
+import threading
+from typing import Any, Dict, List
+
+
+class FakeSupervisor:
+    """Records prompts; blocks until every expected caller has started."""
+
+    def __init__(self, barrier: threading.Barrier | None = None) -> None:
+        self.barrier = barrier
+        self.prompts: List[Any] = []
+
+    def process_request(self, request: Any, use_cache: bool = True) -> Dict[str, Any]:
+        self.prompts.append(request)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        return {"success": True, "result": {"result": {"pipeline_artifacts": {"task_slug": str(request)[:20]}}}}
+
+
+def _import_main(monkeypatch: Any) -> Any:
+    # main.py defaults ORBITSUITE_LLM_SERVER_URL on import; keep the test env untouched
+    monkeypatch.setenv("ORBITSUITE_LLM_SERVER_URL", "http://127.0.0.1:9")
+    return importlib.import_module("main")
+
+
+def test_primary_and_secondary_run_concurrently(monkeypatch: Any) -> None:
+    main = _import_main(monkeypatch)
+    barrier = threading.Barrier(2)  # deadlocks (times out) if run sequentially
+    primary, secondary = FakeSupervisor(barrier), FakeSupervisor(barrier)
+    result = main._run_with_autobuild(primary, "Build a calculator", secondary_supervisor=secondary)
+    assert primary.prompts == ["Build a calculator"]
+    assert secondary.prompts == ["Build a calculator and produce an executable exe"]
+    assert result["autobuild"]["success"] is True
+    assert not barrier.broken
+    assert [p["stage"] for p in result["progress"]] == ["secondary_start", "primary_done", "secondary_done"]
+
+
+def test_secondary_reuses_primary_for_exe_requests(monkeypatch: Any) -> None:
+    main = _import_main(monkeypatch)
+    primary, secondary = FakeSupervisor(), FakeSupervisor()
+    result = main._run_with_autobuild(primary, "Build a calculator executable", secondary_supervisor=secondary)
+    assert primary.prompts == ["Build a calculator executable"]
+    assert secondary.prompts == []
+    assert result["autobuild"]["task_slug"] == "Build a calculator e"
+
+
+def test_secondary_takes_its_own_admission_slot(monkeypatch: Any) -> None:
+    main = _import_main(monkeypatch)
+    from src.admission import AdmissionController
+
+    admission = AdmissionController(max_active=1, max_queue=0)
+    seen: List[int] = []
+
+    class Recording(FakeSupervisor):
+        def process_request(self, request: Any, use_cache: bool = True) -> Dict[str, Any]:
+            seen.append(admission.stats()["active"])
+            return super().process_request(request, use_cache)
+
+    with admission.slot():  # the caller's slot for the primary; none left for the secondary
+        result = main._run_with_autobuild(Recording(), "Build a calculator",
+                                          secondary_supervisor=Recording(), admission=admission)
+    assert seen == [1, 1]
+    assert [p["stage"] for p in result["progress"]] == ["primary_done", "secondary_start", "secondary_done"]
+
+    admission = AdmissionController(max_active=2, max_queue=0)
+    barrier = threading.Barrier(2)
+    with admission.slot():
+        result = main._run_with_autobuild(FakeSupervisor(barrier), "Build a calculator",
+                                          secondary_supervisor=FakeSupervisor(barrier), admission=admission)
+    assert not barrier.broken and result["progress"][0]["stage"] == "secondary_start"
+    assert admission.stats()["active"] == 0 and admission.stats()["admitted"] == 2
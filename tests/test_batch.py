@@ -0,0 +1,113 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import http.client
+import json
+import threading
+import time
+from typing import Any, Dict, List
+
+from src.batching import iter_completed, validate_batch_items
+from src.server import serve
+from src.server.http_keepalive import BoundedThreadingHTTPServer
+from src.supervisor import Supervisor
+
+
+def test_iter_completed_streams_in_completion_order_with_cap() -> None:
+    lock = threading.Lock()
+    active: List[int] = [0, 0]  # current, peak
+
+    def work(delay: float) -> float:
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(delay)
+        with lock:
+            active[0] -= 1
+        return delay
+
+    out = list(iter_completed(work, [0.3, 0.05, 0.1, 0.05], max_parallel=2))
+    assert sorted(i for i, _ in out) == [0, 1, 2, 3]
+    assert out[0][0] == 1 and out[-1][0] == 0  # slow first item finishes last
+    assert active[1] == 2
+
+
+def test_validate_batch_items() -> None:
+    assert validate_batch_items(["a", {"description": "b"}]) is None
+    assert validate_batch_items([]) is not None
+    assert validate_batch_items(["ok", {"type": "codegen"}]) == \
+        "item 1 must be a non-empty string or a task dict with a description"
+
+
+def test_batch_endpoint_streams_ndjson(monkeypatch: Any) -> None:
+    monkeypatch.delenv("DEMO_MODE_ENABLED", raising=False)
+    sup = Supervisor()
+
+    def fake(request: Any) -> Dict[str, Any]:
+        text = request if isinstance(request, str) else request["description"]
+        time.sleep(0.2 if text == "slow" else 0.01)
+        return {"success": text != "bad", "task_id": text, "result": {"echo": text}}
+
+    monkeypatch.setattr(sup, "_process_uncached", fake)
+    monkeypatch.setattr(serve, "_supervisor_instance", sup)
+    server = BoundedThreadingHTTPServer(("127.0.0.1", 0), serve.CoreHandler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        body = {"items": ["slow", "fast", {"description": "bad"}], "max_parallel": 3,
+                "fields": ["index", "success", "task_id"]}
+        conn.request("POST", "/process/batch", body=json.dumps(body), headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        assert resp.status == 200 and resp.getheader("Content-Type") == "application/x-ndjson"
+        lines = [json.loads(line) for line in resp.read().decode().splitlines()]
+        records, summary = lines[:-1], lines[-1]
+        assert records[-1] == {"index": 0, "success": True, "task_id": "slow"}  # finished last
+        assert sorted(r["index"] for r in records) == [0, 1, 2]
+        assert (summary["done"], summary["total"], summary["failed"]) == (True, 3, 1)
+
+        conn.request("POST", "/process/batch", body=json.dumps([]))  # same connection, bad batch
+        resp = conn.getresponse()
+        assert resp.status == 400 and json.loads(resp.read())["error"] == "INVALID_BATCH"
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_batch_endpoint_rejects_when_saturated(monkeypatch: Any) -> None:
+    from src.admission import AdmissionController
+
+    monkeypatch.delenv("DEMO_MODE_ENABLED", raising=False)
+    gate = AdmissionController(max_active=1, max_queue=1)
+    gate.acquire()  # the only slot is busy; one request may still queue
+    monkeypatch.setattr(serve, "_admission", gate)
+    server = BoundedThreadingHTTPServer(("127.0.0.1", 0), serve.CoreHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        conn.request("POST", "/process/batch", body=json.dumps({"items": ["a", "b"], "max_parallel": 2}))
+        resp = conn.getresponse()
+        assert resp.status == 429 and resp.getheader("Retry-After")
+        assert json.loads(resp.read())["error"] == "BUSY"
+        conn.close()
+        assert (gate.queued, gate.rejected) == (0, 1)
+    finally:
+        gate.release()
+        server.shutdown()
+        server.server_close()
+
+
+def test_orchestrator_task_batch_runs_in_order(monkeypatch: Any) -> None:
+    from src.orchestrator_agent import OrchestratorAgent
+
+    orch = OrchestratorAgent()
+    seen: List[Any] = []
+    monkeypatch.setattr(orch, "_execute_single_task", lambda task: seen.append(
+        (task["description"], threading.current_thread().name)) or {"success": True})
+    tasks = [{"description": "generate a parser"}, {"description": "test the parser output"},
+             {"description": "generate a parser"}]
+    result = orch.dispatch({"tasks": tasks})
+    assert [d for d, _ in seen] == [t["description"] for t in tasks]
+    assert {name for _, name in seen} == {threading.current_thread().name}  # no pool threads
+    assert [r["batch_index"] for r in result["results"]] == [0, 1, 2]
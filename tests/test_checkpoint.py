@@ -0,0 +1,137 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import gzip
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import pytest
+
+from src import io_jsonl
+from src.checkpoint import CheckpointJournal
+from src.io_runner import run_io
+from src.supervisor import Supervisor
+
+
+def test_journal_replays_done_and_in_flight_and_ignores_torn_lines(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    with CheckpointJournal(path) as journal:
+        for key in ("a", "b", "c", "d"):
+            journal.start(key)
+        journal.complete("a", "out/a.json", status="result")
+        journal.fail("b", "boom")
+        journal.mark(offset=10, lines=[1, 2])
+        journal.mark(offset=20, lines=[3])
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "done", "id": "c"')  # the process died mid-write
+
+    resumed = CheckpointJournal(path, resume=True)
+    assert resumed.done_ids() == ["a"]
+    assert resumed.record("a")["loc"] == "out/a.json"
+    assert sorted(resumed.resumed_in_flight) == ["c", "d"]
+    assert resumed.mark_state == {"offset": 20, "lines": [1, 2, 3]}
+    resumed.close()
+    with open(path, encoding="utf-8") as f:
+        assert len(f.readlines()) == 4  # compacted: one done, two starts, one merged mark
+
+    assert CheckpointJournal(path).done_ids() == []  # a fresh run starts over
+
+
+def test_execute_workflow_resumes_finished_tasks(tmp_path, monkeypatch):
+    sup = Supervisor()
+    orchestrator = sup.agents["orchestrator"]
+    calls: List[str] = []
+    flaky = {"third"}
+
+    def fake(task: Dict[str, Any]) -> Dict[str, Any]:
+        calls.append(task["description"])
+        if task["description"] in flaky:
+            return {"success": False, "error": "flaky"}
+        return {"success": True, "task_id": task["description"]}
+
+    monkeypatch.setattr(orchestrator, "_execute_single_task", fake)
+    tasks = [{"description": d} for d in ("first", "second", "third")]
+    checkpoint = str(tmp_path / "workflow.jsonl")
+
+    first = sup.execute_workflow(tasks, checkpoint=checkpoint)
+    assert first["successful_tasks"] == 2 and os.path.exists(checkpoint)
+
+    calls.clear()
+    flaky.clear()
+    second = sup.execute_workflow(tasks, checkpoint=checkpoint, resume=True)
+    assert calls == ["third"]  # failed tasks are retried, finished ones restored
+    assert second["success"] and second["resumed_tasks"] == 2
+    assert [r["task_id"] for r in second["results"]] == ["first", "second", "third"]
+    assert not os.path.exists(checkpoint)
+
+
+class CrashingSupervisor:
+    """Raises a non-Exception on ``crash``, like a killed worker, so the run aborts."""
+
+    calls: List[str] = []
+
+    def process_request(self, request):
+        CrashingSupervisor.calls.append(request)
+        if request == "crash":
+            time.sleep(0.2)  # the earlier inputs are journaled first
+            raise KeyboardInterrupt
+        return {"success": True, "echo": request}
+
+
+def test_run_io_resume_skips_inputs_finished_before_a_crash(tmp_path):
+    plain = tmp_path / "input" / "plain"
+    plain.mkdir(parents=True)
+    for i, text in enumerate(["one", "two", "three", "crash"]):
+        (plain / f"p{i}.txt").write_text(text)
+
+    CrashingSupervisor.calls = []
+    with pytest.raises(KeyboardInterrupt):
+        run_io(str(tmp_path), supervisor_factory=CrashingSupervisor)
+    assert not (tmp_path / "output" / "manifest.json").exists()  # nothing saved but the journal
+    assert (tmp_path / "output" / "checkpoint.jsonl").exists()
+
+    (plain / "p3.txt").write_text("four")
+    CrashingSupervisor.calls = []
+    stats = run_io(str(tmp_path), supervisor_factory=CrashingSupervisor, resume=True)
+    assert CrashingSupervisor.calls == ["four"]
+    assert (stats["resumed"], stats["processed"]) == (3, 1)
+    assert not (tmp_path / "output" / "checkpoint.jsonl").exists()
+    assert run_io(str(tmp_path), supervisor_factory=CrashingSupervisor)["unchanged"] == 4
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_stream_jsonl_resumes_after_the_last_flushed_line(tmp_path, monkeypatch, compress):
+    monkeypatch.setattr(io_jsonl, "GZIP_FLUSH_SECONDS", 0.0)
+    source = tmp_path / "big.jsonl"
+    source.write_text("".join(json.dumps(f"prompt {i}") + "\n" for i in range(1, 21)))
+    output = io_jsonl.results_path(str(tmp_path), str(source), compress)
+    seen: List[int] = []
+
+    def run(fail_at: int) -> Dict[str, int]:
+        def handle(number: int, text: str) -> Dict[str, Any]:
+            if number == fail_at:
+                raise KeyboardInterrupt
+            seen.append(number)
+            return {"line": number, "success": number != 3}
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return io_jsonl.stream_jsonl(str(source), output, lambda n, t: pool.submit(handle, n, t), window=1,
+                                         compress=compress, checkpoint=output + ".ckpt", resume=True)
+
+    with pytest.raises(KeyboardInterrupt):
+        run(fail_at=8)
+    assert seen == list(range(1, 8))
+    state = CheckpointJournal(output + ".ckpt", resume=True)
+    assert list(state.mark_state) == ["offset"]  # no per-line bookkeeping in the journal
+    state.close()
+    with pytest.raises(KeyboardInterrupt):
+        run(fail_at=14)  # a second interruption stacks on the first
+    assert run(fail_at=0) == {"lines": 20, "failed": 1}  # the failure from the first run still counts
+    assert seen == list(range(1, 21))  # no line ran twice
+
+    opener = gzip.open if compress else open
+    with opener(output, "rt", encoding="utf-8") as f:
+        assert sorted(json.loads(line)["line"] for line in f) == list(range(1, 21))
+    assert not os.path.exists(output + ".ckpt")
@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import threading
+from typing import Any, Dict, List
+
+import pytest
+
+from src import demo_mode
+from src.base_agent import BaseAgent
+from src.llm_agent import LLMAgent
+from src.run_context import current_context, use_context
+
+
+def test_use_context_nests_and_restores() -> None:
+    assert current_context().request_id == "default"
+    with use_context(session_id="a") as outer:
+        with use_context(engineering_root="/tmp/x") as inner:
+            assert inner.session_id == "a" and inner.engineering_root == "/tmp/x"
+        assert current_context() is outer
+    assert current_context().session_id == "default"
+
+
+def test_base_agent_result_is_per_thread() -> None:
+    class Echo(BaseAgent):
+        def run(self, input_data: Any) -> Any:
+            barrier.wait(timeout=2)  # both threads are inside dispatch at once
+            return {"success": True, "value": input_data}
+
+    barrier = threading.Barrier(2)
+    agent = Echo(name="echo")
+    seen: Dict[int, Any] = {}
+
+    def worker(n: int) -> None:
+        agent.dispatch(n)
+        seen[n] = agent.result["value"]
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(3)
+    assert seen == {1: 1, 2: 2}
+
+
+def test_context_progress_does_not_cross_threads() -> None:
+    barrier = threading.Barrier(2)
+    events: Dict[str, List[str]] = {"a": [], "b": []}
+
+    def worker(name: str) -> None:
+        with use_context(progress_cb=lambda e: events[name].append(e["tag"])):
+            barrier.wait(timeout=2)
+            cb = current_context().progress_cb
+            assert cb is not None
+            cb({"tag": name})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in ("a", "b")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(3)
+    assert events == {"a": ["a"], "b": ["b"]}
+
+
+def test_llm_agent_keeps_sessions_apart(monkeypatch: pytest.MonkeyPatch) -> None:
+    agent = LLMAgent()
+    agent.server_url = "http://127.0.0.1:9"
+    monkeypatch.setattr(agent, "_server_chat_completion", lambda msgs: (f"{len(msgs)} msgs", {}))
+    agent.run({"messages": [{"role": "user", "content": "hi"}], "session_id": "s1"})
+    agent.run({"messages": [{"role": "user", "content": "again"}], "session_id": "s1"})
+    out = agent.run({"messages": [{"role": "user", "content": "hi"}], "session_id": "s2"})
+    assert out["output"] == "1 msgs"
+    assert len(agent._sessions["s1"]) == 4
+    assert agent._messages == []
+
+
+def test_demo_cap_holds_under_parallel_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DEMO_MODE_ENABLED", "1")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(demo_mode, "_call_count", 0)
+    monkeypatch.setattr(demo_mode, "_relay_request", lambda text: "ok")
+    results: List[Dict[str, Any]] = []
+    lock = threading.Lock()
+
+    def call() -> None:
+        res = demo_mode.process_demo_request("x")
+        with lock:
+            results.append(res)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(3)
+    assert sum(1 for r in results if r["success"]) == 2
+    assert sorted(r["call_number"] for r in results if r["success"]) == [1, 2]
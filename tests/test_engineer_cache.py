@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import shutil
+from pathlib import Path
+
+from src.artifact_writer import get_writer
+from src.engineer_agent import EngineerAgent
+
+
+def _analyze(agent, output_dir, description="Build a todo web app with user login"):
+    return agent.dispatch({"command": "analyze", "description": description,
+                           "project_type": "web_application", "output_dir": str(output_dir)})
+
+
+def test_repeat_analysis_reuses_result_and_links_artifacts(tmp_path, monkeypatch):
+    agent = EngineerAgent()
+    calls = []
+    compute = agent._compute_analysis
+    monkeypatch.setattr(agent, "_compute_analysis", lambda data: calls.append(1) or compute(data))
+
+    first = _analyze(agent, tmp_path / "a")
+    again = _analyze(agent, tmp_path / "a", "Build  a todo web app\nwith user login")  # whitespace-insensitive
+    assert (first["cache"], again["cache"], again["artifacts"]) == ("miss", "hit", "reused")
+    assert again["artifact_dir"] == first["artifact_dir"] and len(calls) == 1
+
+    other = _analyze(agent, tmp_path / "b")
+    assert other["artifacts"] == "linked" and Path(other["artifact_dir"]).parent == tmp_path / "b" / "engineering"
+    assert [Path(f).read_bytes() for f in other["files_written"]] == \
+        [Path(f).read_bytes() for f in first["files_written"]]
+    assert other["core_analysis"] == first["core_analysis"] and len(calls) == 1
+
+    _analyze(agent, tmp_path / "a", "Build a chat app")  # another description misses
+    assert len(calls) == 2 and agent._get_core_status()["analysis_cache"]["hits"] == 2
+
+
+def test_deleted_artifacts_and_plan_mutation_force_fresh_results(tmp_path):
+    agent = EngineerAgent()
+    first = _analyze(agent, tmp_path)
+    get_writer().flush()
+    shutil.rmtree(first["artifact_dir"])
+    again = _analyze(agent, tmp_path)
+    assert again["cache"] == "miss" and get_writer().exists(again["spec_path"])
+
+    plan_input = {"command": "plan_files", "description": "Build a todo web app with user login",
+                  "analysis": again["core_analysis"], "project_type": "web_application", "output_dir": str(tmp_path)}
+    plan = agent.dispatch(plan_input)
+    plan["plan"].append({"path": "extra.py"})  # callers may extend results freely
+    cached = agent.dispatch(plan_input)
+    assert cached["cache"] == "hit" and {"path": "extra.py"} not in cached["plan"]
+    assert get_writer().exists(cached["plan_file"])
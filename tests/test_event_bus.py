@@ -0,0 +1,100 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import http.client
+import threading
+import time
+from typing import Any, List
+
+from src.event_bus import COALESCE, DROP_NEWEST, DROP_OLDEST, EventBus
+from src.job_manager import SUCCEEDED, Job, JobManager
+from src.server import serve
+from src.server.http_keepalive import BoundedThreadingHTTPServer
+
+
+def _drain(sub: Any) -> List[Any]:
+    out = []
+    while True:
+        event = sub.get(timeout=0)
+        if event is None:
+            return out
+        out.append(event)
+
+
+def test_slow_subscriber_policies_never_drop_critical_events() -> None:
+    bus = EventBus(queue_size=2)
+    newest = bus.subscribe("t", policy=DROP_NEWEST)
+    oldest = bus.subscribe("t", policy=DROP_OLDEST)
+    merged = bus.subscribe("t", policy=COALESCE)
+    bus.publish("t", "step", 1, key="a")
+    bus.publish("t", "step", 2, key="b")
+    bus.publish("t", "step", 3, key="a")
+    bus.publish("t", "result", "done", critical=True)
+
+    assert [e["data"] for e in _drain(newest)] == [2, "done"]  # 3 refused; "done" evicts 1
+    assert [e["data"] for e in _drain(oldest)] == [3, "done"]
+    assert [e["data"] for e in _drain(merged)] == [3, "done"]  # "a" coalesced, then oldest evicted
+    assert newest.dropped == oldest.dropped == merged.dropped == 2
+
+
+def test_publish_never_waits_and_late_subscribers_replay() -> None:
+    bus = EventBus(queue_size=4, history=3)
+    stalled = bus.subscribe("job:1")  # never read
+    started = time.time()
+    for i in range(1000):
+        bus.publish("job:1", "progress", i)
+    assert time.time() - started < 1.0
+    assert len(_drain(stalled)) == 4
+
+    bus.close_topic("job:1")
+    late = bus.subscribe("job:1")
+    assert [e["data"] for e in late.events()] == [997, 998, 999]
+    assert late.closed
+    assert bus.subscribe("never", create=False) is None
+    assert bus.stats()["open_topics"] == 0
+
+
+def test_job_events_end_with_terminal_status() -> None:
+    bus = EventBus()
+    jobs = JobManager(workers=1, bus=bus)
+    gate = threading.Event()
+    try:
+        def runner(job: Job):
+            gate.wait(5)
+            job.report("working")
+            return {"success": True}
+        job = jobs.submit(runner)
+        live = jobs.subscribe(job.id)
+        gate.set()
+        events = [e for e in live.events(idle_timeout=5) if e is not None]  # type: ignore[union-attr]
+        assert events[0]["data"]["status"] == "queued"
+        assert [e["data"]["stage"] for e in events if e["type"] == "progress"] == ["started", "working", SUCCEEDED]
+        assert events[-1]["type"] == "status" and events[-1]["data"]["status"] == SUCCEEDED
+        assert jobs.subscribe("missing") is None
+    finally:
+        jobs.shutdown()
+
+
+def test_job_events_endpoint_streams_sse(monkeypatch: Any) -> None:
+    jobs = JobManager(workers=1, bus=EventBus())
+    monkeypatch.setattr(serve, "_job_manager", jobs)
+    server = BoundedThreadingHTTPServer(("127.0.0.1", 0), serve.CoreHandler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        job = jobs.submit(lambda job: {"success": True})
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        conn.request("GET", f"/jobs/{job.id}/events")
+        resp = conn.getresponse()
+        assert resp.status == 200 and resp.getheader("Content-Type") == "text/event-stream"
+        body = resp.read().decode()
+        assert "event: status" in body and f'"status": "{SUCCEEDED}"' in body
+
+        conn.request("GET", "/jobs/nope/events")  # same connection survives the stream
+        resp = conn.getresponse()
+        assert resp.status == 404 and b"UNKNOWN_JOB" in resp.read()
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        jobs.shutdown()
@@ -0,0 +1,157 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import http.client
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Iterator, List
+
+import pytest
+
+from src.server.http_keepalive import BoundedThreadingHTTPServer, KeepAliveHandlerMixin
+from src.server.http_pool import PooledHTTPServer
+
+
+class Handler(KeepAliveHandlerMixin, BaseHTTPRequestHandler):
+    timeout = 1.0
+    threads: List[str] = []
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+        return
+
+    def _reply(self) -> None:
+        Handler.threads.append(threading.current_thread().name)
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == '/stream':
+            self.start_chunked(200, 'text/plain')
+            for part in (b'one,', b'two,', b'three'):
+                self.write_chunk(part)
+            return self.end_chunked()
+        self._reply()
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers.get('Content-Length', '0')))
+        self._reply()
+
+
+def _serve(server: Any) -> Iterator[Any]:
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture()
+def threaded() -> Iterator[Any]:
+    yield from _serve(BoundedThreadingHTTPServer(('127.0.0.1', 0), Handler, max_connections=2))
+
+
+@pytest.fixture()
+def pooled() -> Iterator[Any]:
+    yield from _serve(PooledHTTPServer(('127.0.0.1', 0), Handler, workers=2, fast_workers=2))
+
+
+def test_requests_and_chunked_stream_share_one_connection(threaded: Any) -> None:
+    conn = http.client.HTTPConnection('127.0.0.1', threaded.server_address[1], timeout=5)
+    conn.request('GET', '/a')
+    assert conn.getresponse().read() == b'/a'
+    sock = conn.sock
+    conn.request('GET', '/stream')
+    resp = conn.getresponse()
+    assert resp.getheader('Transfer-Encoding') == 'chunked'
+    assert resp.read() == b'one,two,three'
+    conn.request('GET', '/b')
+    assert conn.getresponse().read() == b'/b'
+    assert conn.sock is sock  # never reconnected
+    conn.close()
+
+
+def test_pipelined_requests_answered_in_order(threaded: Any) -> None:
+    with socket.create_connection(threaded.server_address, timeout=5) as s:
+        s.sendall(b'GET /first HTTP/1.1\r\nHost: x\r\n\r\nGET /second HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n')
+        data = b''
+        while True:
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            data += chunk
+    assert data.count(b'HTTP/1.1 200') == 2
+    assert data.index(b'/first') < data.index(b'/second')
+
+
+def test_idle_timeout_and_connection_cap(threaded: Any) -> None:
+    first = http.client.HTTPConnection('127.0.0.1', threaded.server_address[1], timeout=5)
+    first.request('GET', '/a')
+    resp = first.getresponse()
+    resp.read()
+    assert resp.getheader('Connection') is None  # kept alive: budget of 2 not used up
+
+    second = socket.create_connection(threaded.server_address, timeout=5)
+    second.sendall(b'GET /b HTTP/1.1\r\nHost: x\r\n\r\n')
+    # two open connections exhaust the budget: served, but not kept alive
+    assert b'Connection: close' in second.recv(4096)
+    second.close()
+
+    time.sleep(0.1)
+    third = socket.create_connection(threaded.server_address, timeout=5)
+    fourth = socket.create_connection(threaded.server_address, timeout=5)
+    fourth.sendall(b'GET / HTTP/1.1\r\nHost: x\r\n\r\n')
+    assert fourth.recv(4096).startswith(b'HTTP/1.1 503')
+    fourth.close()
+    third.close()
+
+    time.sleep(1.5)  # handler idle timeout is 1s
+    assert first.sock is not None and first.sock.recv(10) == b''
+    first.close()
+
+
+def test_follow_up_request_moves_to_its_lane(pooled: Any) -> None:
+    Handler.threads = []
+    conn = http.client.HTTPConnection('127.0.0.1', pooled.server_address[1], timeout=5)
+    conn.request('GET', '/health')
+    assert conn.getresponse().read() == b'/health'
+    conn.request('POST', '/process', body=b'{}')
+    assert conn.getresponse().read() == b'/process'
+    conn.request('GET', '/status')
+    assert conn.getresponse().read() == b'/status'
+    conn.close()
+    assert Handler.threads[0].startswith('orbit-http-fast')
+    assert Handler.threads[1].startswith('orbit-http_')
+    assert Handler.threads[2].startswith('orbit-http-fast')
+
+
+class SlowIdleHandler(Handler):
+    timeout = 5.0
+
+
+def test_idle_connections_leave_a_worker_free() -> None:
+    fast_workers = 2
+    for server in _serve(PooledHTTPServer(('127.0.0.1', 0), SlowIdleHandler, workers=1, fast_workers=fast_workers)):
+        idle = []
+        for _ in range(fast_workers):
+            conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+            conn.request('GET', '/status')
+            resp = conn.getresponse()
+            resp.read()
+            idle.append((conn, resp.getheader('Connection')))
+        # the last connection would have taken the lane's only spare worker
+        assert [header for _, header in idle] == [None, 'close']
+
+        start = time.time()
+        health = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+        health.request('GET', '/health')
+        assert health.getresponse().read() == b'/health'
+        assert time.time() - start < 1
+        for conn, _ in idle + [(health, None)]:
+            conn.close()
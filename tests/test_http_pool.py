@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler
+from typing import Any
+
+from src.server.http_pool import PooledHTTPServer
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    release = threading.Event()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+        return
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == '/slow' or self.path.endswith('/events'):
+            self.release.wait(5)
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def test_fast_lane_not_starved_by_busy_workers() -> None:
+    server = PooledHTTPServer(('127.0.0.1', 0), SlowHandler, workers=1, fast_workers=1)
+    port = server.server_address[1]
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    SlowHandler.release.clear()
+    slow_result: list[bytes] = []
+    slow = threading.Thread(
+        target=lambda: slow_result.append(urllib.request.urlopen(f'http://127.0.0.1:{port}/slow', timeout=10).read()),
+    )
+    try:
+        slow.start()
+        time.sleep(0.2)
+        start = time.time()
+        body = urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=3).read()
+        assert body == b'/health'
+        assert time.time() - start < 2
+        assert slow.is_alive()  # single pipeline worker still busy
+    finally:
+        SlowHandler.release.set()
+        slow.join(5)
+        server.shutdown()
+        server.server_close()
+    assert slow_result == [b'/slow']
+
+
+def test_event_streams_do_not_hold_pipeline_workers() -> None:
+    server = PooledHTTPServer(('127.0.0.1', 0), SlowHandler, workers=1, fast_workers=1, stream_workers=3)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    SlowHandler.release.clear()
+    watchers = [threading.Thread(target=lambda: urllib.request.urlopen(
+        f'http://127.0.0.1:{port}/jobs/job{i}/events', timeout=10).read()) for i in range(3)]
+    try:
+        for w in watchers:  # more watchers than pipeline workers
+            w.start()
+        time.sleep(0.2)
+        start = time.time()
+        assert urllib.request.urlopen(f'http://127.0.0.1:{port}/process', timeout=3).read() == b'/process'
+        assert time.time() - start < 2
+        assert all(w.is_alive() for w in watchers)
+    finally:
+        SlowHandler.release.set()
+        for w in watchers:
+            w.join(5)
+        server.shutdown()
+        server.server_close()
+
+
+def test_silent_connections_do_not_stall_accept_or_hold_workers() -> None:
+    import socket
+
+    server = PooledHTTPServer(('127.0.0.1', 0), SlowHandler, workers=1, fast_workers=1, first_byte_timeout=30)
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    silent = [socket.create_connection(('127.0.0.1', port)) for _ in range(8)]
+    try:
+        time.sleep(0.1)
+        start = time.time()
+        assert urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=3).read() == b'/health'
+        assert time.time() - start < 0.3
+        # the single pipeline worker is still free despite eight idle sockets
+        assert urllib.request.urlopen(f'http://127.0.0.1:{port}/process', timeout=3).read() == b'/process'
+        assert time.time() - start < 0.6
+    finally:
+        for s in silent:
+            s.close()
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import gzip
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, Tuple
+
+import pytest
+
+from src.server.http_utils import ResponseMixin, StaticPage, accepts_gzip, project
+
+PAGE = StaticPage("<html>" + "x" * 4000 + "</html>")
+BIG: Dict[str, Any] = {"success": True, "result": {"code": "print(1)\n" * 500,
+                                                   "pipeline_artifacts": {"task_slug": "demo", "files": ["a.py"]}}}
+
+
+class _Handler(ResponseMixin, BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        return
+
+    def do_GET(self) -> None:
+        if self.path == "/":
+            return self.send_static(PAGE)
+        return self._json(200, BIG)
+
+
+@pytest.fixture()
+def base_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _get(url: str, **headers: str) -> Tuple[int, Any, bytes]:
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, resp.headers, resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_project_keeps_dotted_paths() -> None:
+    obj = {"success": True, "result": {"a": 1, "b": {"c": 2, "d": 3}}, "steps": [{"x": 1, "y": 2}, {"x": 3}]}
+    assert project(obj, ["success", "result.b.c", "steps.x", "missing.key"]) == {
+        "success": True, "result": {"b": {"c": 2}}, "steps": [{"x": 1}, {"x": 3}]}
+    assert accepts_gzip("br, gzip;q=0.5") and not accepts_gzip("gzip;q=0") and not accepts_gzip(None)
+
+
+def test_gzip_projection_and_compact_json(base_url: str) -> None:
+    status, headers, body = _get(base_url + "/process", **{"Accept-Encoding": "gzip"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    raw = gzip.decompress(body)
+    assert json.loads(raw) == BIG and b'": ' not in raw  # compact separators
+
+    _, headers, body = _get(base_url + "/process?fields=success,result.pipeline_artifacts.task_slug")
+    assert headers.get("Content-Encoding") is None
+    assert json.loads(body) == {"success": True, "result": {"pipeline_artifacts": {"task_slug": "demo"}}}
+
+    _, _, body = _get(base_url + "/process?fields=success&pretty=1")
+    assert body == b'{\n  "success": true\n}'
+
+
+def test_static_page_etag_revalidation(base_url: str) -> None:
+    status, headers, body = _get(base_url + "/", **{"Accept-Encoding": "gzip"})
+    assert status == 200 and gzip.decompress(body) == PAGE.body
+    etag = headers["ETag"]
+    status, _, body = _get(base_url + "/", **{"If-None-Match": etag})
+    assert status == 304 and body == b""
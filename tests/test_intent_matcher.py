@@ -0,0 +1,164 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import random
+import re
+import time
+from typing import Any, Dict
+
+import pytest
+
+from src.intent_matcher import IntentMatcher, KeywordAutomaton, compile_pattern
+from src.intent_store import IntentStore
+from src.task_linguist_core import TaskLinguistCore
+
+
+def _reference(core: TaskLinguistCore, text: str) -> Dict[str, Any]:
+    """The per-pattern ``re.search`` / ``in text.lower()`` logic the matcher replaces."""
+    lowered = text.lower()
+    scores = {}
+    for intent, patterns in core.core_intent_patterns.items():
+        score = sum(1 for p in patterns if re.search(p, lowered))
+        if score:
+            scores[intent] = score / len(patterns)
+    kinds = {kind: [w for w in words if w in lowered] for kind, words in core.core_entity_keywords.items()}
+    complexity = next((c for c, words in core.core_complexity_indicators.items() if any(w in lowered for w in words)),
+                      None)
+    priority = next((p for p, words in core.core_priority_indicators.items() if any(w in lowered for w in words)),
+                    None)
+    return {"scores": scores, "entities": {k: v for k, v in kinds.items() if v},
+            "complexity": complexity, "priority": priority}
+
+
+def test_automaton_reports_overlapping_hits():
+    automaton = KeywordAutomaton(["he", "she", "his", "hers", "test", "testing"])
+    hits = automaton.iter_hits("ushers testing")
+    assert hits == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers"), (7, 11, "test"), (7, 14, "testing")]
+    assert automaton.find("nothing here") == {"he"}
+
+
+def test_compile_pattern_shapes():
+    assert compile_pattern(r"(write|create).*?(code|script)") == [("write", "create"), ("code", "script")]
+    assert compile_pattern(r".*(security|audit).*") == [("security", "audit")]
+    assert compile_pattern(r"run.*test") == [("run",), ("test",)]
+    assert compile_pattern(r"\bfix\b") is None  # other shapes use a compiled regex
+    matcher = IntentMatcher({"fix": [r"\bfix\b", r"patch.*"]})
+    assert matcher.scan("Fix it").intents == {"fix": 1}
+    assert matcher.scan("prefix patches").intents == {"fix": 1}
+
+
+def test_matcher_agrees_with_regex_search_on_random_prompts():
+    core = TaskLinguistCore()
+    vocabulary = sorted({w for words in core.core_entity_keywords.values() for w in words}
+                        | {"write", "code", "run", "test", "check", "status", "security", "find", "bugs",
+                           "start", "server", "create", "documentation", "urgent", "later", "simple", "now"})
+    rng = random.Random(44)
+    for _ in range(400):
+        words = [rng.choice(vocabulary + ["the", "a", "\n", "Test", "ChEcK", "x"]) for _ in range(rng.randint(0, 12))]
+        text = rng.choice([" ", "", "-"]).join(words) or "x"
+        expected = _reference(core, text)
+        scan = core._matcher.scan(text)
+        scores = {k: v / len(core.core_intent_patterns[k]) for k, v in scan.intents.items()}
+        assert scores == expected["scores"], text
+        entities = core._extract_core_entities(text, scan.keywords)
+        assert {k: v for k, v in entities.items() if k in core.core_entity_keywords} == expected["entities"], text
+        if expected["complexity"]:
+            assert core._assess_core_complexity(text) == expected["complexity"], text
+        if expected["priority"]:
+            assert core._estimate_core_priority(text, "general") == expected["priority"], text
+
+
+def test_long_single_line_prompt_is_linear():
+    core = TaskLinguistCore()
+    text = "please review " + "word " * 40000 + "for security"
+    started = time.perf_counter()
+    result = core._analyze_intent_core({"text": text})
+    assert result["intent"]["intent_type"] in ("analysis", "security")
+    assert time.perf_counter() - started < 2.0
+
+
+def test_intent_cache_is_bounded_and_reports_statistics(monkeypatch):
+    monkeypatch.setenv("ORBITSUITE_INTENT_CACHE_SIZE", "2")
+    core = TaskLinguistCore()
+    for text in ("write code", "run tests", "write code", "deploy app", "run tests"):
+        core._analyze_intent_core({"text": text})
+    assert core._analyze_intent_core({"text": "run tests"})["cached"] is True
+    assert "run tests" in core.core_intent_cache  # keyed by the text, not its hash
+
+    status = core._get_core_status()
+    assert status["configuration"]["max_cache_size"] == 2
+    assert status["statistics"] == {"cache_size": 2, "cache_hits": 2, "cache_misses": 4,
+                                    "cache_evictions": 2, "cache_hit_rate": 0.3333, "intent_store": None}
+    assert core._clear_core_cache()["message"] == "Cleared 2 cached core intents"
+
+
+def test_parse_batch_keeps_order_and_analyses_each_distinct_text_once(monkeypatch):
+    from src.task_linguist import TaskLinguistAgent
+    linguist = TaskLinguistAgent()
+    seen = []
+    analyze = linguist._analyze_intent_core
+    monkeypatch.setattr(linguist, "_analyze_intent_core", lambda data: seen.append(data["text"]) or analyze(data))
+
+    texts = ["write a python function", "run the tests", "", "write a python function"]
+    out = linguist.dispatch({"command": "parse_batch", "texts": texts})
+    assert sorted(seen) == ["run the tests", "write a python function"]
+    assert [r["success"] for r in out["results"]] == [True, True, False, True]
+    assert [t and t["type"] for t in out["tasks"]] == ["codegen", "testing", None, "codegen"]
+    assert out["tasks"][0]["task_id"] != out["tasks"][3]["task_id"]
+    assert out["statistics"]["distinct"] == 2 and out["statistics"]["texts_per_second"] > 0
+
+
+def test_parse_batch_process_pool_matches_in_process(monkeypatch):
+    monkeypatch.setenv("ORBITSUITE_LINGUIST_POOL_MIN", "1")
+    texts = [f"deploy service {i} to docker urgently" for i in range(20)] + ["check the security audit"]
+    pooled = TaskLinguistCore().parse_batch(texts, workers=2)
+    local = TaskLinguistCore().parse_batch(texts)
+    assert pooled["statistics"]["workers"] == 2 and local["statistics"]["workers"] == 1
+    assert [r["intent"] for r in pooled["results"]] == [r["intent"] for r in local["results"]]
+
+
+def test_parse_batch_pool_workers_use_the_instance_rules(monkeypatch):
+    monkeypatch.setenv("ORBITSUITE_LINGUIST_POOL_MIN", "1")
+    custom = TaskLinguistCore()
+    custom._apply_rules({"core_intent_patterns": dict(custom.core_intent_patterns, frobbing=[r"frobnicate.*"])})
+    out = custom.parse_batch([f"frobnicate widget {i}" for i in range(8)], workers=2)
+    assert out["statistics"]["workers"] == 2
+    assert {r["intent"]["type"] for r in out["results"]} == {"frobbing"}
+
+
+def test_persistent_store_is_shared_and_invalidated_by_pattern_changes(tmp_path, monkeypatch):
+    monkeypatch.setenv("ORBITSUITE_INTENT_STORE", str(tmp_path / "intents.sqlite"))
+    first = TaskLinguistCore()
+    assert first._analyze_intent_core({"text": "write a python script"})["cached"] is False
+    first.parse_batch(["run the tests", "deploy the service"])
+    assert len(first.intent_store) == 3
+
+    second = TaskLinguistCore()  # another process / a restart: empty memory cache, same store
+    result = second._analyze_intent_core({"text": "write a python script"})
+    assert result["cached"] is True and result["intent"]["intent_type"] == "code_generation"
+    assert second.parse_batch(["run the tests", "deploy the service"])["statistics"]["cached"] == 2
+    assert second.intent_store.stats()["hits"] == 3
+
+    version = second._patterns_version()
+    second.core_intent_patterns["testing"].append(r"probe.*")
+    assert second._patterns_version() != version
+    monkeypatch.setattr(TaskLinguistCore, "_patterns_version", lambda self: "other")
+    assert len(TaskLinguistCore().intent_store) == 0  # rows of the old version are purged
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_intent_store_reopens_its_connection_after_fork(tmp_path):
+    import multiprocessing
+    store = IntentStore(str(tmp_path / "intents.sqlite"), "v1")
+    inherited = store._conn()
+
+    def child():
+        fresh = store._conn()
+        store.put("from the child", {"intent_type": "testing"})
+        os._exit(0 if fresh is not inherited else 1)
+
+    proc = multiprocessing.get_context("fork").Process(target=child)
+    proc.start()
+    proc.join(10)
+    assert proc.exitcode == 0
+    assert store.get("from the child") == {"intent_type": "testing"} and store._conn() is inherited
@@ -1,8 +1,12 @@
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import queue
+import threading
+import time
+
 import pytest
-from src.io_runner import run_io
+from src.io_runner import run_io, watch_io
 
 def test_io_runner():
     """Test the run_io function in io_runner.py."""
@@ -12,3 +16,132 @@ def test_io_runner():
         # Add meaningful checks if the function has a return value or side effects
     except Exception as e:
         pytest.fail(f"IO runner raised an exception: {e}")
+
+
+class EchoSupervisor:
+    """Stand-in Supervisor; module level so worker processes can build it."""
+
+    def process_request(self, request):
+        if request == "boom":
+            raise RuntimeError("boom")
+        return {"success": True, "echo": request, "pid": os.getpid()}
+
+
+def test_io_runner_workers_interleave_and_summarize(tmp_path):
+    from src.io_runner import collect_inputs, ensure_dirs
+    dirs = ensure_dirs(str(tmp_path))
+    for name, text in (("a", "first"), ("b", "boom"), ("c", "")):
+        (tmp_path / "input" / "plain" / f"{name}.txt").write_text(text)
+    (tmp_path / "input" / "json" / "x.json").write_text('{"request": "structured"}')
+
+    assert [os.path.basename(p) for _, p in collect_inputs(dirs)] == ["a.txt", "x.json", "b.txt", "c.txt"]
+
+    stats = run_io(str(tmp_path), workers=2, supervisor_factory=EchoSupervisor)
+    assert (stats["plain"], stats["json"], stats["failed"], stats["skipped"]) == (1, 1, 1, 1)
+    assert stats["workers"] == 2 and stats["files_per_second"] > 0
+    assert [r["file"] for r in stats["files"]] == ["a.txt", "x.json", "b.txt", "c.txt"]
+    assert all("elapsed" in r for r in stats["files"])
+    assert (tmp_path / "output" / "final" / "plain" / "b.error.json").exists()
+    assert {r["pid"] for r in stats["files"]} != {os.getpid()}  # ran in worker processes
+
+
+def test_io_runner_skips_unchanged_and_prunes(tmp_path):
+    plain = tmp_path / "input" / "plain"
+    plain.mkdir(parents=True)
+    (plain / "a.txt").write_text("first")
+    (plain / "b.txt").write_text("second")
+    first = run_io(str(tmp_path), supervisor_factory=EchoSupervisor)
+    assert (first["processed"], first["skipped"], first["failed"]) == (2, 0, 0)
+
+    (plain / "a.txt").write_text("boom")  # changed: re-run (and now fails)
+    (plain / "b.txt").touch()  # same content: still skipped
+    second = run_io(str(tmp_path), supervisor_factory=EchoSupervisor)
+    assert (second["processed"], second["unchanged"], second["failed"]) == (1, 1, 1)
+    final = tmp_path / "output" / "final" / "plain"
+    assert (final / "a.error.json").exists() and not (final / "a.result.json").exists()
+
+    (plain / "b.txt").unlink()
+    third = run_io(str(tmp_path), supervisor_factory=EchoSupervisor)
+    assert third["pruned"] == ["plain/b.txt"] and not (final / "b.result.json").exists()
+    assert third["processed"] == 1  # failed inputs are retried
+
+    forced = run_io(str(tmp_path), supervisor_factory=EchoSupervisor, force=True)
+    assert forced["processed"] == 1 and forced["unchanged"] == 0
+
+
+def test_inputs_sharing_a_stem_keep_separate_outputs(tmp_path):
+    import json
+    (tmp_path / "input" / "plain").mkdir(parents=True)
+    (tmp_path / "input" / "json").mkdir(parents=True)
+    (tmp_path / "input" / "plain" / "a.txt").write_text("boom")
+    (tmp_path / "input" / "json" / "a.json").write_text('{"request": "structured"}')
+    first = run_io(str(tmp_path), supervisor_factory=EchoSupervisor)
+    assert (first["json"], first["failed"]) == (1, 1)
+    final = tmp_path / "output" / "final"
+    assert (final / "plain" / "a.error.json").exists()
+    assert json.loads((final / "json" / "a.result.json").read_text())["echo"] == {"request": "structured"}
+
+    manifest = json.loads((tmp_path / "output" / "manifest.json").read_text())["files"]
+    assert manifest["json/a.json"]["output"] == os.path.join("final", "json", "a.result.json")
+    assert manifest["plain/a.txt"]["output"] == os.path.join("final", "plain", "a.error.json")
+
+    (tmp_path / "input" / "plain" / "a.txt").unlink()
+    second = run_io(str(tmp_path), supervisor_factory=EchoSupervisor)
+    assert second["pruned"] == ["plain/a.txt"] and second["unchanged"] == 1
+    assert (final / "json" / "a.result.json").exists() and not (final / "plain" / "a.error.json").exists()
+
+
+@pytest.mark.parametrize("use_inotify", [None, False])
+def test_watch_mode_picks_up_new_files(tmp_path, use_inotify):
+    plain = tmp_path / "input" / "plain"
+    plain.mkdir(parents=True)
+    (plain / "old.txt").write_text("already here")
+    seen = queue.Queue()
+    stop = threading.Event()
+    summary = {}
+    t = threading.Thread(target=lambda: summary.update(watch_io(
+        str(tmp_path), supervisor_factory=EchoSupervisor, stop=stop, on_record=seen.put,
+        use_inotify=use_inotify, settle=0.1)))
+    t.start()
+    try:
+        assert seen.get(timeout=5)["file"] == "old.txt"  # pending inputs first
+        time.sleep(0.3)
+        started = time.time()
+        with open(plain / "new.txt", "w") as f:  # written in two parts
+            f.write("partial ")
+            f.flush()
+            time.sleep(0.05)
+            f.write("prompt")
+        record = seen.get(timeout=5)
+        assert record["file"] == "new.txt" and time.time() - started < 1.5
+        result = (tmp_path / "output" / "final" / "plain" / "new.result.json").read_text()
+        assert "partial prompt" in result
+    finally:
+        stop.set()
+        t.join(5)
+    assert summary["processed"] == 2
+
+
+@pytest.mark.parametrize("workers,compress", [(1, False), (2, True)])
+def test_jsonl_inputs_stream_with_line_numbers(tmp_path, workers, compress):
+    import gzip
+    import json
+    jsonl = tmp_path / "input" / "jsonl"
+    jsonl.mkdir(parents=True)
+    tasks = ['"one"', '{"description": "two"}', "", "{not json", '"boom"'] + [f'"p{i}"' for i in range(20)]
+    (jsonl / "bulk.jsonl").write_text("\n".join(tasks) + "\n")
+
+    stats = run_io(str(tmp_path), workers=workers, supervisor_factory=EchoSupervisor, compress=compress)
+    assert (stats["jsonl"], stats["lines"], stats["partial"]) == (1, 24, 1)
+    assert stats["files"][0]["failed_lines"] == 2 and stats["files"][0]["status"] == "partial"
+
+    out = tmp_path / "output" / "final" / "jsonl" / ("bulk.results.jsonl" + (".gz" if compress else ""))
+    raw = gzip.decompress(out.read_bytes()) if compress else out.read_bytes()
+    by_line = {r["line"]: r for r in map(json.loads, raw.decode().splitlines())}
+    assert sorted(by_line) == [1, 2, 4, 5] + list(range(6, 26))  # blank line 3 skipped
+    assert by_line[1]["result"]["echo"] == "one" and by_line[2]["success"]
+    assert "invalid JSON" in by_line[4]["error"] and by_line[5]["error"] == "boom"
+    assert by_line[25]["result"]["echo"] == "p19"
+
+    again = run_io(str(tmp_path), workers=workers, supervisor_factory=EchoSupervisor, compress=compress)
+    assert (again["processed"], again["unchanged"]) == (1, 0)  # failed lines are retried
@@ -0,0 +1,81 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import threading
+import time
+
+import pytest
+
+from src.io_runner import io_status, run_io
+from src.io_shard import ClaimStore, ShardSpec
+
+
+class SlowSupervisor:
+    def process_request(self, request):
+        time.sleep(0.02)
+        return {"success": True, "echo": request}
+
+
+def _inputs(tmp_path, count):
+    plain = tmp_path / "input" / "plain"
+    plain.mkdir(parents=True)
+    for i in range(count):
+        (plain / f"p{i:02d}.txt").write_text(f"prompt {i}")
+
+
+def test_shard_spec_partitions_every_key_once():
+    specs = [ShardSpec.parse(f"{i}/3") for i in range(3)]
+    keys = [f"plain/p{i}.txt" for i in range(60)]
+    owners = [[s.owns(k) for s in specs].count(True) for k in keys]
+    assert owners == [1] * 60
+    assert all(any(s.owns(k) for k in keys) for s in specs)
+    with pytest.raises(ValueError):
+        ShardSpec.parse("3/3")
+
+
+def test_hash_shards_split_the_work_and_status_combines_them(tmp_path):
+    _inputs(tmp_path, 12)
+    first = run_io(str(tmp_path), shard="0/2", supervisor_factory=SlowSupervisor)
+    second = run_io(str(tmp_path), shard="1/2", supervisor_factory=SlowSupervisor)
+    assert first["processed"] + second["processed"] == 12
+    assert {r["file"] for r in first["files"]}.isdisjoint(r["file"] for r in second["files"])
+
+    status = io_status(str(tmp_path))
+    assert (status["inputs"], status["done"], status["remaining"]) == (12, 12, 0)
+    assert set(status["nodes"]) == {"shard-0-of-2", "shard-1-of-2"}
+    assert run_io(str(tmp_path), supervisor_factory=SlowSupervisor)["processed"] == 0  # peers' work counts
+
+
+def test_claims_are_exclusive_and_expire(tmp_path):
+    a = ClaimStore(str(tmp_path), node="a", lease=60)
+    b = ClaimStore(str(tmp_path), node="b", lease=60)
+    assert a.try_claim("plain/x.txt", "v1")
+    assert not b.try_claim("plain/x.txt", "v1")
+    assert b.try_claim("plain/x.txt", "v2")  # edited input is a new unit of work
+
+    past = time.time() - 120
+    for name in os.listdir(tmp_path):
+        os.utime(os.path.join(tmp_path, name), (past, past))  # node a crashed long ago
+    assert b.try_claim("plain/x.txt", "v1")  # lease expired: taken over
+    b.complete("plain/x.txt", "v1")
+    assert not a.try_claim("plain/x.txt", "v1")  # done stays done
+    b.release("plain/x.txt", "v2")
+    assert a.try_claim("plain/x.txt", "v2")
+
+
+def test_claiming_nodes_drain_a_shared_queue_without_duplicates(tmp_path):
+    _inputs(tmp_path, 20)
+    results = {}
+
+    def node(name):
+        results[name] = run_io(str(tmp_path), claim=True, node=name, supervisor_factory=SlowSupervisor)
+
+    threads = [threading.Thread(target=node, args=(n,)) for n in ("n1", "n2")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(30)
+    done = [r["file"] for s in results.values() for r in s["files"] if r["status"] == "result"]
+    assert sorted(done) == [f"p{i:02d}.txt" for i in range(20)]
+    assert all(s["processed"] > 0 for s in results.values())
+    assert io_status(str(tmp_path))["in_flight"] == []
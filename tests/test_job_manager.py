@@ -0,0 +1,78 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import threading
+import time
+
+import pytest
+
+from src.job_manager import (
+    CANCELLED, FAILED, SUCCEEDED, Job, JobManager, JobQueueFull, parse_job_path,
+)
+
+
+def _wait_for(job: Job, timeout: float = 5.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline and job.status not in (SUCCEEDED, FAILED, CANCELLED):
+        time.sleep(0.01)
+
+
+def test_job_lifecycle_and_progress() -> None:
+    jobs = JobManager(workers=1, max_queue=4, ttl=60)
+    try:
+        def runner(job: Job):
+            job.report("working", "half way")
+            return {"success": True, "value": 42}
+        job = jobs.submit(runner, label="answer")
+        _wait_for(job)
+        data = jobs.get(job.id).to_dict()  # type: ignore[union-attr]
+        assert data["status"] == SUCCEEDED
+        assert data["result"] == {"success": True, "value": 42}
+        assert [p["stage"] for p in data["progress"]] == ["started", "working", SUCCEEDED]
+
+        failing = jobs.submit(lambda job: 1 / 0)  # type: ignore[arg-type,return-value]
+        _wait_for(failing)
+        assert failing.status == FAILED and "division" in (failing.error or "")
+    finally:
+        jobs.shutdown()
+
+
+def test_queue_bound_and_cancellation() -> None:
+    jobs = JobManager(workers=1, max_queue=1, ttl=60)
+    gate = threading.Event()
+    try:
+        def blocking(job: Job):
+            while not gate.wait(0.01):
+                job.check_cancelled()
+            return {"success": True}
+        running = jobs.submit(blocking)
+        time.sleep(0.1)
+        queued = jobs.submit(blocking)
+        with pytest.raises(JobQueueFull):
+            jobs.submit(blocking)
+        assert jobs.cancel(queued.id).status == CANCELLED  # type: ignore[union-attr]
+        jobs.cancel(running.id)
+        _wait_for(running)
+        assert running.status == CANCELLED
+        assert jobs.cancel("missing") is None
+    finally:
+        gate.set()
+        jobs.shutdown()
+
+
+def test_finished_jobs_expire() -> None:
+    jobs = JobManager(workers=1, max_queue=2, ttl=0)
+    try:
+        job = jobs.submit(lambda job: {"success": True})
+        _wait_for(job)
+        time.sleep(0.01)
+        assert jobs.get(job.id) is None
+    finally:
+        jobs.shutdown()
+
+
+def test_parse_job_path() -> None:
+    assert parse_job_path("/jobs/abc123") == "abc123"
+    assert parse_job_path("/jobs/abc123/?x=1") == "abc123"
+    assert parse_job_path("/jobs") is None
+    assert parse_job_path("/process") is None
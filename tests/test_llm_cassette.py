@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from pathlib import Path
+from typing import Any, Dict, List
+
+from src.llm_provider import LLMProvider, get_provider_from_env
+from src.llm_cassette import CASSETTE_MISS_PREFIX, Cassette, CassetteProvider, reset_cassettes
+
+
+class CountingProvider(LLMProvider):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, messages: List[Dict[str, str]], **kw: Any) -> str:  # type: ignore[override]
+        self.calls += 1
+        return f"answer-{self.calls}:{messages[-1]['content']}"
+
+
+def test_record_then_replay(tmp_path: Path) -> None:
+    path = tmp_path / "run.jsonl"
+    inner = CountingProvider()
+    recorder = CassetteProvider(Cassette(path, "record"), inner)
+    msgs = [{"role": "user", "content": "hello"}]
+    first = recorder.generate(msgs)
+    second = recorder.generate(msgs, temperature=0.1)
+    assert inner.calls == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+
+    player = CassetteProvider(Cassette(path, "replay"))
+    assert player.generate(msgs) == first
+    assert player.generate(msgs, temperature=0.1) == second
+    # Exhausted keys keep serving the last recording
+    assert player.generate(msgs) == first
+    assert player.generate([{"role": "user", "content": "other"}]).startswith(CASSETTE_MISS_PREFIX)
+
+
+def test_env_replay_skips_real_provider(tmp_path: Path, monkeypatch: Any) -> None:
+    path = tmp_path / "cassettes"
+    path.mkdir()
+    Cassette(path / "cassette_1.jsonl", "record").record("k", [], {}, "x", 0.0, "Test")
+    monkeypatch.setenv("ORBITSUITE_LLM_CASSETTE", str(path))
+    monkeypatch.setenv("ORBITSUITE_LLM_CASSETTE_MODE", "replay")
+    reset_cassettes()
+    try:
+        provider = get_provider_from_env()
+        assert isinstance(provider, CassetteProvider)
+        assert provider.inner is None
+        assert provider.cassette.path.name == "cassette_1.jsonl"
+    finally:
+        reset_cassettes()
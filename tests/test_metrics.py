@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import http.client
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from src.base_agent import BaseAgent
+from src.metrics import AGENT_CALLS, AGENT_SECONDS, HTTP_SECONDS, MetricsRegistry
+from src.server.http_keepalive import KeepAliveHandlerMixin
+from src.server.http_metrics import MetricsHandlerMixin, normalize_method, normalize_path
+
+
+def test_histogram_quantiles_and_prometheus_text() -> None:
+    reg = MetricsRegistry()
+    hist = reg.histogram("demo_seconds", "Demo latency", ["stage"], buckets=(0.1, 1.0, 10.0))
+    for _ in range(90):
+        hist.observe(0.05, stage="fast")
+    for _ in range(10):
+        hist.observe(5.0, stage="fast")
+    assert hist.count(stage="fast") == 100
+    p50 = hist.quantile(0.5, stage="fast")
+    p99 = hist.quantile(0.99, stage="fast")
+    assert p50 is not None and 0 < p50 <= 0.1
+    assert p99 is not None and 1.0 < p99 <= 10.0
+
+    reg.counter("demo_total", "Demo calls", ["outcome"]).inc(outcome="ok")
+    text = reg.render_prometheus()
+    assert '# TYPE demo_seconds histogram' in text
+    assert 'demo_seconds_bucket{stage="fast",le="0.1"} 90' in text
+    assert 'demo_seconds_bucket{stage="fast",le="+Inf"} 100' in text
+    assert 'demo_total{outcome="ok"} 1' in text
+    snap = reg.snapshot()["demo_seconds"]["series"][0]
+    assert snap["count"] == 100 and snap["p50"] == round(p50, 6)
+
+
+def test_dispatch_feeds_agent_metrics() -> None:
+    class Failing(BaseAgent):
+        def run(self, input_data: Any) -> Any:
+            return {"success": False}
+
+    agent = Failing(name="metrics_probe")
+    before = AGENT_SECONDS.count(agent="metrics_probe")
+    agent.dispatch({})
+    assert AGENT_SECONDS.count(agent="metrics_probe") == before + 1
+    assert AGENT_CALLS.value(agent="metrics_probe", outcome="failed") >= 1
+
+
+def test_normalize_path_bounds_label_cardinality() -> None:
+    routes = frozenset({"/process", "/metrics"})
+    assert normalize_path("/process?x=1", routes) == "/process"
+    assert normalize_path("/jobs/abc123", routes) == "/jobs/{id}"
+    assert normalize_path("/webhooks/github", routes) == "/webhooks/*"
+    assert normalize_path("/wp-login.php", routes) == "other"
+    assert normalize_path("/jobs/abc123/events", routes) == "/jobs/{id}/events"
+    assert normalize_path("/jobs/abc123/x/../y", routes) == "/jobs/{id}/other"
+    assert normalize_method("GET") == "GET"
+    assert normalize_method("PROPFIND") == "other"
+
+
+def test_request_latency_excludes_keepalive_idle_time() -> None:
+    class Handler(MetricsHandlerMixin, KeepAliveHandlerMixin, BaseHTTPRequestHandler):
+        metrics_server = "idle_probe"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
+            return
+
+        def do_GET(self) -> None:  # noqa: N802
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+        for _ in range(2):
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            time.sleep(0.5)  # idle between keep-alive requests
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    series = [s for s in HTTP_SECONDS.snapshot() if s["labels"]["server"] == "idle_probe"]
+    assert series[0]["count"] == 2 and series[0]["sum"] < 0.25
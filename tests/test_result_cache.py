@@ -0,0 +1,82 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+import threading
+import time
+from typing import Any, Dict, List
+
+from src.lru_cache import CoalescingCache, LRUCache
+from src.supervisor import Supervisor
+
+
+def test_lru_evicts_oldest_and_expires() -> None:
+    cache: LRUCache[int] = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+    short: LRUCache[int] = LRUCache(max_size=2, ttl=0.01)
+    short.put("a", 1)
+    time.sleep(0.03)
+    assert short.get("a") is None
+
+
+def test_concurrent_misses_compute_once() -> None:
+    cache: CoalescingCache[str] = CoalescingCache(max_size=4)
+    release = threading.Event()
+    calls: List[int] = []
+    outcomes: List[str] = []
+
+    def compute() -> str:
+        calls.append(1)
+        release.wait(2)
+        return "value"
+
+    def worker() -> None:
+        outcomes.append(cache.get_or_compute("k", compute)[1])
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    deadline = time.time() + 2
+    while cache.stats()["coalesced"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for t in threads:
+        t.join(3)
+    assert len(calls) == 1
+    assert sorted(outcomes) == ["coalesced", "coalesced", "miss"]
+    assert cache.get_or_compute("k", compute) == ("value", "hit")
+
+
+def test_supervisor_replays_identical_requests(monkeypatch: Any) -> None:
+    sup = Supervisor()
+    runs: List[Any] = []
+
+    def fake(request: Any) -> Dict[str, Any]:
+        runs.append(request)
+        return {"success": True, "task_id": "t", "result": {"success": True, "n": len(runs)}}
+
+    monkeypatch.setattr(sup, "_process_uncached", fake)
+    first = sup.process_request("build  a calculator")
+    second = sup.process_request("build a calculator\n")
+    assert (first["cache"], second["cache"]) == ("miss", "hit")
+    assert second["result"]["n"] == 1 and len(runs) == 1
+
+    second["result"]["n"] = 99  # callers get private copies
+    assert sup.process_request("build a calculator")["result"]["n"] == 1
+
+    fresh = sup.process_request("build a calculator", use_cache=False)
+    assert fresh["cache"] == "bypass" and len(runs) == 2
+    assert sup.process_request({"description": "x", "_progress_cb": print})["cache"] == "bypass"
+
+
+def test_failed_results_are_not_cached(monkeypatch: Any) -> None:
+    sup = Supervisor()
+    monkeypatch.setattr(sup, "_process_uncached",
+                        lambda request: {"success": True, "result": {"success": False}})
+    assert sup.process_request("flaky")["cache"] == "miss"
+    assert sup.process_request("flaky")["cache"] == "miss"